@@ -0,0 +1,49 @@
+"""
+Undoable commands of the ddraw scripts. Loaded by ddraw_core on first use, it does not have to be loaded by hand.
+
+Maya does not record API modifiers executed from a script in its undo queue. ddraw_core builds its batches on a
+single modifier and executes it with the ddrawModifier command instead, which keeps the modifier for undo and redo.
+"""
+import maya.api.OpenMaya as om2
+
+def maya_useNewAPI():
+    pass
+
+class DDrawModifierCommand(om2.MPxCommand):
+
+    kCommandName = "ddrawModifier"
+
+    def __init__(self):
+        """
+        Executes the modifier ddraw_core.runModifier() handed over and keeps it for undo and redo.
+        Only meant to be called by ddraw_core.runModifier().
+        """
+        super(DDrawModifierCommand, self).__init__()
+        self.modifier = None
+
+    @staticmethod
+    def creator():
+        return DDrawModifierCommand()
+
+    def doIt(self, args):
+        import ddraw_core
+        self.modifier = ddraw_core.takePendingModifier()
+        if self.modifier is None:
+            raise RuntimeError("{} is only called by ddraw_core.runModifier()".format(self.kCommandName))
+        self.redoIt()
+
+    def redoIt(self):
+        self.modifier.doIt()
+
+    def undoIt(self):
+        self.modifier.undoIt()
+
+    def isUndoable(self):
+        return True
+
+def initializePlugin(plugin):
+    om2.MFnPlugin(plugin, "fuzes", "1.0").registerCommand(DDrawModifierCommand.kCommandName,
+                                                           DDrawModifierCommand.creator)
+
+def uninitializePlugin(plugin):
+    om2.MFnPlugin(plugin).deregisterCommand(DDrawModifierCommand.kCommandName)
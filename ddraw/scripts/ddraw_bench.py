@@ -0,0 +1,339 @@
+"""
+Benchmarks for the hot paths of the ddraw module.
+Run them from the Maya script editor or mayapy:
+
+    import ddraw_bench
+    ddraw_bench.runAll()
+
+Without Maya they run against the stand-in backend from ddraw_fake, which also counts the Maya calls:
+
+    python ddraw_bench.py [results.json]
+
+NOTE: The scene benchmarks start a new scene, save your work before running them.
+"""
+import os
+import sys
+import json
+import timeit
+import tempfile
+from collections import Counter
+
+try:
+    from maya import cmds
+except ImportError:
+    # NOTE(fuzes): Outside of Maya everything runs against the stand-in backend
+    import ddraw_fake
+    ddraw_fake.install()
+    from maya import cmds
+
+from maya.api import OpenMaya as om2
+
+import ddraw_core
+
+def timeCall(func, repeat = 3):
+    """
+    Runs the function repeat times and returns the best timing.
+    :param func: [callable] without arguments
+    :param repeat: [int] how many times to run the function
+    :return: [float] the best timing in seconds
+    """
+    best = None
+    for _ in range(repeat):
+        start = timeit.default_timer()
+        func()
+        elapsed = timeit.default_timer() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+def printResults(title, columns, rows):
+    """
+    Prints the results of a benchmark as a simple table.
+    :param title: [string] name of the benchmark
+    :param columns: [list] of [string] column names
+    :param rows: [list] of [list] values matching the columns
+    :return: [None]
+    """
+    print("-------------- {} --------------".format(title))
+    print(" | ".join("{:>16}".format(c) for c in columns))
+    for row in rows:
+        print(" | ".join("{:>16}".format(v if isinstance(v, str) else "{:.3f}".format(v)) for v in row))
+
+#
+# Tree benchmarks
+#
+
+def buildGroupTree(count):
+    """
+    Builds a tree with a single group holding count items, same layout as getDDrawTreeRoot.
+    :param count: [int] number of items in the group
+    :return: [BaseTreeItem] root, [BaseTreeItem] group
+    """
+    import ddraw_ui
+    root = ddraw_ui.BaseTreeItem(-1, ddraw_ui.getDataDict())
+    group = ddraw_ui.BaseTreeItem(ddraw_core.DDrawTypes.kGroup, ddraw_ui.getDataDict(displayName="Vectors"))
+    root.addChild(group)
+    for i in range(count):
+        group.addChild(ddraw_ui.BaseTreeItem(ddraw_core.DDrawTypes.kVector,
+                                             ddraw_ui.getDataDict("vector{}".format(i))))
+    return root, group
+
+def benchTreeRows(sizes = (1000, 5000, 10000, 20000), visibleRows = 50, pages = 20):
+    """
+    Measures what the view does when expanding and scrolling a group: create an index for every visible row,
+    ask the model for its parent and the item for its row. The cost per visible row should stay flat as the
+    group grows.
+
+    :param sizes: [tuple] of group sizes to measure
+    :param visibleRows: [int] rows visible in the view at once
+    :param pages: [int] number of scroll positions spread over the group
+    :return: [list] of rows [size, total ms, us per row]
+    """
+    import ddraw_ui
+    rows = []
+    for size in sizes:
+        root, group = buildGroupTree(size)
+        model = ddraw_ui.TreeModel(root)
+        groupIndex = model.index(0, 0)
+        starts = [int((size - visibleRows) * p / float(pages - 1)) for p in range(pages)]
+
+        # NOTE(fuzes): Every insert at the top invalidates the cached rows like the node added callback does
+        def scroll():
+            group.insertChild(0, group.children.pop())
+            for start in starts:
+                for row in range(start, start + visibleRows):
+                    index = model.index(row, 0, groupIndex)
+                    model.parent(index)
+                    index.internalPointer().row()
+
+        elapsed = timeCall(scroll)
+        rows.append([str(size), elapsed * 1000.0, elapsed * 1e6 / (visibleRows * pages)])
+
+    printResults("TreeModel expand/scroll", ["items", "total ms", "us per row"], rows)
+    return rows
+
+#
+# Scene benchmarks
+#
+
+def newDDrawScene(count):
+    """
+    Starts a new scene holding count nodes of each ddraw node type.
+    :param count: [int] number of nodes per type
+    :return: [None]
+    """
+    cmds.file(new=True, force=True)
+    dagMod = om2.MDagModifier()
+    for nodeType in ("ddraw_vector", "ddraw_matrix", "ddraw_angle"):
+        ddraw_core.createDDrawNodes(nodeType, count, dagMod)
+    dagMod.doIt()
+
+def scanWithLs():
+    """
+    The previous discovery path: three cmds.ls calls and a MSelectionList round-trip per name.
+    :return: [list] of [MObjectHandle]
+    """
+    Result = []
+    for nodeType in ("ddraw_vector", "ddraw_matrix", "ddraw_angle"):
+        for name in cmds.ls(type = nodeType):
+            Result.append(om2.MObjectHandle(ddraw_core.getMobFromName(name)))
+    return Result
+
+def benchSceneScan(sizes = (1000, 10000)):
+    """
+    Compares the cmds.ls based discovery against iterDDrawNodes on scenes with count nodes per ddraw type.
+    :param sizes: [tuple] of node counts per type
+    :return: [list] of rows [nodes, ls ms, iterator ms]
+    """
+    rows = []
+    for size in sizes:
+        newDDrawScene(size)
+        lsTime = timeCall(scanWithLs)
+        iterTime = timeCall(lambda: list(ddraw_core.iterDDrawNodes()))
+        rows.append([str(size * 3), lsTime * 1000.0, iterTime * 1000.0])
+
+    printResults("Scene scan", ["nodes", "cmds.ls ms", "iterator ms"], rows)
+    return rows
+
+#
+# Import benchmarks
+#
+
+def timeImport(name):
+    """
+    Imports the module again from scratch and restores the previously imported modules afterwards,
+    so the running session keeps using the same module objects.
+    :param name: [string] module name
+    :return: [float] import time in seconds, [list] of [string] modules which got newly imported
+    """
+    saved = dict((key, sys.modules.pop(key)) for key in ("ddraw", "ddraw_core", "ddraw_ui") if key in sys.modules)
+    before = set(sys.modules)
+    try:
+        start = timeit.default_timer()
+        __import__(name)
+        elapsed = timeit.default_timer() - start
+        newModules = sorted(set(sys.modules) - before)
+    finally:
+        for key in ("ddraw", "ddraw_core", "ddraw_ui"):
+            sys.modules.pop(key, None)
+        sys.modules.update(saved)
+    return elapsed, newModules
+
+def benchImportTime():
+    """
+    Measures the import time of the core, the entry point and the UI layer. Importing ddraw_core and ddraw
+    must not pull in the UI layer.
+    :return: [list] of rows [module, ms, loads ui]
+    """
+    rows = []
+    for name in ("ddraw_core", "ddraw", "ddraw_ui"):
+        elapsed, newModules = timeImport(name)
+        rows.append([name, elapsed * 1000.0, str("ddraw_ui" in newModules)])
+
+    printResults("Import time", ["module", "ms", "loads ui"], rows)
+    return rows
+
+#
+# Hot path benchmarks
+#
+
+def getCallCounter():
+    """
+    :return: [Counter] the Maya call counter of the stand-in scene or [None] when running inside of Maya
+    """
+    fake = sys.modules.get("ddraw_fake")
+    if fake is None or not fake.isInstalled():
+        return None
+    return fake.getScene().calls
+
+def measureHotPath(func):
+    """
+    Runs the function once and counts the Maya calls it made. Call counts are only available with the stand-in backend.
+    :param func: [callable] without arguments
+    :return: [float] elapsed seconds, [Counter] of Maya calls or [None]
+    """
+    calls = getCallCounter()
+    if calls is not None:
+        calls.clear()
+    start = timeit.default_timer()
+    func()
+    elapsed = timeit.default_timer() - start
+    return elapsed, Counter(calls) if calls is not None else None
+
+# noinspection PyArgumentList
+def newRigScene(count, debugNodes = True):
+    """
+    Starts a new scene with count joints and a ddraw_vector drawing the translate of every joint.
+    :param count: [int] number of joints and debug nodes
+    :param debugNodes: [bool] if False the scene only holds the joints
+    :return: [list] of [MObject] the joints
+    """
+    cmds.file(new=True, force=True)
+    dagMod = om2.MDagModifier()
+    joints = [dagMod.createNode("joint") for _ in range(count)]
+    dagMod.doIt()
+    if not debugNodes:
+        return joints
+
+    mfn_dep = om2.MFnDependencyNode()
+    ddraw_core.DDrawVectorBatch([mfn_dep.setObject(joint).findPlug("translate", False) for joint in joints])
+    return joints
+
+# noinspection PyArgumentList
+def selectMobs(mobs):
+    sel = om2.MSelectionList()
+    for mob in mobs:
+        sel.add(mob)
+    om2.MGlobal.setActiveSelectionList(sel)
+
+# noinspection PyArgumentList
+def benchHotPaths(sizes = (100, 1000, 10000, 50000), attributeSamples = 1000, selectionRatio = 0.1):
+    """
+    Measures the hot paths on scenes holding count debug nodes:
+    getDDrawTreeRoot with the model loading the first chunk of every group, DrawVector on all the joints of a scene
+    without debug nodes,
+    the DDrawWindow selection callback syncing a selection of debug nodes and getVectorAttributesFromMob.
+
+    :param sizes: [tuple] of debug node counts
+    :param attributeSamples: [int] maximum number of joints getVectorAttributesFromMob runs on
+    :param selectionRatio: [float] part of the debug nodes which gets selected for the selection callback
+    :return: [list] of [dict] with the keys path, nodes, ms and calls
+    """
+    import ddraw_ui
+
+    store = ddraw_core.getDefaultsStore()
+    prevPath = store.path
+    defaultsPath = os.path.join(tempfile.mkdtemp(), "ddrawData.json")
+    ddraw_core.saveData(defaultsPath, {"vector": {"transform": "translate"}, "matrix": {"transform": "worldMatrix"}})
+    store.path = defaultsPath
+    store.invalidate()
+
+    results = []
+
+    def record(path, count, elapsed, calls):
+        results.append({"path": path, "nodes": count, "ms": elapsed * 1000.0,
+                        "calls": dict(calls) if calls is not None else None})
+
+    try:
+        for count in sizes:
+            joints = newRigScene(count)
+
+            def openTree():
+                model = ddraw_ui.TreeModel(ddraw_ui.getDDrawTreeRoot())
+                for row in range(model.rowCount()):
+                    model.fetchMore(model.index(row, 0))
+            record("getDDrawTreeRoot", count, *measureHotPath(openTree))
+
+            window = ddraw_ui.DDrawWindow()
+            for row in range(window.model.rowCount()):
+                groupIndex = window.model.index(row, 0)
+                while window.model.canFetchMore(groupIndex):
+                    window.model.fetchMore(groupIndex)
+            shapes = [node.handle.object() for node in ddraw_core.iterDDrawNodes()]
+            selectMobs(shapes[:max(1, int(len(shapes) * selectionRatio))])
+
+            def syncSelection():
+                window._on_maya_selection_changed(None)
+                window.flushPendingEvents()
+            record("_on_maya_selection_changed", count, *measureHotPath(syncSelection))
+            window.closeEvent(None)
+            window.deleteLater()
+
+            samples = joints[:attributeSamples]
+            record("getVectorAttributesFromMob", len(samples),
+                   *measureHotPath(lambda: [ddraw_core.getVectorAttributesFromMob(joint) for joint in samples]))
+
+            # NOTE(fuzes): On the rig scene every translate is drawn already, DrawVector would only reuse the nodes
+            selectMobs(newRigScene(count, debugNodes=False))
+            record("DrawVector", count, *measureHotPath(lambda: ddraw_core.DrawVector(ddraw_core.DDrawVectorOptions())))
+    finally:
+        store.path = prevPath
+        store.invalidate()
+
+    rows = []
+    for result in results:
+        calls = result["calls"]
+        cmdsCalls = sum(n for name, n in calls.items() if not name.startswith("om2.")) if calls is not None else "-"
+        apiCalls = sum(n for name, n in calls.items() if name.startswith("om2.")) if calls is not None else "-"
+        rows.append([result["path"], str(result["nodes"]), result["ms"], str(cmdsCalls), str(apiCalls)])
+
+    printResults("Hot paths", ["hot path", "nodes", "ms", "cmds/mel calls", "api lookups"], rows)
+    return results
+
+def runAll():
+    """
+    Runs all the benchmarks.
+    :return: [dict] the results of every benchmark keyed by its name
+    """
+    Result = {}
+    Result["importTime"] = benchImportTime()
+    Result["treeRows"] = benchTreeRows()
+    Result["sceneScan"] = benchSceneScan()
+    Result["hotPaths"] = benchHotPaths()
+    return Result
+
+if __name__ == "__main__":
+    results = runAll()
+    if len(sys.argv) > 1:
+        with open(sys.argv[1], "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
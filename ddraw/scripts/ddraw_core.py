@@ -0,0 +1,1755 @@
+"""
+Core of the debug draw tools. Everything in here works without a UI, so it can be used from mayapy
+batch jobs and imports without loading Qt. The UI lives in ddraw_ui.
+"""
+import json, os, logging
+
+from maya import cmds
+from maya import mel
+from maya.api import OpenMaya as om2
+
+from contextlib import contextmanager
+from collections import namedtuple
+
+from ddraw_profile import profiled
+
+# Global variables
+# NOTE(fuzes): For now these are going to be global
+_DATA_PATH = "w:/maya/plugins/debugdraw/data/ddrawData.json"
+
+#
+# I/O related code
+#
+
+def saveData(path, data):
+    """
+    Save data as json file
+    :param path: [string] path where to save data
+    :param data: [strings]|[integers]|[floats]|[Booleans]|[lists]|[dictionaries]|[None]
+    :return: [None]
+    """
+    f = open(path, "w")
+    f.write(json.dumps(data))
+    f.close()
+
+def loadData(path):
+    """
+    Load json data from file path
+    :param path: [string] path to the json file
+    :return: Returns the json file contents.
+    """
+    if os.path.isfile(path):
+
+        with open(path, "r") as file:
+            data = json.loads(file.read())
+            file.close()
+            return data
+    else:
+        raise Exception("The file " + path + "does not exist.")
+
+class DDrawDefaultsStore(object):
+
+    def __init__(self, path):
+        """
+        Process wide in memory cache of the default attribute json file.
+        The file only gets parsed again if its modification time or size changed on disk.
+
+        [int] hits: Number of lookups served from memory
+        [int] misses: Number of lookups which had to parse the file because nothing was cached yet
+        [int] reloads: Number of lookups which had to parse the file because it changed on disk
+        [int] version: Incremented every time new data has been loaded, can be used to invalidate derived caches
+
+        :param path: [string] path to the json file
+        """
+        self.path = path
+        self.data = None
+        self.stamp = None
+        self.version = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.reloads = 0
+
+    def _fileStamp(self):
+        stat = os.stat(self.path)
+        return stat.st_mtime, stat.st_size
+
+    def _load(self):
+        self.data = loadData(self.path)
+        self.stamp = self._fileStamp()
+        self.version += 1
+
+    def get(self):
+        """
+        Returns the cached json data. Parses the file on the first call or when it changed on disk.
+        :return: [dict] the json file contents
+        """
+        if self.data is None:
+            self.misses += 1
+            self._load()
+        else:
+            try:
+                stamp = self._fileStamp()
+            except OSError:
+                # NOTE(fuzes): The file went away, keep serving what we have in memory
+                stamp = self.stamp
+            if stamp != self.stamp:
+                self.reloads += 1
+                self._load()
+            else:
+                self.hits += 1
+
+        return self.data
+
+    def lookup(self, category):
+        """
+        Convenience function to retrieve one of the mappings from the data. Ex: "vector" or "matrix"
+        :param category: [string] key in the json data
+        :return: [dict] mapping of Maya node type to attribute name
+        """
+        return self.get()[category]
+
+    def save(self, data):
+        """
+        Saves the data to disk and updates the cache so we do not parse our own write again.
+        :param data: [dict]
+        :return: [None]
+        """
+        saveData(self.path, data)
+        self.data = data
+        self.stamp = self._fileStamp()
+        self.version += 1
+
+    def invalidate(self):
+        """
+        Drops the cached data. The next lookup will parse the file again.
+        :return: [None]
+        """
+        self.data = None
+        self.stamp = None
+
+    def stats(self):
+        """
+        :return: [dict] with the hits, misses and reloads counters
+        """
+        return {"hits": self.hits, "misses": self.misses, "reloads": self.reloads}
+
+_DEFAULTS_STORE = DDrawDefaultsStore(_DATA_PATH)
+def getDefaultsStore():
+    """
+    :return: [DDrawDefaultsStore] the process wide store for the default attribute data
+    """
+    return _DEFAULTS_STORE
+
+#
+# Open Maya utility functions
+#
+
+def iterSelection():
+    """
+    generator style iterator over current Maya active selection
+    :return: [MObject] an MObject for each item in the selection
+    """
+    sel = om2.MGlobal.getActiveSelectionList()
+    for i in xrange(sel.length()):
+        yield sel.getDependNode(i)
+
+_MAYA_MATRIX_ATTRIBUTE_NAME = 'worldMatrix'
+# noinspection PyArgumentList
+def wMtxPlugFromMob(node_mob):
+    """
+    finds the world matrix attribute and returns the [MPlug]
+    :param node_mob: [MObject] the node to get the world matrix from
+    :return: [MPlug] the matrix value of the world transform on the argument node
+    """
+    if not node_mob.hasFn(om2.MFn.kDagNode):
+        return None
+
+    mfn_dag = om2.MFnDagNode(node_mob)
+    wMtxPlug = mfn_dag.findPlug(_MAYA_MATRIX_ATTRIBUTE_NAME, False)
+    elPlug = wMtxPlug.elementByLogicalIndex(0)
+
+    return elPlug
+
+def getMobFromName(name):
+    """
+    Find the given [MObject] from the given name in the Maya scene
+    :param name: [string] Name of the object
+    :return: [MObject]
+    """
+    selList = om2.MSelectionList()
+    selList.add(name)
+    mob = selList.getDependNode(0)
+    return mob
+
+# noinspection PyArgumentList
+def getStringTypeFromMob(mob):
+    """
+    Retrieves the Maya string type from the given [MObject]
+    :param mob: [MObject]
+    :return: [string]
+    """
+    return getTypeService().typeName(mob)
+
+def createNodeAndReturnMob(nodeType):
+    """
+    Creates the given node type and returns the associated [MObject]
+    :param nodeType: [string] Maya node type
+    :return: [MObject]
+    """
+    drawNode = cmds.createNode(nodeType)
+    return getMobFromName(drawNode)
+
+# noinspection PyArgumentList
+def isMatrixPlug(plug):
+    """
+    Checks whether the given [MPlug] is a matrix plug or not
+    :param plug: [MPlug] to be checked
+    :return: [bool]
+    """
+    Result = False
+    mob = plug.attribute()
+    if mob.apiType() == om2.MFn.kMatrixAttribute:
+        Result = True
+
+    if mob.apiType() == om2.MFn.kTypedAttribute:
+        mfn_typed = om2.MFnTypedAttribute(mob)
+        Result = mfn_typed.attrType() == om2.MFnData.kMatrix
+
+    return Result
+
+# noinspection PyArgumentList
+def setFloat3Plug(plug, f3):
+    """
+    Convenience function to set a Maya MFloatVector plug.
+
+    :param plug: [MPlug] the plug which has 3 children and accepts float values. We are not checking if this is valid!
+    :param f3: [iterable] Any object which has the get method []
+    :return: [None]
+    """
+    assert len(f3) > 3
+
+    if plug.isCompound:
+        data = plug.asMDataHandle()
+        vector = om2.MFloatVector(f3[0], f3[1], f3[2])
+        data.setMFloatVector(vector)
+        plug.setMDataHandle(data)
+
+def isPointPlug(plug):
+    """
+    Checks whether the given [MPlug] is a compound and has 3 children
+    :param plug: [MPlug]
+    :return: [bool]
+    """
+    IsCompound = plug.isCompound
+    if IsCompound:
+        return plug.numChildren() == 3
+
+    return False
+
+# noinspection PyArgumentList
+def isMobType(mob, objType):
+    """
+    Check if the given [MObject] is the equal to the Maya string type.
+    Not to be confused with the MObject.apiString() method.
+    :param mob: [MObject] to check with the given type
+    :param objType: [string] Maya object type
+    :return: [bool] Whether the [MObject] matches the given [string] type.
+    """
+    return getTypeService().isType(mob, objType)
+
+def isMobAType(mob, objType):
+    """
+    Check if the given [MObject] is of the Maya string type or inherits from it. Ex: a joint is a transform
+    :param mob: [MObject] to check with the given type
+    :param objType: [string] Maya object type
+    :return: [bool]
+    """
+    return getTypeService().isAType(mob, objType)
+
+class DDrawTypeService(object):
+
+    def __init__(self):
+        """
+        Answers type queries from an in memory memo keyed on the [MTypeId] of the node type.
+        The type name comes from the function set, the inherited types cost one Maya query per type the
+        first time a node of that type is seen.
+
+        [dict] inherited: type id -> [tuple] of [string] inherited types, base type first
+        [dict] inheritedSets: type id -> [frozenset] of the same types for membership tests
+        [int] queries: Number of Maya queries made so far
+        """
+        self.inherited = {}
+        self.inheritedSets = {}
+        self.queries = 0
+
+    # noinspection PyArgumentList
+    def typeName(self, mob):
+        """
+        :param mob: [MObject]
+        :return: [string] the Maya type name
+        """
+        return om2.MFnDependencyNode(mob).typeName
+
+    # noinspection PyArgumentList
+    def inheritedTypes(self, mob):
+        """
+        :param mob: [MObject]
+        :return: [tuple] of [string] all the types the node inherits from, base type first and its own type last
+        """
+        mfn_dep = om2.MFnDependencyNode(mob)
+        typeId = mfn_dep.typeId.id()
+        Result = self.inherited.get(typeId)
+        if Result is None:
+            self.queries += 1
+            # NOTE(fuzes): Asked by type, short node names are not unique for DAG nodes
+            Result = tuple(cmds.nodeType(mfn_dep.typeName, isTypeName=True, inherited=True) or [mfn_dep.typeName])
+            self.inherited[typeId] = Result
+            self.inheritedSets[typeId] = frozenset(Result)
+        return Result
+
+    def isType(self, mob, typeName):
+        """
+        :param mob: [MObject]
+        :param typeName: [string] Maya type name
+        :return: [bool] True if the node is exactly of the given type
+        """
+        return self.typeName(mob) == typeName
+
+    # noinspection PyArgumentList
+    def isAType(self, mob, typeName):
+        """
+        :param mob: [MObject]
+        :param typeName: [string] Maya type name
+        :return: [bool] True if the node is of the given type or inherits from it
+        """
+        typeId = om2.MFnDependencyNode(mob).typeId.id()
+        if typeId not in self.inheritedSets:
+            self.inheritedTypes(mob)
+        return typeName in self.inheritedSets[typeId]
+
+    def clear(self):
+        self.inherited.clear()
+        self.inheritedSets.clear()
+
+_TYPE_SERVICE = DDrawTypeService()
+def getTypeService():
+    """
+    :return: [DDrawTypeService] the process wide type memo
+    """
+    return _TYPE_SERVICE
+
+#
+# DDraw functions/classes for drawing in the viewport
+#
+
+def getMatrixAttributesFromMob(mob):
+    """
+    Given a dependency node returns all the Matrix [MPlug] in a list. See DDrawAttributeCandidates
+    :param mob: [MObject] The node on which to search all the attributes
+    :return: [list] of [MPlug's] which are all matrices
+    """
+    return getAttributeCandidates().plugs(mob, DDrawTypes.kMatrix)
+
+def getVectorAttributesFromMob(mob):
+    """
+    Given a dependency node returns all the Point [MPlug] in a list. See the isPointPlug() functions for which is a valid point
+    and DDrawAttributeCandidates
+    :param mob: [MObject] The node on which to search all the attributes
+    :return: [list] of [MPlug's] which are all points
+    """
+    return getAttributeCandidates().plugs(mob, DDrawTypes.kVector)
+
+class DDrawAttributeCandidates(object):
+
+    def __init__(self):
+        """
+        Cache of the attributes which can be drawn by a ddraw_vector (points) or a ddraw_matrix (matrices).
+        Static attributes are the same for every node of a type, so they only get classified once per node type.
+        Dynamic attributes are classified once per node and only get classified again after an attribute
+        got added to or removed from that node.
+
+        [dict] static: type id -> {[DDrawTypes]: [list] of [MObjectHandle] attributes}
+        [dict] staticCounts: type id -> [int] number of static attributes, nodes with more have dynamic attributes
+        [dict] dynamic: node hash code -> ([MObjectHandle] node, {[DDrawTypes]: [list] of [MObjectHandle] attributes})
+        [dict] callbacks: node hash code -> attribute added/removed callback id
+        """
+        self.static = {}
+        self.staticCounts = {}
+        self.dynamic = {}
+        self.callbacks = {}
+
+    # noinspection PyArgumentList
+    def _classify(self, mob, dynamic):
+        Result = {DDrawTypes.kVector: [], DDrawTypes.kMatrix: []}
+        mfn_dep = om2.MFnDependencyNode(mob)
+        mfn_attr = om2.MFnAttribute()
+        count = 0
+        for i in xrange(mfn_dep.attributeCount()):
+            attr = mfn_dep.attribute(i)
+            mfn_attr.setObject(attr)
+            count += mfn_attr.dynamic == dynamic
+            # NOTE(fuzes): Children of compounds are never points or matrices themselves
+            if mfn_attr.dynamic != dynamic or not mfn_attr.parent.isNull():
+                continue
+            plug = om2.MPlug(mob, attr)
+            if isPointPlug(plug):
+                Result[DDrawTypes.kVector].append(om2.MObjectHandle(attr))
+            elif isMatrixPlug(plug):
+                Result[DDrawTypes.kMatrix].append(om2.MObjectHandle(attr))
+        if not dynamic:
+            self.staticCounts[mfn_dep.typeId.id()] = count
+        return Result
+
+    # noinspection PyArgumentList
+    def staticAttributes(self, mob, ddrawType):
+        """
+        :param mob: [MObject] node
+        :param ddrawType: [DDrawTypes] kVector or kMatrix
+        :return: [list] of [MObjectHandle] of the static attributes
+        """
+        typeId = om2.MFnDependencyNode(mob).typeId.id()
+        candidates = self.static.get(typeId)
+        # NOTE(fuzes): The attribute handles become invalid when the plugin of the node type gets reloaded
+        if candidates is None or not all(h.isValid() for h in candidates[ddrawType][:1]):
+            candidates = self._classify(mob, False)
+            self.static[typeId] = candidates
+        return candidates[ddrawType]
+
+    # noinspection PyArgumentList
+    def dynamicAttributes(self, mob, ddrawType):
+        """
+        :param mob: [MObject] node
+        :param ddrawType: [DDrawTypes] kVector or kMatrix
+        :return: [list] of [MObjectHandle] of the dynamic attributes of this node
+        """
+        handle = om2.MObjectHandle(mob)
+        key = handle.hashCode()
+        entry = self.dynamic.get(key)
+        if entry is None or not entry[0] == handle:
+            # NOTE(fuzes): Most nodes have no dynamic attributes, they are skipped without a scan or a callback
+            mfn_dep = om2.MFnDependencyNode(mob)
+            typeId = mfn_dep.typeId.id()
+            if typeId not in self.staticCounts:
+                self.staticAttributes(mob, ddrawType)
+            if mfn_dep.attributeCount() == self.staticCounts[typeId]:
+                return []
+            entry = (handle, self._classify(mob, True))
+            self.dynamic[key] = entry
+            if key not in self.callbacks:
+                self.callbacks[key] = om2.MNodeMessage.addAttributeAddedOrRemovedCallback(
+                    mob, self._on_attribute_added_or_removed, key)
+        return entry[1][ddrawType]
+
+    def _on_attribute_added_or_removed(self, msg, plug, clientData):
+        # NOTE(fuzes): Rescanned on the next lookup
+        self.dynamic.pop(clientData, None)
+
+    # noinspection PyArgumentList
+    def plugs(self, mob, ddrawType):
+        """
+        :param mob: [MObject] node
+        :param ddrawType: [DDrawTypes] kVector or kMatrix
+        :return: [list] of [MPlug] static attributes first followed by the dynamic ones
+        """
+        return [om2.MPlug(mob, handle.object())
+                for handle in self.staticAttributes(mob, ddrawType) + self.dynamicAttributes(mob, ddrawType)]
+
+    def clear(self):
+        """
+        Drops everything and removes the callbacks.
+        :return: [None]
+        """
+        for callbackId in self.callbacks.values():
+            om2.MMessage.removeCallback(callbackId)
+        self.callbacks.clear()
+        self.static.clear()
+        self.staticCounts.clear()
+        self.dynamic.clear()
+
+_ATTRIBUTE_CANDIDATES = DDrawAttributeCandidates()
+def getAttributeCandidates():
+    """
+    :return: [DDrawAttributeCandidates] the process wide attribute candidate cache
+    """
+    return _ATTRIBUTE_CANDIDATES
+
+class DDrawAttributeResolver(object):
+
+    def __init__(self, mapping):
+        """
+        Resolves the default draw attribute for a node from a mapping of Maya node type to attribute name.
+        Inherited types are taken into account, the most derived type found in the mapping wins.
+        The result is memoized per node type, the inherited types come from the DDrawTypeService so every type
+        only costs one Maya query per session.
+
+        :param mapping: [dict] Maya node type -> attribute name. Ex: the "vector" entry of the defaults data
+        """
+        self.mapping = dict(mapping)
+        self.memo = {}
+
+    # noinspection PyArgumentList
+    def attributeFromMob(self, mob):
+        """
+        Finds the default attribute name for the given node.
+        :param mob: [MObject]
+        :return: [string] the attribute name or [None] if the node type is not in the mapping
+        """
+        mfn_dep = om2.MFnDependencyNode(mob)
+        typeName = mfn_dep.typeName
+        if typeName in self.memo:
+            return self.memo[typeName]
+
+        Result = self.mapping.get(typeName)
+        if Result is None:
+            # NOTE(fuzes): Walk from the most derived to the base type
+            for inheritedType in reversed(getTypeService().inheritedTypes(mob)):
+                if inheritedType in self.mapping:
+                    Result = self.mapping[inheritedType]
+                    break
+
+        self.memo[typeName] = Result
+        return Result
+
+    # noinspection PyArgumentList
+    def plugFromMob(self, mob):
+        """
+        :param mob: [MObject]
+        :return: [MPlug] the default plug of the node or [None] if it could not be resolved
+        """
+        attr = self.attributeFromMob(mob)
+        if attr is None:
+            return None
+
+        mfn_dep = om2.MFnDependencyNode(mob)
+        try:
+            return mfn_dep.findPlug(attr, False)
+        except RuntimeError:
+            global_logger.warning("Attribute {} not found on {}".format(attr, mfn_dep.name()))
+            return None
+
+    def resolve(self, mobs):
+        """
+        Resolves the default plugs for a whole selection. Nodes which can not be resolved are skipped.
+        :param mobs: [iterable] of [MObject]
+        :return: [list] of [MPlug]
+        """
+        Result = []
+        for mob in mobs:
+            plug = self.plugFromMob(mob)
+            if plug is not None:
+                Result.append(plug)
+        return Result
+
+_RESOLVERS = {}
+def getAttributeResolver(category):
+    """
+    Returns the resolver for the given category of the defaults data. The resolver gets rebuilt
+    when the defaults data changed.
+    :param category: [string] Ex: "vector" or "matrix"
+    :return: [DDrawAttributeResolver]
+    """
+    store = getDefaultsStore()
+    mapping = store.lookup(category)
+    cached = _RESOLVERS.get(category)
+    if cached is None or cached[0] != store.version:
+        cached = (store.version, DDrawAttributeResolver(mapping))
+        _RESOLVERS[category] = cached
+    return cached[1]
+
+# noinspection PyClassHasNoInit
+class DDrawTypes:
+    """
+    Enumeration of the all the types.
+    """
+    kVector = 0
+    kMatrix = 1
+    kAngle = 2
+    kGroup = 3
+
+# NOTE(fuzes): These have to match the ids the plugin registers the nodes with
+_DDRAW_TYPE_IDS = {
+    0x0012e180: DDrawTypes.kVector,
+    0x0012e181: DDrawTypes.kAngle,
+    0x0012e182: DDrawTypes.kMatrix,
+}
+
+DDrawNodeRecord = namedtuple("DDrawNodeRecord", ["type", "handle"])
+
+# noinspection PyArgumentList
+def getDDrawTypeFromMob(mob):
+    """
+    :param mob: [MObject]
+    :return: [DDrawTypes] of the ddraw node or [None] if the node is not a ddraw node
+    """
+    return _DDRAW_TYPE_IDS.get(om2.MFnDependencyNode(mob).typeId.id())
+
+# noinspection PyArgumentList
+def iterDDrawNodes(types = None):
+    """
+    generator style iterator over all the ddraw nodes in the scene. Walks the scene once with the API iterator
+    filtered to plugin locators, no names are involved.
+
+    :param types: [iterable] of [DDrawTypes] to restrict the result to. [None] for all the ddraw nodes
+    :return: [DDrawNodeRecord] with the [DDrawTypes] type and the [MObjectHandle] for each ddraw node
+    """
+    if types is not None:
+        types = set(types)
+
+    it = om2.MItDependencyNodes(om2.MFn.kPluginLocatorNode)
+    mfn_dep = om2.MFnDependencyNode()
+    while not it.isDone():
+        mob = it.thisNode()
+        mfn_dep.setObject(mob)
+        ddrawType = _DDRAW_TYPE_IDS.get(mfn_dep.typeId.id())
+        if ddrawType is not None and (types is None or ddrawType in types):
+            yield DDrawNodeRecord(ddrawType, om2.MObjectHandle(mob))
+        it.next()
+
+# NOTE(fuzes): Maya node type of each ddraw type
+_DDRAW_TYPE_NAMES = {
+    DDrawTypes.kVector: "ddraw_vector",
+    DDrawTypes.kAngle: "ddraw_angle",
+    DDrawTypes.kMatrix: "ddraw_matrix",
+}
+
+# NOTE(fuzes): Input attributes which define what a ddraw node draws, in the order the draw functions take the plugs
+_CONNECTION_ATTRIBUTES = {
+    DDrawTypes.kVector: ("endPoint", "origin"),
+    DDrawTypes.kAngle: ("vector1", "vector2"),
+    DDrawTypes.kMatrix: ("inMatrix",),
+}
+
+# noinspection PyArgumentList
+def getPlugKey(plug):
+    """
+    :param plug: [MPlug]
+    :return: [tuple] hashable key of the plug, stays the same when the node gets renamed
+    """
+    return (om2.MObjectHandle(plug.node()).hashCode(),
+            plug.partialName(includeNonMandatoryIndices=True, useFullAttributePath=True, useLongNames=True))
+
+class DDrawConnectionIndex(object):
+
+    def __init__(self):
+        """
+        Index of the plugs the ddraw nodes in the scene draw, so drawing the same plug twice can reuse
+        the existing node. Built with one scan of the ddraw nodes on first use and kept current by callbacks.
+        The callbacks only mark the nodes whose connections changed, they get indexed again on the next lookup.
+
+        [dict] nodes: (DDrawTypes, plug keys of the source plugs or [None]...) -> [list] of [MObjectHandle]
+        [dict] keys: node hash code -> [list] of ([MObjectHandle] node, key in nodes)
+        [dict] dirty: node hash code -> [list] of [MObjectHandle] nodes to index again
+        [bool] built: Whether the scene got scanned
+        """
+        self.nodes = {}
+        self.keys = {}
+        self.dirty = {}
+        self.built = False
+        self.callbacks = om2.MCallbackIdArray()
+
+    def key(self, ddrawType, plugs):
+        """
+        :param ddrawType: [DDrawTypes]
+        :param plugs: [tuple] of [MPlug] or [None] matching _CONNECTION_ATTRIBUTES of the type
+        :return: [tuple] key of a ddraw node drawing these plugs
+        """
+        return (ddrawType,) + tuple(getPlugKey(plug) if plug is not None and not plug.isNull else None
+                                    for plug in plugs)
+
+    # noinspection PyArgumentList
+    def _sourcePlugs(self, mob, ddrawType):
+        mfn_dep = om2.MFnDependencyNode(mob)
+        Result = []
+        for name in _CONNECTION_ATTRIBUTES[ddrawType]:
+            source = getStaticPlug(mfn_dep, name).source()
+            Result.append(source if not source.isNull else None)
+        return Result
+
+    def _add(self, handle):
+        mob = handle.object()
+        ddrawType = getDDrawTypeFromMob(mob)
+        if ddrawType is None:
+            return
+        key = self.key(ddrawType, self._sourcePlugs(mob, ddrawType))
+        # NOTE(fuzes): Nodes which are not connected do not draw anything we could reuse
+        if not any(key[1:]):
+            return
+        self.nodes.setdefault(key, []).append(handle)
+        self.keys.setdefault(handle.hashCode(), []).append((handle, key))
+
+    def _remove(self, handle):
+        entries = self.keys.get(handle.hashCode(), [])
+        for entry in [e for e in entries if e[0] == handle]:
+            entries.remove(entry)
+            handles = self.nodes[entry[1]]
+            handles[:] = [h for h in handles if not h == handle]
+            if not handles:
+                del self.nodes[entry[1]]
+
+    # noinspection PyArgumentList
+    def _build(self):
+        self.nodes.clear()
+        self.keys.clear()
+        self.dirty.clear()
+        if not len(self.callbacks):
+            self.callbacks.append(om2.MDGMessage.addConnectionCallback(self._on_connection))
+            for name in _DDRAW_TYPE_NAMES.values():
+                self.callbacks.append(om2.MDGMessage.addNodeAddedCallback(self._on_node_added_or_removed, name))
+                self.callbacks.append(om2.MDGMessage.addNodeRemovedCallback(self._on_node_added_or_removed, name))
+            for message in (om2.MSceneMessage.kAfterNew, om2.MSceneMessage.kAfterOpen):
+                self.callbacks.append(om2.MSceneMessage.addCallback(message, self._on_scene_changed))
+
+        for record in iterDDrawNodes():
+            self._add(record.handle)
+        self.built = True
+
+    def update(self):
+        """
+        Scans the scene on first use and indexes the nodes marked by the callbacks again.
+        :return: [None]
+        """
+        if not self.built:
+            self._build()
+            return
+        dirty = self.dirty
+        self.dirty = {}
+        for handles in dirty.values():
+            for i, handle in enumerate(handles):
+                # NOTE(fuzes): A node gets marked once per changed connection
+                if any(h == handle for h in handles[:i]):
+                    continue
+                self._remove(handle)
+                if handle.isValid():
+                    self._add(handle)
+
+    # noinspection PyArgumentList
+    def _markDirty(self, mob):
+        handle = om2.MObjectHandle(mob)
+        self.dirty.setdefault(handle.hashCode(), []).append(handle)
+
+    def _on_connection(self, srcPlug, dstPlug, made, clientData):
+        mob = dstPlug.node()
+        if mob.hasFn(om2.MFn.kPluginLocatorNode) and getDDrawTypeFromMob(mob) is not None:
+            self._markDirty(mob)
+
+    def _on_node_added_or_removed(self, mob, clientData):
+        self._markDirty(mob)
+
+    def _on_scene_changed(self, clientData):
+        # NOTE(fuzes): Scanned again on the next lookup
+        self.built = False
+
+    # noinspection PyArgumentList
+    def find(self, key, plugs):
+        """
+        Finds a ddraw node which draws exactly these plugs.
+        :param key: [tuple] returned by key()
+        :param plugs: [tuple] of [MPlug] or [None] the key was built from
+        :return: [MObject] the ddraw node or [None]
+        """
+        self.update()
+        plugs = [plug if plug is not None and not plug.isNull else None for plug in plugs]
+        for handle in self.nodes.get(key, []):
+            if not handle.isValid():
+                continue
+            # NOTE(fuzes): Hash codes are not unique, make sure the node really is connected to these plugs
+            mob = handle.object()
+            sources = self._sourcePlugs(mob, key[0])
+            if all(a == b if a is not None and b is not None else a is b for a, b in zip(sources, plugs)):
+                return mob
+        return None
+
+    def duplicates(self):
+        """
+        :return: [list] of [list] of [MObject] groups of ddraw nodes drawing the same plugs
+        """
+        self.update()
+        Result = []
+        for handles in self.nodes.values():
+            mobs = [handle.object() for handle in handles if handle.isValid()]
+            if len(mobs) > 1:
+                Result.append(mobs)
+        return Result
+
+    def clear(self):
+        """
+        Drops the index and removes the callbacks.
+        :return: [None]
+        """
+        for callbackId in self.callbacks:
+            om2.MMessage.removeCallback(callbackId)
+        self.callbacks.clear()
+        self.nodes.clear()
+        self.keys.clear()
+        self.dirty.clear()
+        self.built = False
+
+_CONNECTION_INDEX = DDrawConnectionIndex()
+def getConnectionIndex():
+    """
+    :return: [DDrawConnectionIndex] the process wide index of the drawn plugs
+    """
+    return _CONNECTION_INDEX
+
+class DDrawVectorOptions(object):
+
+    # noinspection PyArgumentList,PyArgumentList
+    def __init__(self):
+        """
+        Contains all the options for drawing a DDrawVector.
+
+        [MColor] vectorColor: The color of the vector
+        [float] coneRadius: The radius of the cone
+        [float] coneHeight: The height of the cone
+        [bool] displayText: Should the information text be shown
+        [MColor] textColor: The color of the information text
+        """
+
+        self.vectorColor = om2.MColor([0, 0, 1, 1])
+
+        self.coneRadius = 0.1
+        self.coneHeight = 0.2
+
+        self.displayText = False
+        self.textColor = om2.MColor([1, 1, 1, 1])
+
+# noinspection PyArgumentList
+def createDDrawNode(name):
+    """
+    Makes sure that the node editor does not get spammed with our nodes when we create them.
+    Also hide the transform node in the outliner so that also does not get spammed with our debug items.
+    This function might change depending on what else would be necessary do before/after creating our nodes.
+
+    :param name: [string] Name of the node which should be created. This must be a valid ddraw_node
+    :return: [MObject]
+    """
+    # NOTE(fuzes): Currently we are the only ones calling this so we should never have errors with this!!!
+    Result = om2.MObject()
+    if name.startswith("ddraw"):
+
+        # NOTE(fuzes): We set the node editor to be not adding on create so we do not clutter it
+        # we then after the fact restore it to the previous state
+        with nodeEditorAddOnCreateDisabled():
+            Result = createNodeAndReturnMob(name)
+        if Result.hasFn(om2.MFn.kDagNode):
+            mfn_dag = om2.MFnDagNode(Result)
+            mobParent = mfn_dag.parent(0)
+            mfn_dag.setObject(mobParent)
+            plug = mfn_dag.findPlug("hiddenInOutliner", False)
+            plug.setBool(True)
+
+    return Result
+
+@contextmanager
+def nodeEditorAddOnCreateDisabled():
+    """
+    Context manager which disables the add on create flag of the current node editor and restores
+    the previous state afterwards. Use this around bulk creation so the state is only toggled once.
+    Does nothing in batch mode (mayapy) or when there is no node editor, the node editor commands are UI commands.
+    """
+    currentNodeEditor = None
+    if not cmds.about(batch=True):
+        currentNodeEditor = mel.eval('getCurrentNodeEditor')
+    if not currentNodeEditor or not cmds.nodeEditor(currentNodeEditor, exists=True):
+        yield
+        return
+
+    prevState = cmds.nodeEditor(currentNodeEditor, q=True, ann=True)
+    cmds.nodeEditor(currentNodeEditor, e=True, ann=False)
+    try:
+        yield
+    finally:
+        cmds.nodeEditor(currentNodeEditor, e=True, ann=prevState)
+
+@contextmanager
+def undoChunk(name):
+    """
+    Context manager which groups everything executed inside of it into a single undo chunk.
+    :param name: [string] name of the chunk
+    """
+    cmds.undoInfo(openChunk=True, chunkName=name)
+    try:
+        yield
+    finally:
+        cmds.undoInfo(closeChunk=True)
+
+# NOTE(fuzes): The plugin lives next to debugDraw.mll in the plug-ins folder of the module
+_COMMANDS_PLUGIN = "ddraw_commands.py"
+_PENDING_MODIFIERS = []
+
+def loadCommandsPlugin():
+    """
+    Loads the plugin holding the undoable ddraw commands if it is not loaded yet.
+    :return: [bool] whether the commands are available
+    """
+    if cmds.pluginInfo(_COMMANDS_PLUGIN, q=True, loaded=True):
+        return True
+    try:
+        cmds.loadPlugin(_COMMANDS_PLUGIN, quiet=True)
+    except RuntimeError:
+        return False
+    return True
+
+def takePendingModifier():
+    """
+    Hands the modifier passed to runModifier() over to the ddrawModifier command.
+    :return: [MDGModifier] or [None] if there is no modifier waiting
+    """
+    return _PENDING_MODIFIERS.pop() if _PENDING_MODIFIERS else None
+
+def runModifier(modifier):
+    """
+    Executes the modifier with the ddrawModifier command, so it lands in the undo queue and Ctrl+Z reverts it.
+    Every modifier has to be run once, the command keeps it for undo and redo.
+    If the commands plugin can not be loaded the modifier is executed directly and can not be undone.
+
+    :param modifier: [MDGModifier]|[MDagModifier]
+    :return: [None]
+    """
+    if not loadCommandsPlugin():
+        cmds.warning("Could not load {}, the changes can not be undone".format(_COMMANDS_PLUGIN))
+        modifier.doIt()
+        return
+
+    _PENDING_MODIFIERS.append(modifier)
+    try:
+        cmds.ddrawModifier()
+    finally:
+        del _PENDING_MODIFIERS[:]
+
+# noinspection PyArgumentList
+def createDDrawNodes(name, count, modifier):
+    """
+    Creates count ddraw nodes with a single undoable [MDagModifier], see runModifier(). The nodes have to exist
+    so the shapes can be returned, the hiddenInOutliner edits for the transforms are queued on the given
+    modifier and are executed with it.
+
+    :param name: [string] Name of the node type which should be created. This must be a valid ddraw_node
+    :param count: [int] number of nodes to create
+    :param modifier: [MDGModifier] gets the edits of the created nodes queued
+    :return: [list] of [MObject] the created shape nodes
+    """
+    Result = []
+    if not name.startswith("ddraw") or count <= 0:
+        return Result
+
+    # NOTE(fuzes): Creating a shape through the MDagModifier returns the automatically created transform
+    createMod = om2.MDagModifier()
+    transforms = [createMod.createNode(name) for _ in xrange(count)]
+    runModifier(createMod)
+
+    mfn_dag = om2.MFnDagNode()
+    for transform in transforms:
+        mfn_dag.setObject(transform)
+        modifier.newPlugValueBool(mfn_dag.findPlug("hiddenInOutliner", False), True)
+        Result.append(mfn_dag.child(0))
+
+    return Result
+
+def queueFloat3PlugValue(modifier, plug, f3):
+    """
+    Queues the values for a plug which has 3 float children on the given modifier.
+    :param modifier: [MDGModifier]
+    :param plug: [MPlug] compound plug with 3 float children
+    :param f3: [iterable] Any object which has the get method []
+    :return: [None]
+    """
+    for i in xrange(3):
+        modifier.newPlugValueFloat(plug.child(i), f3[i])
+
+# noinspection PyArgumentList
+def drawDDrawNodes(ddrawType, sourcePlugs, options = None, reuseExisting = True, chunkName = "DDrawBatch",
+                   created = None):
+    """
+    Makes sure a ddraw node of the type draws every tuple of source plugs. New nodes are created and connected with
+    undoable modifiers (see runModifier()) inside of one undo chunk. With reuseExisting, plugs which are already
+    drawn by a node of the type reuse that node (see DDrawConnectionIndex) and the same plugs given twice share one
+    new node.
+    Reused nodes only get the options if they are given, so the edits made on them are kept.
+
+    :param ddrawType: [DDrawTypes] kVector, kAngle or kMatrix
+    :param sourcePlugs: [list] of [tuple] of [MPlug] or [None] matching _CONNECTION_ATTRIBUTES of the type,
+    [None] plugs are left unconnected
+    :param options: [DDrawVectorOptions]|[DDrawAngleOptions]|[DDrawMatrixOptions] matching the type, for the new
+    and the reused nodes. [None] gives the new nodes the default options and leaves the reused nodes as they are
+    :param reuseExisting: [bool] whether to reuse the nodes which already draw the plugs
+    :param chunkName: [string] name of the undo chunk
+    :param created: [list] or [None], gets the newly created nodes appended
+    :return: [list] of [MObject] the ddraw node drawing each tuple of plugs
+    """
+    Result = [None] * len(sourcePlugs)
+    newPositions = []
+    samePositions = []
+    if reuseExisting:
+        index = getConnectionIndex()
+        firstPositions = {}
+        for i, plugs in enumerate(sourcePlugs):
+            key = index.key(ddrawType, plugs)
+            if key in firstPositions:
+                samePositions.append((i, firstPositions[key]))
+                continue
+            firstPositions[key] = i
+            Result[i] = index.find(key, plugs)
+            if Result[i] is None:
+                newPositions.append(i)
+    else:
+        newPositions = range(len(sourcePlugs))
+
+    with undoChunk(chunkName):
+        dagMod = om2.MDagModifier()
+        if newPositions:
+            with nodeEditorAddOnCreateDisabled():
+                newNodes = createDDrawNodes(_DDRAW_TYPE_NAMES[ddrawType], len(newPositions), dagMod)
+            if created is not None:
+                created.extend(newNodes)
+
+            mfn_dep = om2.MFnDependencyNode()
+            for i, mob in zip(newPositions, newNodes):
+                Result[i] = mob
+                mfn_dep.setObject(mob)
+                for plug, name in zip(sourcePlugs[i], _CONNECTION_ATTRIBUTES[ddrawType]):
+                    if plug is not None and not plug.isNull:
+                        dagMod.connect(plug, getStaticPlug(mfn_dep, name))
+
+        if options is not None:
+            for mob in Result:
+                if mob is not None:
+                    queueOptions(dagMod, mob, options)
+        elif newPositions:
+            defaults = _OPTIONS_CLASSES[ddrawType]()
+            for mob in newNodes:
+                queueOptions(dagMod, mob, defaults)
+
+        runModifier(dagMod)
+
+    for i, first in samePositions:
+        Result[i] = Result[first]
+    return Result
+
+def getVectorOptionsFromMob(mob):
+    """
+    Retrieves all the option parameters from a ddraw_vector node.
+
+    :param mob: [MObject] node which corresponds to a ddraw_vector node in the Maya scene
+    :return: [DDrawVectorOptions]
+    """
+    return readOptions(om2.MFnDependencyNode(mob), DDrawTypes.kVector)
+
+def setVectorAttributesFromOptions(mob, options = DDrawVectorOptions()):
+    """
+    Sets the given [MObject] which should be a ddraw_vector node with the given [DDrawVectorOptions]
+    :param mob: [MObject] must be a ddraw_vector node
+    :param options: [DDrawVectorOptions] from which to fetch the values for settings the attributes on the node
+    :return: [None]
+    """
+    writeOptions(om2.MFnDependencyNode(mob), options)
+
+# noinspection PyArgumentList
+def DDrawVector(plug1, plug2 = om2.MPlug(), drawOptions = None):
+    """
+    Creates a ddraw_vector node in the scene or reuses the one already drawing the plugs.
+    Connects the plug1 to the endPoint attribute and the plug2 if available to the origin attribute.
+    Rest of the attributes are set to the drawOptions
+    :param plug1: [MPlug] which gets connected as the endPoint in the node
+    :param plug2: [MPlug] which gets connected as the origin in the node
+    :param drawOptions: [DDrawVectorOptions] which specify the settings for the vector to be drawn, [None] for the
+    default options on a new node, see drawDDrawNodes()
+    :return: [MObject] the ddraw_vector node
+    """
+    if not isPointPlug(plug1):
+        cmds.error("Invalid plug")
+
+    return DDrawVectorBatch([plug1], drawOptions, origins=[plug2])[0]
+
+# noinspection PyArgumentList
+def DDrawVectorBatch(plugs, options = None, origins = None, reuseExisting = True):
+    """
+    Draws a vector for every given plug, see drawDDrawNodes(). Plugs which are not point plugs are skipped.
+
+    :param plugs: [list] of [MPlug] which get connected as the endPoint of each node
+    :param options: [DDrawVectorOptions] which specify the settings for all the vectors, see drawDDrawNodes()
+    :param origins: [list] of [MPlug] or [None]. Optional plugs matching the plugs list which get connected as the origin
+    :param reuseExisting: [bool] whether plugs which are already drawn reuse the existing ddraw_vector node
+    :return: [list] of [MObject] the ddraw_vector nodes
+    """
+    if origins is None:
+        origins = [None] * len(plugs)
+
+    pairs = [(plug, origin) for plug, origin in zip(plugs, origins) if isPointPlug(plug)]
+    if len(pairs) != len(plugs):
+        cmds.warning("Skipped {} invalid plugs".format(len(plugs) - len(pairs)))
+    if not pairs:
+        return []
+
+    pairs = [(plug, origin if origin is not None and not origin.isNull and isPointPlug(origin) else None)
+             for plug, origin in pairs]
+    return drawDDrawNodes(DDrawTypes.kVector, pairs, options, reuseExisting, "DDrawVectorBatch")
+
+class DDrawAngleOptions(object):
+
+    # noinspection PyArgumentList
+    def __init__(self):
+        """
+        Contains all the options from a ddraw_angle node.
+
+        [bool] normalize: Whether the two vectors should be normalized or not
+        [MColor] textColor: The color of the text to be displayed
+        """
+        self.normalize = False
+        self.textColor = om2.MColor([1, 1, 1, 1])
+
+def getAngleOptionsFromMob(mob):
+    """
+    Retrieves the the option attributes from the given ddraw_angle node
+
+    :param mob: [MObject] which must be a ddraw_node from which to retrieve the options
+    :return: [DDrawAngleOptions] filled up from the [MObject] attributes
+    """
+    return readOptions(om2.MFnDependencyNode(mob), DDrawTypes.kAngle)
+
+def setAngleAttributesFromOptions(mob, options = DDrawAngleOptions()):
+    """
+    Sets all the attributes on a ddraw_angle node given the options
+
+    :param mob: [MObject] which must be a ddraw_angle node on which to set it's attributes
+    :param options: [DDrawAngleOptions] containing the options
+    :return: [None]
+    """
+    writeOptions(om2.MFnDependencyNode(mob), options)
+
+# noinspection PyArgumentList
+def DDrawAngle(plug1, plug2, options = None):
+    """
+    Creates a ddraw_angle node in the Maya scene or reuses the one already drawing the plugs and connects the
+    plug1, plug2 into the v1 and v2 attributes of the node. Additional options can be passed for the angle node
+
+    :param plug1: [MPlug] for the first vector (v1)
+    :param plug2: [MPlug] for the second vector (v2)
+    :param options: [DDrawAngleOptions] defining the information's in the viewport, see drawDDrawNodes()
+    :return: [MObject] the ddraw_angle node
+    """
+
+    if not isPointPlug(plug1) or not isPointPlug(plug2):
+        cmds.error("Invalid plug")
+
+    return DDrawAngleBatch([(plug1, plug2)], options)[0]
+
+# noinspection PyArgumentList
+def DDrawAngleBatch(plugPairs, options = None, reuseExisting = True):
+    """
+    Draws an angle for every given pair of plugs, see drawDDrawNodes(). Pairs which are not both point plugs
+    are skipped.
+
+    :param plugPairs: [list] of [tuple] (v1 [MPlug], v2 [MPlug])
+    :param options: [DDrawAngleOptions] defining the information's in the viewport, see drawDDrawNodes()
+    :param reuseExisting: [bool] whether pairs which are already drawn reuse the existing ddraw_angle node
+    :return: [list] of [MObject] the ddraw_angle nodes
+    """
+    pairs = [(p1, p2) for p1, p2 in plugPairs if isPointPlug(p1) and isPointPlug(p2)]
+    if len(pairs) != len(plugPairs):
+        cmds.warning("Skipped {} invalid plug pairs".format(len(plugPairs) - len(pairs)))
+    if not pairs:
+        return []
+
+    return drawDDrawNodes(DDrawTypes.kAngle, pairs, options, reuseExisting, "DDrawAngleBatch")
+
+class DDrawMatrixOptions(object):
+
+    # noinspection PyArgumentList
+    def __init__(self):
+        """
+        Contains all the parameter options for a ddraw_matrix node.
+
+        [bool] displayText: Whether the text should be displayed or not
+        [MColor] textColor: The color of the text
+        """
+        self.displayText = False
+        self.textColor = om2.MColor([1, 1, 1, 1])
+
+def getMatrixOptionsFromMob(mob):
+    """
+    Retrieves the options from the given [MObject] which must be a ddraw_matrix node.
+
+    :param mob: [MObject] from which to get the options
+    :return: [DDrawMatrixOptions]
+    """
+    return readOptions(om2.MFnDependencyNode(mob), DDrawTypes.kMatrix)
+
+def setMatrixOptionsFromMob(mob, options = DDrawMatrixOptions()):
+    """
+    Set the attributes on the [MObject] from the given options.
+
+    :param mob: [MObject] ddraw_matrix node on which to set the attributes
+    :param options: [DDrawMatrixOptions] the options used for setting the attributes
+    :return: [None]
+    """
+    writeOptions(om2.MFnDependencyNode(mob), options)
+
+#
+# Option attributes shared by all the ddraw nodes
+#
+
+# NOTE(fuzes): Option attributes of every node type and how their values are stored
+_OPTION_ATTRIBUTES = {
+    DDrawTypes.kVector: (("vectorColor", "color"), ("coneRadius", "float"), ("coneHeight", "float"),
+                         ("displayText", "bool"), ("textColor", "color")),
+    DDrawTypes.kAngle: (("normalize", "bool"), ("textColor", "color")),
+    DDrawTypes.kMatrix: (("displayText", "bool"), ("textColor", "color")),
+}
+
+_OPTIONS_CLASSES = {
+    DDrawTypes.kVector: DDrawVectorOptions,
+    DDrawTypes.kAngle: DDrawAngleOptions,
+    DDrawTypes.kMatrix: DDrawMatrixOptions,
+}
+
+_OPTIONS_TYPES = dict((cls, ddrawType) for ddrawType, cls in _OPTIONS_CLASSES.items())
+
+# NOTE(fuzes): Node type id -> attribute name -> [MObjectHandle] of the attribute. The attributes are static
+# so we only look them up by name once per node type. The handles become invalid when the plugin gets reloaded.
+_ATTRIBUTE_TABLES = {}
+
+def getAttributeObject(mfn_dep, name):
+    """
+    Returns the attribute [MObject] for the given static attribute name, cached per node type.
+    :param mfn_dep: [MFnDependencyNode] attached to the node
+    :param name: [string] name of a static attribute
+    :return: [MObject] the attribute
+    """
+    table = _ATTRIBUTE_TABLES.setdefault(mfn_dep.typeId.id(), {})
+    handle = table.get(name)
+    if handle is None or not handle.isValid():
+        handle = om2.MObjectHandle(mfn_dep.attribute(name))
+        table[name] = handle
+    return handle.object()
+
+# noinspection PyArgumentList
+def getStaticPlug(mfn_dep, name):
+    """
+    Builds the plug for a static attribute from the cached attribute [MObject] instead of searching it by name.
+    :param mfn_dep: [MFnDependencyNode] attached to the node
+    :param name: [string] name of a static attribute
+    :return: [MPlug]
+    """
+    return om2.MPlug(mfn_dep.object(), getAttributeObject(mfn_dep, name))
+
+# noinspection PyArgumentList
+def readOptions(mfn_dep, ddrawType):
+    """
+    Reads all the option attributes of a ddraw node.
+    :param mfn_dep: [MFnDependencyNode] attached to the ddraw node
+    :param ddrawType: [DDrawTypes] type of the node
+    :return: [DDrawVectorOptions]|[DDrawAngleOptions]|[DDrawMatrixOptions]
+    """
+    Result = _OPTIONS_CLASSES[ddrawType]()
+    for name, kind in _OPTION_ATTRIBUTES[ddrawType]:
+        plug = getStaticPlug(mfn_dep, name)
+        if kind == "color":
+            value = om2.MColor(plug.asMDataHandle().asFloat3())
+        elif kind == "float":
+            value = plug.asFloat()
+        else:
+            value = plug.asBool()
+        setattr(Result, name, value)
+    return Result
+
+def writeOptions(mfn_dep, options):
+    """
+    Writes all the options to the attributes of a ddraw node.
+    :param mfn_dep: [MFnDependencyNode] attached to the ddraw node matching the options type
+    :param options: [DDrawVectorOptions]|[DDrawAngleOptions]|[DDrawMatrixOptions]
+    :return: [None]
+    """
+    for name, kind in _OPTION_ATTRIBUTES[_OPTIONS_TYPES[type(options)]]:
+        plug = getStaticPlug(mfn_dep, name)
+        value = getattr(options, name)
+        if kind == "color":
+            setFloat3Plug(plug, value)
+        elif kind == "float":
+            plug.setFloat(value)
+        else:
+            plug.setBool(value)
+
+def queuePlugValue(modifier, plug, value, kind):
+    """
+    Queues an option value on the given modifier.
+    :param modifier: [MDGModifier]
+    :param plug: [MPlug]
+    :param value: [bool]|[float]|[MColor]
+    :param kind: [string] "color", "float" or "bool" see _OPTION_ATTRIBUTES
+    :return: [None]
+    """
+    if kind == "color":
+        queueFloat3PlugValue(modifier, plug, value)
+    elif kind == "float":
+        modifier.newPlugValueFloat(plug, value)
+    else:
+        modifier.newPlugValueBool(plug, value)
+
+_OPTION_TOLERANCE = 1e-6
+def isOptionValueEqual(a, b, kind):
+    """
+    Compares two option values. Floats are stored as 32 bit on the nodes so we compare with a tolerance.
+    :param a: [bool]|[float]|[MColor]
+    :param b: [bool]|[float]|[MColor]
+    :param kind: [string] "color", "float" or "bool" see _OPTION_ATTRIBUTES
+    :return: [bool]
+    """
+    if kind == "color":
+        return all(abs(a[i] - b[i]) <= _OPTION_TOLERANCE for i in xrange(3))
+    elif kind == "float":
+        return abs(a - b) <= _OPTION_TOLERANCE
+    return bool(a) == bool(b)
+
+# noinspection PyArgumentList
+def queueOptions(modifier, mob, options):
+    """
+    Queues all the options of a ddraw node on the given modifier.
+    :param modifier: [MDGModifier]
+    :param mob: [MObject] ddraw node matching the options type
+    :param options: [DDrawVectorOptions]|[DDrawAngleOptions]|[DDrawMatrixOptions]
+    :return: [None]
+    """
+    mfn_dep = om2.MFnDependencyNode(mob)
+    for name, kind in _OPTION_ATTRIBUTES[_OPTIONS_TYPES[type(options)]]:
+        queuePlugValue(modifier, getStaticPlug(mfn_dep, name), getattr(options, name), kind)
+
+# noinspection PyArgumentList
+def getOptionsFromMobs(mobs):
+    """
+    Reads the options of many ddraw nodes of any type reusing one function set.
+    :param mobs: [iterable] of [MObject]
+    :return: [list] of options matching the node types, [None] for nodes which are not ddraw nodes
+    """
+    Result = []
+    mfn_dep = om2.MFnDependencyNode()
+    for mob in mobs:
+        mfn_dep.setObject(mob)
+        ddrawType = _DDRAW_TYPE_IDS.get(mfn_dep.typeId.id())
+        Result.append(readOptions(mfn_dep, ddrawType) if ddrawType is not None else None)
+    return Result
+
+# noinspection PyArgumentList
+def setOptionsOnMobs(mobs, options):
+    """
+    Writes the same options to many ddraw nodes reusing one function set. See applyOptions()
+    :param mobs: [list] of [MObject] ddraw nodes matching the options type
+    :param options: [DDrawVectorOptions]|[DDrawAngleOptions]|[DDrawMatrixOptions]
+    :return: [int] number of changed attributes
+    """
+    return applyOptions(mobs, options)
+
+# noinspection PyArgumentList
+@profiled()
+def applyOptionValues(mobs, values, currentOptions = None):
+    """
+    Applies option values to many ddraw nodes. The values get compared against the current values of every node
+    and only the attributes which actually change are queued on a single [MDGModifier], which is executed once
+    as one undoable command, see runModifier(). Attributes a node type does not have are ignored.
+
+    :param mobs: [list] of [MObject] ddraw nodes
+    :param values: [dict] attribute name -> value
+    :param currentOptions: [list] of options matching the mobs if the caller already knows the current values.
+    If [None] the current values are read from the nodes
+    :return: [int] number of changed attributes
+    """
+    if not values:
+        return 0
+
+    dgMod = om2.MDGModifier()
+    mfn_dep = om2.MFnDependencyNode()
+    changed = 0
+    for i, mob in enumerate(mobs):
+        mfn_dep.setObject(mob)
+        ddrawType = _DDRAW_TYPE_IDS.get(mfn_dep.typeId.id())
+        if ddrawType is None:
+            continue
+
+        current = currentOptions[i] if currentOptions is not None else readOptions(mfn_dep, ddrawType)
+        for name, kind in _OPTION_ATTRIBUTES[ddrawType]:
+            if name not in values or isOptionValueEqual(getattr(current, name), values[name], kind):
+                continue
+            queuePlugValue(dgMod, getStaticPlug(mfn_dep, name), values[name], kind)
+            changed += 1
+
+    if changed:
+        runModifier(dgMod)
+    return changed
+
+def applyOptions(mobs, options, currentOptions = None):
+    """
+    Applies all the options to many ddraw nodes, see applyOptionValues()
+    :param mobs: [list] of [MObject] ddraw nodes matching the options type
+    :param options: [DDrawVectorOptions]|[DDrawAngleOptions]|[DDrawMatrixOptions]
+    :param currentOptions: [list] of options matching the mobs or [None]
+    :return: [int] number of changed attributes
+    """
+    values = dict((name, getattr(options, name)) for name, kind in _OPTION_ATTRIBUTES[_OPTIONS_TYPES[type(options)]])
+    return applyOptionValues(mobs, values, currentOptions)
+
+# noinspection PyArgumentList
+def DDrawMatrix(plug, options = None):
+    """
+    Creates a ddraw_matrix node in the Maya scene or reuses the one already drawing the plug and connects the plug
+    to the inMatrix attribute of the node. Additional options can be specified.
+
+    :param plug: [MPlug] which gets connected to the inMatrix attribute
+    :param options: [DDrawMatrixOptions] specifying what should be displayed in the viewport, see drawDDrawNodes()
+    :return: [MObject] the ddraw_matrix node
+    """
+    if not isMatrixPlug(plug):
+        cmds.error("Invalid plug. Can not perform DDrawMatrix")
+
+    return DDrawMatrixBatch([plug], options)[0]
+
+# noinspection PyArgumentList
+def DDrawMatrixBatch(plugs, options = None, reuseExisting = True):
+    """
+    Draws a matrix for every given plug, see drawDDrawNodes(). Plugs which are not matrix plugs are skipped.
+
+    :param plugs: [list] of [MPlug] which get connected to the inMatrix attribute of each node
+    :param options: [DDrawMatrixOptions] specifying what should be displayed in the viewport, see drawDDrawNodes()
+    :param reuseExisting: [bool] whether plugs which are already drawn reuse the existing ddraw_matrix node
+    :return: [list] of [MObject] the ddraw_matrix nodes
+    """
+    valid = [plug for plug in plugs if isMatrixPlug(plug)]
+    if len(valid) != len(plugs):
+        cmds.warning("Skipped {} invalid plugs".format(len(plugs) - len(valid)))
+    if not valid:
+        return []
+
+    return drawDDrawNodes(DDrawTypes.kMatrix, [(plug,) for plug in valid], options, reuseExisting,
+                          "DDrawMatrixBatch")
+
+#
+# Dependency graph walks
+#
+
+# NOTE(fuzes): Default bounds of a walk, a walk starting in the middle of a rig can reach the whole scene
+_WALK_MAX_DEPTH = 10
+_WALK_MAX_NODES = 5000
+
+# noinspection PyArgumentList
+def walkDependencyGraph(roots, upstream = True, maxDepth = _WALK_MAX_DEPTH, maxNodes = _WALK_MAX_NODES):
+    """
+    Walks the dependency graph breadth first from the roots with MItDependencyGraph. Every node is visited once
+    even when several roots reach it, the walk is pruned at maxDepth and at the ddraw nodes.
+
+    :param roots: [iterable] of [MObject] nodes to start from
+    :param upstream: [bool] walk against the connections (inputs) or along them (outputs)
+    :param maxDepth: [int] number of connections to follow from a root, 0 only visits the roots
+    :param maxNodes: [int] the walk stops after this many nodes
+    :return: [list] of [MObject] the visited nodes without the ddraw nodes, roots first
+    """
+    direction = om2.MItDependencyGraph.kUpstream if upstream else om2.MItDependencyGraph.kDownstream
+    roots = list(roots)
+    Result = []
+    # NOTE(fuzes): hash code -> [list] of [MObjectHandle, depth, visited]. Hash codes are not unique, the handles
+    # get compared within a hash code like DDrawConnectionIndex does
+    nodes = {}
+
+    def getNode(mob):
+        handle = om2.MObjectHandle(mob)
+        bucket = nodes.setdefault(handle.hashCode(), [])
+        for node in bucket:
+            if node[0] == handle:
+                return node
+        node = [handle, None, False]
+        bucket.append(node)
+        return node
+
+    # NOTE(fuzes): A root reached by the walk of another root still counts as a root
+    for root in roots:
+        getNode(root)[1] = 0
+    mfn_dep = om2.MFnDependencyNode()
+    for root in roots:
+        if getNode(root)[2]:
+            continue
+
+        it = om2.MItDependencyGraph(root, om2.MFn.kInvalid, direction, om2.MItDependencyGraph.kBreadthFirst,
+                                   om2.MItDependencyGraph.kNodeLevel)
+        while not it.isDone():
+            mob = it.currentNode()
+            node = getNode(mob)
+            if node[2]:
+                it.prune()
+                it.next()
+                continue
+            node[2] = True
+
+            if node[1] is None:
+                # NOTE(fuzes): Breadth first, the node we came from got visited already and is one connection
+                # closer to the root
+                node[1] = getNode(it.previousPlug().node())[1] + 1
+
+            mfn_dep.setObject(mob)
+            if mfn_dep.typeId.id() in _DDRAW_TYPE_IDS:
+                it.prune()
+            else:
+                Result.append(mob)
+                if len(Result) >= maxNodes:
+                    cmds.warning("Stopped the graph walk after {} nodes".format(maxNodes))
+                    return Result
+                if node[1] >= maxDepth:
+                    it.prune()
+            it.next()
+    return Result
+
+# noinspection PyArgumentList
+def getConnectedDrawPlugs(mob):
+    """
+    :param mob: [MObject] node
+    :return: [tuple] of [list] of [MPlug] the connected point plugs, [list] of [MPlug] the connected matrix plugs.
+    Connected children are resolved to their point plug, connected elements of arrays are returned themselves
+    """
+    points = []
+    matrices = []
+    seen = set()
+    for plug in om2.MFnDependencyNode(mob).getConnections():
+        if plug.isChild:
+            plug = plug.parent()
+        name = plug.partialName(includeNonMandatoryIndices=True, useFullAttributePath=True)
+        if name in seen:
+            continue
+        seen.add(name)
+        if isPointPlug(plug):
+            points.append(plug)
+        elif isMatrixPlug(plug):
+            matrices.append(plug)
+    return points, matrices
+
+# noinspection PyArgumentList
+def getAllDrawPlugs(mob):
+    """
+    :param mob: [MObject] node
+    :return: [tuple] of [list] of [MPlug] all the point plugs, [list] of [MPlug] all the matrix plugs.
+    Arrays are resolved to their first element like wMtxPlugFromMob
+    """
+    Result = ([], [])
+    for plugs, ddrawType in zip(Result, (DDrawTypes.kVector, DDrawTypes.kMatrix)):
+        for plug in getAttributeCandidates().plugs(mob, ddrawType):
+            plugs.append(plug.elementByLogicalIndex(0) if plug.isArray else plug)
+    return Result
+
+# noinspection PyArgumentList
+@profiled()
+def drawDependencyChain(roots, upstream = True, maxDepth = _WALK_MAX_DEPTH, maxNodes = _WALK_MAX_NODES,
+                        connectedOnly = True, vectorOptions = None, matrixOptions = None):
+    """
+    Draws the point and matrix plugs of every node along the dependency chain of the roots, see
+    walkDependencyGraph(). All the nodes get created by two drawDDrawNodes() batches inside of one undo chunk,
+    plugs which are drawn already reuse their ddraw node.
+
+    :param roots: [iterable] of [MObject] nodes to start from
+    :param upstream: [bool] walk against the connections (inputs) or along them (outputs)
+    :param maxDepth: [int] number of connections to follow from a root
+    :param maxNodes: [int] the walk stops after this many nodes
+    :param connectedOnly: [bool] only draw the plugs the nodes are connected through, otherwise every
+    point and matrix plug of the nodes
+    :param vectorOptions: [DDrawVectorOptions] or [None], see drawDDrawNodes()
+    :param matrixOptions: [DDrawMatrixOptions] or [None], see drawDDrawNodes()
+    :return: [tuple] of [list] of [MObject] the ddraw_vector nodes, [list] of [MObject] the ddraw_matrix nodes
+    """
+    getPlugs = getConnectedDrawPlugs if connectedOnly else getAllDrawPlugs
+    points = []
+    matrices = []
+    seen = set()
+    for mob in walkDependencyGraph(roots, upstream, maxDepth, maxNodes):
+        for plugs, nodePlugs, isDrawPlug in zip((points, matrices), getPlugs(mob), (isPointPlug, isMatrixPlug)):
+            for plug in nodePlugs:
+                # NOTE(fuzes): Both ends of a connection show the same value, destinations are drawn through
+                # their source so every connection only gets one node
+                source = plug.source()
+                if not source.isNull and isDrawPlug(source):
+                    plug = source
+                key = getPlugKey(plug)
+                if key not in seen:
+                    seen.add(key)
+                    plugs.append(plug)
+
+    vectors = []
+    matrixNodes = []
+    with undoChunk("DDrawChain"):
+        if points:
+            vectors = drawDDrawNodes(DDrawTypes.kVector, [(point, None) for point in points], vectorOptions,
+                                     True, "DDrawChain")
+        if matrices:
+            matrixNodes = drawDDrawNodes(DDrawTypes.kMatrix, [(matrix,) for matrix in matrices], matrixOptions,
+                                         True, "DDrawChain")
+    return vectors, matrixNodes
+
+# noinspection PyArgumentList
+@profiled()
+def DrawVector(options = None, *args):
+    """
+    Draws a vector in the viewport with the given options.
+    Uses the selection and default attributes to determine which plugs should be connected to the ddraw_vector node.
+
+    :param options: [DDrawVectorOptions] or [None], see drawDDrawNodes()
+    :param args: [*args] reserved mostly for the Maya UI which calls this function
+    :return: [None]
+    """
+    DDrawVectorBatch(getAttributeResolver("vector").resolve(iterSelection()), options)
+
+# noinspection PyArgumentList,PyArgumentList
+@profiled()
+def DrawAngle(options = None, *args):
+    """
+    Draws a angle in the viewport with the given options.
+    Uses the selection and default attribute to determine which plugs should be connected to the ddraw_angle node.
+
+    :param options: [DDrawAngleOptions] or [None], see drawDDrawNodes()
+    :param args: [*args] reserved mostly for the Maya UI which calls this function
+    :return: [None]
+    """
+    sel = list(iterSelection())
+    if len(sel) != 2:
+        cmds.warning("Selection must be two nodes!")
+        return
+    resolver = getAttributeResolver("vector")
+    plug1 = resolver.plugFromMob(sel[0])
+    plug2 = resolver.plugFromMob(sel[1])
+    if plug1 is None or plug2 is None:
+        cmds.warning("No default vector attribute found for the selection!")
+        return
+
+    DDrawAngle(plug1, plug2, options)
+
+# noinspection PyArgumentList
+@profiled()
+def DrawMatrix(options = None, *args):
+    """
+        Draws a matrix in the viewport with the given options.
+        Uses the selection and default attribute to determine which plugs should be connected to the ddraw_matrix node.
+
+        :param options: [DDrawMatrixOptions] or [None], see drawDDrawNodes()
+        :param args: [*args] reserved mostly for the Maya UI which calls this function
+        :return: [None]
+        """
+    DDrawMatrixBatch(getAttributeResolver("matrix").resolve(iterSelection()), options)
+
+@profiled()
+def DrawUpstreamChain(*args):
+    """
+    Draws every vector and matrix the selected nodes depend on, see drawDependencyChain().
+    :param args: [*args] reserved mostly for the Maya UI which calls this function
+    :return: [None]
+    """
+    drawDependencyChain(list(iterSelection()), upstream=True)
+
+@profiled()
+def DrawDownstreamChain(*args):
+    """
+    Draws every vector and matrix which depends on the selected nodes, see drawDependencyChain().
+    :param args: [*args] reserved mostly for the Maya UI which calls this function
+    :return: [None]
+    """
+    drawDependencyChain(list(iterSelection()), upstream=False)
+
+# noinspection PyArgumentList
+def getMatchingPlug(mfn_dep, plug):
+    """
+    Finds the plug of another node with the same attribute and indices as the given plug.
+    :param mfn_dep: [MFnDependencyNode] attached to the other node
+    :param plug: [MPlug]
+    :return: [MPlug], raises a [RuntimeError] if the other node does not have the attribute
+    """
+    if plug.isChild:
+        return getMatchingPlug(mfn_dep, plug.parent()).child(plug.attribute())
+    Result = mfn_dep.findPlug(plug.attribute(), False)
+    if plug.isElement:
+        Result = Result.elementByLogicalIndex(plug.logicalIndex)
+    return Result
+
+# noinspection PyArgumentList
+def getOutgoingConnectionMoves(mob, target):
+    """
+    Pairs every outgoing connection of a node with the same plug of the target node.
+    :param mob: [MObject] node whose connections should be moved
+    :param target: [MObject] node which should be connected instead
+    :return: [list] of [tuple] ([MPlug] source, [MPlug] target plug, [MPlug] destination) or [None] if the
+    target is missing one of the attributes
+    """
+    mfn_target = om2.MFnDependencyNode(target)
+    Result = []
+    for plug in om2.MFnDependencyNode(mob).getConnections():
+        destinations = plug.destinations()
+        if not destinations:
+            continue
+        try:
+            targetPlug = getMatchingPlug(mfn_target, plug)
+        except RuntimeError:
+            return None
+        Result.extend((plug, targetPlug, destination) for destination in destinations)
+    return Result
+
+# noinspection PyArgumentList
+@profiled()
+def DeduplicateDDrawNodes(*args):
+    """
+    Deletes the ddraw nodes which draw the same plugs as another ddraw node of the same type, the first node
+    of every group is kept. The outgoing connections of the duplicates and of their transforms are moved to the
+    kept node and its transform first. Duplicates whose options differ from the kept node or whose connections
+    can not be moved are kept and reported. Everything happens in one undo chunk.
+
+    :param args: [*args] reserved mostly for the Maya UI which calls this function
+    :return: [int] number of deleted nodes
+    """
+    paths = []
+    skipped = []
+    dgMod = om2.MDGModifier()
+    mfn_dep = om2.MFnDependencyNode()
+    mfn_dag = om2.MFnDagNode()
+    for mobs in getConnectionIndex().duplicates():
+        ddrawType = getDDrawTypeFromMob(mobs[0])
+        keptOptions = readOptions(mfn_dep.setObject(mobs[0]), ddrawType)
+        keptTransform = mfn_dag.setObject(mobs[0]).parent(0)
+        for mob in mobs[1:]:
+            options = readOptions(mfn_dep.setObject(mob), ddrawType)
+            transform = mfn_dag.setObject(mob).parent(0)
+            moves = None
+            # NOTE(fuzes): Custom options would get lost with the node
+            if all(isOptionValueEqual(getattr(options, name), getattr(keptOptions, name), kind)
+                   for name, kind in _OPTION_ATTRIBUTES[ddrawType]):
+                shapeMoves = getOutgoingConnectionMoves(mob, mobs[0])
+                transformMoves = getOutgoingConnectionMoves(transform, keptTransform)
+                if shapeMoves is not None and transformMoves is not None:
+                    moves = shapeMoves + transformMoves
+            if moves is None:
+                skipped.append(mfn_dag.fullPathName())
+                continue
+
+            for plug, targetPlug, destination in moves:
+                dgMod.disconnect(plug, destination)
+                dgMod.connect(targetPlug, destination)
+            paths.append(mfn_dag.setObject(transform).fullPathName())
+
+    if paths:
+        with undoChunk("DDrawDeduplicate"):
+            runModifier(dgMod)
+            cmds.delete(paths)
+    if skipped:
+        cmds.warning("Kept {} duplicated ddraw nodes with their own options or outgoing connections: {}".format(
+            len(skipped), ", ".join(skipped)))
+    return len(paths)
+
+# noinspection PyArgumentList,PyArgumentList
+def deleteDDrawMob(mob):
+    """
+    Convenience function for deleting the transform from the given [MObject] shape node.
+    So we do not leave any stray nodes.
+    :param mob: [MObject] the shape from which to find the transform and delete it
+    :return: [bool] Wheter we deleted something or not
+    """
+    if not mob.hasFn(om2.MFn.kShape):
+        return False
+    mfn_dag = om2.MFnDagNode(mob)
+    parentMob = mfn_dag.parent(0)
+    if parentMob.isNull():
+        return False
+    mfn_dag_parent = om2.MFnDagNode(parentMob)
+    cmds.delete(mfn_dag_parent.fullPathName())
+    return True
+
+global_logger = logging.getLogger("ddraw_loger")
@@ -0,0 +1,355 @@
+"""
+Compares two recordings of the ddraw nodes, Ex: before and after a rig change, and ranks which debug vectors,
+angles and matrices moved:
+
+    python ddraw_diff.py c:/temp/shot010_v12 c:/temp/shot010_v13 [report.json]
+
+Works on the directories written by ddraw_record and on npz exports of ddraw_export. Only needs NumPy, no Maya,
+so it also runs under plain CPython on a farm machine.
+
+Nodes are aligned by name, nodes which got renamed are aligned by the plugs driving them. Per node and field the
+report holds the max and RMS delta over the frames both recordings have:
+
+vectors: origin and the drawn endPoint as distances, magnitude as absolute difference, in scene units
+angles: v1 and v2 as the angle between the old and the new direction, degrees as absolute difference, in degrees
+matrices: every axis and the position as distances, each against its own tolerance
+
+Nodes are ranked by their worst max delta relative to the tolerance of the field.
+"""
+from __future__ import print_function
+
+import os
+import sys
+import json
+
+import numpy as np
+
+# NOTE(fuzes): Unlike the rest of the tools this also runs under Python 3
+if sys.version_info[0] >= 3:
+    xrange = range
+
+KINDS = ("vectors", "angles", "matrices")
+
+# NOTE(fuzes): kind -> field -> (metric, tolerance). Values are stored as float so smaller tolerances
+# would report rounding noise
+DEFAULT_TOLERANCES = {
+    "vectors": {
+        "origin": ("distance", 1e-4),
+        "endPoint": ("distance", 1e-4),
+        "magnitude": ("absolute", 1e-4),
+    },
+    "angles": {
+        "v1": ("direction", 1e-3),
+        "v2": ("direction", 1e-3),
+        "degrees": ("absolute", 1e-3),
+    },
+    "matrices": {
+        "xAxis": ("distance", 1e-5),
+        "yAxis": ("distance", 1e-5),
+        "zAxis": ("distance", 1e-5),
+        "position": ("distance", 1e-4),
+    },
+}
+
+_MATRIX_ROWS = {"xAxis": 0, "yAxis": 1, "zAxis": 2, "position": 3}
+
+class DDrawStream(object):
+
+    def __init__(self, frames, rows, names, sources, values):
+        """
+        The values of the ddraw nodes over frames, loaded from a recording or an export.
+
+        [ndarray] frames: Sorted frame numbers which hold values
+        [ndarray] rows: Row in values for each of the frames
+        [dict] names: kind -> [list] of [string] node names, in the order of the columns
+        [dict] sources: kind -> [list] of source plug names per node, empty lists if unknown
+        [dict] values: kind -> [ndarray] (rows, nodes) of the ddraw_probe dtypes
+        """
+        self.frames = frames
+        self.rows = rows
+        self.names = names
+        self.sources = sources
+        self.values = values
+
+def loadRecording(path):
+    """
+    :param path: [string] directory written by ddraw_record.DDrawRecorder
+    :return: [DDrawStream] with the values memory mapped
+    """
+    with open(os.path.join(path, "recording.json"), "r") as f:
+        manifest = json.load(f)
+
+    rows = np.flatnonzero(np.load(os.path.join(path, "recorded.npy")))
+    values = dict((kind, np.load(os.path.join(path, kind + ".npy"), mmap_mode="r")) for kind in KINDS)
+    return DDrawStream(rows + manifest["startFrame"], rows, manifest["names"], manifest.get("sources", {}), values)
+
+def loadExport(path):
+    """
+    :param path: [string] directory written by ddraw_export with the npz format
+    :return: [DDrawStream]
+    """
+    with open(os.path.join(path, "manifest.json"), "r") as f:
+        manifest = json.load(f)
+    if manifest["format"] != "npz":
+        raise ValueError("Only npz exports can be compared: {}".format(path))
+
+    frames = []
+    values = dict((kind, []) for kind in KINDS)
+    for fileName in manifest["blocks"]:
+        with np.load(os.path.join(path, fileName)) as block:
+            frames.append(block["frames"])
+            for kind in KINDS:
+                values[kind].append(block[kind])
+
+    frames = np.concatenate(frames) if frames else np.zeros(0, dtype=np.int64)
+    order = np.argsort(frames, kind="mergesort")
+    values = dict((kind, np.concatenate(arrays)) for kind, arrays in values.items() if arrays)
+    return DDrawStream(frames[order], order, manifest["names"], manifest.get("sources", {}), values)
+
+def load(path):
+    """
+    :param path: [string] directory of a recording or an npz export
+    :return: [DDrawStream]
+    """
+    if os.path.isfile(os.path.join(path, "recording.json")):
+        return loadRecording(path)
+    return loadExport(path)
+
+#
+# Alignment
+#
+
+def alignNodes(namesA, sourcesA, namesB, sourcesB):
+    """
+    Pairs the nodes of two recordings by name, the remaining ones by their source plugs if those are unique.
+    :param namesA: [list] of [string]
+    :param sourcesA: [list] of [list] of [string] source plug names per node, can be empty
+    :param namesB: [list] of [string]
+    :param sourcesB: [list] of [list] of [string]
+    :return: [list] of [tuple] (index in A, index in B) pairs, [list] of unmatched A indices, [list] of unmatched
+    B indices
+    """
+    indexB = dict((name, j) for j, name in enumerate(namesB))
+    pairs = []
+    leftA = []
+    matchedB = set()
+    for i, name in enumerate(namesA):
+        j = indexB.get(name)
+        if j is None:
+            leftA.append(i)
+        else:
+            pairs.append((i, j))
+            matchedB.add(j)
+    leftB = [k for k in xrange(len(namesB)) if k not in matchedB]
+
+    def sourceKeys(indices, sources):
+        keys = {}
+        for i in indices:
+            key = tuple(sources[i]) if i < len(sources) else ()
+            if any(key):
+                keys.setdefault(key, []).append(i)
+        return dict((key, found[0]) for key, found in keys.items() if len(found) == 1)
+
+    keysA = sourceKeys(leftA, sourcesA)
+    keysB = sourceKeys(leftB, sourcesB)
+    for key, i in keysA.items():
+        j = keysB.get(key)
+        if j is not None:
+            pairs.append((i, j))
+            leftA.remove(i)
+            leftB.remove(j)
+
+    pairs.sort()
+    return pairs, leftA, leftB
+
+def alignFrames(framesA, framesB):
+    """
+    :param framesA: [ndarray] sorted frame numbers
+    :param framesB: [ndarray] sorted frame numbers
+    :return: [ndarray] the frames both have, [ndarray] their positions in A, [ndarray] their positions in B
+    """
+    frames = np.intersect1d(framesA, framesB)
+    return frames, np.searchsorted(framesA, frames), np.searchsorted(framesB, frames)
+
+def asSlice(indices):
+    """
+    Fancy indexing copies structured arrays field by field, consecutive indices are much faster as a slice.
+    :param indices: [ndarray] of [int]
+    :return: [slice] if the indices are consecutive, otherwise the indices
+    """
+    if len(indices) and indices[-1] - indices[0] == len(indices) - 1 and (np.diff(indices) == 1).all():
+        return slice(int(indices[0]), int(indices[-1]) + 1)
+    return indices
+
+#
+# Deltas
+#
+
+def getField(values, kind, field):
+    """
+    :param values: [ndarray] of a ddraw_probe dtype
+    :return: [ndarray] float64 of the field, matrix axes as (..., 3)
+    """
+    if kind == "matrices":
+        return values["matrix"][..., _MATRIX_ROWS[field], :3].astype(np.float64)
+    return values[field].astype(np.float64)
+
+def fieldDelta(a, b, metric):
+    """
+    :param a: [ndarray] float64 values of a field, vectors as (..., 3)
+    :param b: [ndarray] matching a
+    :param metric: [string] "distance", "absolute" or "direction"
+    :return: [ndarray] the deltas, shape of a without the vector axis
+    """
+    if metric == "absolute":
+        return np.abs(a - b)
+    if metric == "distance":
+        return np.sqrt(((a - b) ** 2).sum(axis=-1))
+
+    # NOTE(fuzes): atan2 of the cross and dot product stays precise for tiny angles, unlike acos of the dot product
+    crossLength = np.sqrt((np.cross(a, b) ** 2).sum(axis=-1))
+    return np.degrees(np.arctan2(crossLength, (a * b).sum(axis=-1)))
+
+class DDrawDeltaAccumulator(object):
+
+    def __init__(self, count):
+        """
+        Max and RMS of the deltas of a field per node, fed chunk by chunk of frames.
+        :param count: [int] number of nodes
+        """
+        self.max = np.zeros(count)
+        self.maxFrame = np.zeros(count, dtype=np.int64)
+        self.sumSquared = np.zeros(count)
+        self.frames = 0
+
+    def add(self, deltas, frames):
+        """
+        :param deltas: [ndarray] (frames, nodes)
+        :param frames: [ndarray] (frames,) frame numbers
+        """
+        if not len(deltas):
+            return
+        rows = deltas.argmax(axis=0)
+        chunkMax = deltas[rows, np.arange(deltas.shape[1])]
+        # NOTE(fuzes): The first chunk always sets the frame, so nodes without deltas point at a compared frame
+        bigger = chunkMax > self.max if self.frames else np.ones(len(chunkMax), dtype=np.bool_)
+        self.max[bigger] = chunkMax[bigger]
+        self.maxFrame[bigger] = frames[rows[bigger]]
+        self.sumSquared += (deltas ** 2).sum(axis=0)
+        self.frames += len(deltas)
+
+    def rms(self):
+        return np.sqrt(self.sumSquared / self.frames) if self.frames else self.sumSquared
+
+def compare(old, new, tolerances = None, chunkFrames = 64):
+    """
+    Compares two streams of the same set of ddraw nodes.
+    :param old: [DDrawStream]|[string] stream or path for load
+    :param new: [DDrawStream]|[string]
+    :param tolerances: [dict] kind -> field -> tolerance overriding DEFAULT_TOLERANCES
+    :param chunkFrames: [int] number of frames compared at once, bounds the memory use
+    :return: [dict] with the keys frames, entries (ranked, worst first) and unmatched.
+    Each entry holds kind, name, newName, sourceChanged, field (the worst), score (its max / tolerance) and
+    fields: field -> max, rms, frame (of the max), tolerance, exceeded
+    """
+    if not isinstance(old, DDrawStream):
+        old = load(old)
+    if not isinstance(new, DDrawStream):
+        new = load(new)
+    tolerances = tolerances or {}
+
+    frames, positionsOld, positionsNew = alignFrames(old.frames, new.frames)
+    entries = []
+    unmatched = {}
+    for kind in KINDS:
+        sourcesOld = old.sources.get(kind, [])
+        sourcesNew = new.sources.get(kind, [])
+        pairs, leftOld, leftNew = alignNodes(old.names[kind], sourcesOld, new.names[kind], sourcesNew)
+        unmatched[kind] = {"old": [old.names[kind][i] for i in leftOld], "new": [new.names[kind][j] for j in leftNew]}
+        if not pairs:
+            continue
+
+        columnsOld = asSlice(np.array([i for i, j in pairs]))
+        columnsNew = asSlice(np.array([j for i, j in pairs]))
+        fields = sorted(DEFAULT_TOLERANCES[kind].items())
+        accumulators = dict((field, DDrawDeltaAccumulator(len(pairs))) for field, _ in fields)
+
+        for start in xrange(0, len(frames), chunkFrames):
+            stop = start + chunkFrames
+            valuesOld = old.values[kind][asSlice(old.rows[positionsOld[start:stop]])][:, columnsOld]
+            valuesNew = new.values[kind][asSlice(new.rows[positionsNew[start:stop]])][:, columnsNew]
+            for field, (metric, _) in fields:
+                deltas = fieldDelta(getField(valuesOld, kind, field), getField(valuesNew, kind, field), metric)
+                accumulators[field].add(deltas, frames[start:stop])
+
+        kindTolerances = tolerances.get(kind, {})
+        stats = {}
+        scores = []
+        for field, (metric, tolerance) in fields:
+            tolerance = kindTolerances.get(field, tolerance)
+            accumulator = accumulators[field]
+            stats[field] = (accumulator.max, accumulator.rms(), accumulator.maxFrame, tolerance)
+            scores.append(accumulator.max / tolerance)
+        scores = np.array(scores)
+        worst = scores.argmax(axis=0)
+
+        for n, (i, j) in enumerate(pairs):
+            sourceChanged = i < len(sourcesOld) and j < len(sourcesNew) and sourcesOld[i] != sourcesNew[j]
+            entry = {
+                "kind": kind,
+                "name": old.names[kind][i],
+                "newName": new.names[kind][j],
+                "sourceChanged": bool(sourceChanged),
+                "field": fields[worst[n]][0],
+                "score": float(scores[worst[n], n]),
+                "fields": {},
+            }
+            for field, (maxDelta, rms, maxFrame, tolerance) in stats.items():
+                entry["fields"][field] = {
+                    "max": float(maxDelta[n]),
+                    "rms": float(rms[n]),
+                    "frame": int(maxFrame[n]),
+                    "tolerance": tolerance,
+                    "exceeded": bool(maxDelta[n] > tolerance),
+                }
+            entries.append(entry)
+
+    entries.sort(key=lambda e: e["score"], reverse=True)
+    return {"frames": len(frames), "entries": entries, "unmatched": unmatched}
+
+def formatReport(report, limit = 50):
+    """
+    :param report: [dict] returned by compare
+    :param limit: [int] number of entries to list
+    :return: [string] the worst entries as a table, followed by the unmatched nodes
+    """
+    exceeded = [e for e in report["entries"] if e["score"] > 1.0]
+    lines = ["{} frames compared, {} of {} nodes exceed their tolerance".format(report["frames"], len(exceeded),
+                                                                              len(report["entries"]))]
+    lines.append(" | ".join("{:>24}".format(c) for c in ("node", "field", "max", "rms", "frame", "x tolerance")))
+    for entry in report["entries"][:limit]:
+        field = entry["fields"][entry["field"]]
+        name = entry["name"] if entry["name"] == entry["newName"] else "{} -> {}".format(entry["name"],
+                                                                                         entry["newName"])
+        if entry["sourceChanged"]:
+            name += " (rewired)"
+        lines.append(" | ".join("{:>24}".format(v) for v in (
+            name, entry["field"], "{:.6g}".format(field["max"]), "{:.6g}".format(field["rms"]), field["frame"],
+            "{:.1f}".format(entry["score"]))))
+
+    for kind, nodes in sorted(report["unmatched"].items()):
+        if nodes["old"]:
+            lines.append("Only in the old {}: {}".format(kind, ", ".join(nodes["old"])))
+        if nodes["new"]:
+            lines.append("Only in the new {}: {}".format(kind, ", ".join(nodes["new"])))
+    return "\n".join(lines)
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        print("usage: python ddraw_diff.py old new [report.json]")
+        sys.exit(1)
+    diffReport = compare(sys.argv[1], sys.argv[2])
+    print(formatReport(diffReport))
+    if len(sys.argv) > 3:
+        with open(sys.argv[3], "w") as f:
+            json.dump(diffReport, f, indent=2, sort_keys=True)
@@ -0,0 +1,292 @@
+"""
+Streams the values of the ddraw nodes into files for offline analysis tools:
+
+    import ddraw_export
+    ddraw_export.exportScene("c:/temp/shot010_export", 1001, 1250, fileFormat="csv")
+    ddraw_export.exportRecording(ddraw_record.DDrawRecording("c:/temp/shot010_ddraw"), "c:/temp/shot010_npz")
+
+The export is a generator pipeline: a source yields the readings frame by frame, iterBlocks collects them into
+fixed size blocks and the writer writes each block before the next one gets collected. Only a single block is
+ever held in memory, no matter how long the shot is. Blocks hold at most blockRows frames * nodes, so scenes with
+many nodes get blocks with fewer frames. The CSV rows get formatted _CSV_CHUNK_ROWS at a time.
+
+npz: One compressed block_#####.npz per block holding the frames and a (frames, nodes) array per node type.
+csv: One file per node type with a row per frame and node, components get a column each. Appended block by block.
+
+Both write manifest.json with the node names, the plugs driving the nodes and the blocks.
+Requires NumPy like ddraw_math.
+"""
+import os
+import json
+import timeit
+import logging
+
+import numpy as np
+
+from maya import cmds
+
+from ddraw_core import DDrawTypes
+from ddraw_probe import DDrawProbe
+
+_MANIFEST_NAME = "manifest.json"
+
+# NOTE(fuzes): Max frames * nodes of a block, about 13MB for matrices
+_BLOCK_ROWS = 100000
+_CSV_CHUNK_ROWS = 1024
+
+global_logger = logging.getLogger("ddraw_loger")
+
+# NOTE(fuzes): Same names as the files of ddraw_record
+_EXPORT_NAMES = {
+    DDrawTypes.kVector: "vectors",
+    DDrawTypes.kAngle: "angles",
+    DDrawTypes.kMatrix: "matrices",
+}
+
+# NOTE(fuzes): Enough digits to read the exact values back
+_CSV_FORMATS = {
+    np.dtype(np.float32): "%.9g",
+    np.dtype(np.float64): "%.17g",
+}
+
+#
+# Sources
+#
+
+def iterSceneFrames(probe, startFrame, endFrame):
+    """
+    Steps the scene through the frame range and reads the nodes on every frame, then goes back to the current frame.
+    The readings are read into the same arrays every frame, consumers have to copy what they keep.
+    :param probe: [DDrawProbe]
+    :param startFrame: [int]
+    :param endFrame: [int]
+    :return: [tuple] of [int] frame, [dict] [DDrawTypes] -> [ndarray] of the ddraw_probe dtypes per frame
+    """
+    readings = probe.allocate()
+    currentFrame = cmds.currentTime(q=True)
+    try:
+        for frame in xrange(int(startFrame), int(endFrame) + 1):
+            cmds.currentTime(frame)
+            yield frame, probe.read(out=readings)
+    finally:
+        cmds.currentTime(currentFrame)
+
+def iterRecordingFrames(recording):
+    """
+    Yields the recorded frames of a recording.
+    :param recording: [DDrawRecording]
+    :return: [tuple] of [int] frame, [dict] [DDrawTypes] -> [ndarray] of the ddraw_probe dtypes per frame
+    """
+    for frame in recording.frames():
+        row = recording.row(frame)
+        yield int(frame), dict((ddrawType, values[row]) for ddrawType, values in recording.values.items())
+
+#
+# Blocks
+#
+
+def getBlockFrames(nodeCount, blockFrames, blockRows):
+    """
+    :param nodeCount: [int] number of nodes of all types
+    :param blockFrames: [int] max number of frames per block
+    :param blockRows: [int] max number of frames * nodes per block
+    :return: [int] number of frames per block, at least 1
+    """
+    return max(1, min(blockFrames, blockRows // max(nodeCount, 1)))
+
+def iterBlocks(frames, blockFrames, blockRows = _BLOCK_ROWS):
+    """
+    Collects the frames into blocks of blockFrames frames, the last block can be shorter. The block arrays get
+    allocated once and refilled for every block, consumers have to be done with a block before asking for the next.
+    :param frames: [iterable] of [tuple] frame, readings like iterSceneFrames yields
+    :param blockFrames: [int] max number of frames per block
+    :param blockRows: [int] max number of frames * nodes per block, see getBlockFrames
+    :return: [tuple] of [ndarray] frame numbers, [dict] [DDrawTypes] -> [ndarray] (frames, nodes) per block
+    """
+    frameNumbers = None
+    block = None
+    count = 0
+    for frame, readings in frames:
+        if block is None:
+            blockFrames = getBlockFrames(sum(len(values) for values in readings.values()), blockFrames, blockRows)
+            frameNumbers = np.zeros(blockFrames, dtype=np.int64)
+            block = dict((ddrawType, np.zeros((blockFrames,) + values.shape, dtype=values.dtype))
+                         for ddrawType, values in readings.items())
+        frameNumbers[count] = frame
+        for ddrawType, values in readings.items():
+            block[ddrawType][count] = values
+        count += 1
+        if count == blockFrames:
+            yield frameNumbers, block
+            count = 0
+
+    if count:
+        yield frameNumbers[:count], dict((ddrawType, values[:count]) for ddrawType, values in block.items())
+
+#
+# Writers
+#
+
+def writeNpzBlocks(path, blocks):
+    """
+    :param path: [string] directory
+    :param blocks: [iterable] of blocks like iterBlocks yields
+    :return: [tuple] of [string] file name, [int] frames for each written block
+    """
+    for index, (frameNumbers, block) in enumerate(blocks):
+        fileName = "block_{:05d}.npz".format(index)
+        arrays = dict((_EXPORT_NAMES[ddrawType], values) for ddrawType, values in block.items())
+        np.savez_compressed(os.path.join(path, fileName), frames=frameNumbers, **arrays)
+        yield fileName, len(frameNumbers)
+
+def getCsvColumns(dtype):
+    """
+    :param dtype: [dtype] structured ddraw_probe dtype
+    :return: [list] of [string] column names, Ex: origin_0, origin_1, origin_2, magnitude
+    """
+    Result = []
+    for name in dtype.names:
+        shape = dtype.fields[name][0].shape
+        if not shape:
+            Result.append(name)
+        else:
+            Result.extend("{}_{}".format(name, "".join(str(i) for i in index)) for index in np.ndindex(*shape))
+    return Result
+
+def getCsvRowFormat(dtype):
+    """
+    :param dtype: [dtype] structured ddraw_probe dtype
+    :return: [list] of [string] % format per column of a row starting with the frame and the node name
+    """
+    formats = ["%d", "%s"]
+    for name in dtype.names:
+        fieldType = dtype.fields[name][0]
+        formats.extend([_CSV_FORMATS[fieldType.base]] * max(int(np.prod(fieldType.shape)), 1))
+    return formats
+
+def flattenBlock(values):
+    """
+    :param values: [ndarray] (frames, nodes) of a structured ddraw_probe dtype
+    :return: [ndarray] float64 (frames * nodes, components) matching getCsvColumns
+    """
+    rows = values.reshape(-1)
+    # NOTE(fuzes): The column count has to be explicit, -1 can not be inferred for kinds without nodes
+    return np.hstack([rows[name].reshape(len(rows), max(int(np.prod(values.dtype.fields[name][0].shape)), 1))
+                      .astype(np.float64) for name in values.dtype.names])
+
+def writeCsvRows(f, formats, frame, nodeNames, values):
+    """
+    Writes the rows of some nodes on one frame.
+    :param f: [file] the CSV file
+    :param formats: [list] see getCsvRowFormat
+    :param frame: [int]
+    :param nodeNames: [ndarray] of [string] names of the nodes
+    :param values: [ndarray] (nodes,) of a structured ddraw_probe dtype
+    :return: [None]
+    """
+    rows = np.empty((len(values), len(formats)), dtype=object)
+    rows[:, 0] = int(frame)
+    rows[:, 1] = nodeNames
+    rows[:, 2:] = flattenBlock(values)
+    np.savetxt(f, rows, fmt=formats, delimiter=",")
+
+def writeCsvBlocks(path, names, blocks):
+    """
+    :param path: [string] directory
+    :param names: [dict] [DDrawTypes] -> [list] of [string] node names, in the order of the columns of the blocks
+    :param blocks: [iterable] of blocks like iterBlocks yields
+    :return: [tuple] of [string] file name, [int] frames for each written block
+    """
+    files = {}
+    formats = {}
+    nodeNames = {}
+    try:
+        for frameNumbers, block in blocks:
+            for ddrawType, values in block.items():
+                f = files.get(ddrawType)
+                if f is None:
+                    f = files[ddrawType] = open(os.path.join(path, _EXPORT_NAMES[ddrawType] + ".csv"), "w")
+                    f.write(",".join(["frame", "node"] + getCsvColumns(values.dtype)) + "\n")
+                    formats[ddrawType] = getCsvRowFormat(values.dtype)
+                    nodeNames[ddrawType] = np.array(names[ddrawType], dtype=object)
+
+                for frameNumber, frameValues in zip(frameNumbers, values):
+                    for start in xrange(0, len(frameValues), _CSV_CHUNK_ROWS):
+                        end = start + _CSV_CHUNK_ROWS
+                        writeCsvRows(f, formats[ddrawType], frameNumber, nodeNames[ddrawType][start:end],
+                                     frameValues[start:end])
+            yield None, len(frameNumbers)
+    finally:
+        for f in files.values():
+            f.close()
+
+#
+# Export
+#
+
+def export(path, names, sources, frames, fileFormat = "npz", blockFrames = 100, blockRows = _BLOCK_ROWS):
+    """
+    Runs the pipeline and reports the throughput.
+    :param path: [string] directory, gets created if it does not exist
+    :param names: [dict] [DDrawTypes] -> [list] of [string] node names, in the order of the readings
+    :param sources: [dict] [DDrawTypes] -> [list] of source plug names per node, see DDrawProbe.getSourcePlugNames
+    :param frames: [iterable] of [tuple] frame, readings like iterSceneFrames yields
+    :param fileFormat: [string] "npz" or "csv"
+    :param blockFrames: [int] max number of frames per block
+    :param blockRows: [int] max number of frames * nodes per block
+    :return: [dict] with the keys frames, seconds and framesPerSecond
+    """
+    if fileFormat not in ("npz", "csv"):
+        raise ValueError("Unknown export format: {}".format(fileFormat))
+    if not os.path.isdir(path):
+        os.makedirs(path)
+
+    blocks = iterBlocks(frames, blockFrames, blockRows)
+    if fileFormat == "npz":
+        written = writeNpzBlocks(path, blocks)
+    else:
+        written = writeCsvBlocks(path, names, blocks)
+
+    start = timeit.default_timer()
+    blockFiles = []
+    frameCount = 0
+    for fileName, count in written:
+        frameCount += count
+        if fileName is not None:
+            blockFiles.append(fileName)
+    seconds = timeit.default_timer() - start
+
+    manifest = {
+        "format": fileFormat,
+        "names": dict((_EXPORT_NAMES[ddrawType], nodeNames) for ddrawType, nodeNames in names.items()),
+        "sources": dict((_EXPORT_NAMES[ddrawType], nodeSources) for ddrawType, nodeSources in sources.items()),
+        "frames": frameCount,
+        "blocks": blockFiles,
+    }
+    with open(os.path.join(path, _MANIFEST_NAME), "w") as f:
+        json.dump(manifest, f, indent=2)
+
+    Result = {"frames": frameCount, "seconds": seconds, "framesPerSecond": frameCount / seconds if seconds else 0.0}
+    global_logger.info("Exported {frames} frames to {path} in {seconds:.3f}s, {framesPerSecond:.1f} frames/s".format(
+        path=path, **Result))
+    return Result
+
+def exportScene(path, startFrame, endFrame, nodes = None, fileFormat = "npz", blockFrames = 100,
+                blockRows = _BLOCK_ROWS):
+    """
+    Steps the scene through the frame range and exports the ddraw nodes, see export.
+    :param nodes: [iterable] of nodes for DDrawProbe, [None] for all the ddraw nodes in the scene
+    :return: [dict] with the keys frames, seconds and framesPerSecond
+    """
+    probe = DDrawProbe(nodes)
+    return export(path, probe.names, probe.getSourcePlugNames(), iterSceneFrames(probe, startFrame, endFrame),
+                  fileFormat, blockFrames, blockRows)
+
+def exportRecording(recording, path, fileFormat = "npz", blockFrames = 100, blockRows = _BLOCK_ROWS):
+    """
+    Exports the recorded frames of a recording, see export.
+    :param recording: [DDrawRecording]
+    :return: [dict] with the keys frames, seconds and framesPerSecond
+    """
+    return export(path, recording.names, recording.sources, iterRecordingFrames(recording), fileFormat, blockFrames,
+                  blockRows)
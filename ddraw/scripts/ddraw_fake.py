@@ -0,0 +1,2128 @@
+"""
+Offline stand-in for the parts of Maya (and Qt) the ddraw tools use. Nodes, plugs, node types, modifiers
+and callbacks are modelled in pure Python so the hot paths can be measured with plain CPython, without a
+Maya license. See ddraw_bench for the benchmarks running on top of it.
+
+    import ddraw_fake
+    ddraw_fake.install()
+    import ddraw_core
+
+Every cmds/mel call and every API call which has to search by name is counted on the scene,
+see FakeScene.calls. This is not a Maya emulator: there is no evaluation of the plugin nodes,
+only the commands of Python plugins are recorded in the undo queue and the attributes only hold plain values.
+"""
+import os
+import sys
+import types
+from collections import Counter, deque
+
+#
+# Scene model
+#
+
+class FakeAttribute(object):
+
+    def __init__(self, name, kind, array = False, parent = None, index = 0, dynamic = False):
+        """
+        Attribute definition of a node type.
+
+        [string] kind: "point", "color", "float", "bool", "matrix", "typedMatrix", "string" or "message".
+        Points and colors are compounds with three float children.
+
+        :param name: [string] long name of the attribute
+        :param kind: [string] see above
+        :param array: [bool] whether this is a multi attribute
+        :param parent: [FakeAttribute] compound parent of a child attribute
+        :param index: [int] position inside of the parent
+        :param dynamic: [bool] True for attributes added to a single node
+        """
+        self.name = name
+        self.kind = kind
+        self.array = array
+        self.parent = parent
+        self.index = index
+        self.dynamic = dynamic
+        self.children = []
+        if kind in _COMPOUND_SUFFIXES:
+            self.children = [FakeAttribute(name + suffix, "float", parent=self, index=i, dynamic=dynamic)
+                             for i, suffix in enumerate(_COMPOUND_SUFFIXES[kind])]
+
+    def defaultValue(self):
+        if self.kind in _COMPOUND_SUFFIXES:
+            return [0.0, 0.0, 0.0]
+        elif self.kind in ("matrix", "typedMatrix"):
+            return list(_IDENTITY)
+        return _DEFAULT_VALUES.get(self.kind)
+
+_COMPOUND_SUFFIXES = {"point": ("X", "Y", "Z"), "color": ("R", "G", "B")}
+_DEFAULT_VALUES = {"float": 0.0, "bool": False, "string": "", "message": None}
+_IDENTITY = (1.0, 0.0, 0.0, 0.0,
+             0.0, 1.0, 0.0, 0.0,
+             0.0, 0.0, 1.0, 0.0,
+             0.0, 0.0, 0.0, 1.0)
+
+class FakeNodeType(object):
+
+    def __init__(self, name, typeId, parent = None, fns = (), apiType = None, attributes = (), shape = None):
+        """
+        Node type with its inheritance, function set compatibility and static attributes.
+
+        :param name: [string] Maya type name
+        :param typeId: [int] the id of the MTypeId
+        :param parent: [FakeNodeType] base type or [None]
+        :param fns: [iterable] of MFn constants this type adds to the base type
+        :param apiType: [int] MFn constant returned by MObject.apiType()
+        :param attributes: [iterable] of (name, kind) or (name, kind, array) the type adds to the base type
+        :param shape: [string] for shapes the name of the transform the shape gets created under
+        """
+        self.name = name
+        self.typeId = typeId
+        self.parent = parent
+        self.shape = shape
+        self.inherited = (parent.inherited if parent else []) + [name]
+        self.fns = set(parent.fns if parent else ()) | set(fns)
+        self.apiType = apiType if apiType is not None else (parent.apiType if parent else MFn.kDependencyNode)
+
+        # NOTE(fuzes): Ordered list for listAttr and a lookup by name which includes the compound children
+        self.attributeList = list(parent.attributeList) if parent else []
+        for definition in attributes:
+            self.attributeList.append(FakeAttribute(*definition))
+        self.attributes = {}
+        for attr in self.attributeList:
+            self.attributes[attr.name] = attr
+            for child in attr.children:
+                self.attributes[child.name] = child
+
+    def isA(self, typeName):
+        return typeName == "dependNode" or typeName in self.inherited
+
+class FakeNode(object):
+
+    def __init__(self, scene, nodeType, name):
+        """
+        A node in the FakeScene. Values are stored per top level attribute, compounds as lists.
+        :param scene: [FakeScene]
+        :param nodeType: [FakeNodeType]
+        :param name: [string] unique name
+        """
+        self.scene = scene
+        self.type = nodeType
+        self.name = name
+        self.values = {}
+        self.dynamicList = []
+        self.dynamic = {}
+        self.parent = None
+        self.children = []
+        self.alive = False
+        self.hashCode = scene.nextHashCode()
+
+    def attribute(self, name):
+        attr = self.type.attributes.get(name)
+        if attr is None:
+            attr = self.dynamic.get(name)
+        return attr
+
+    def attributeList(self):
+        return self.type.attributeList + self.dynamicList
+
+    def addDynamicAttribute(self, attr):
+        self.dynamicList.append(attr)
+        self.dynamic[attr.name] = attr
+        for child in attr.children:
+            self.dynamic[child.name] = child
+
+    def removeDynamicAttribute(self, attr):
+        self.dynamicList.remove(attr)
+        self.dynamic.pop(attr.name, None)
+        for child in attr.children:
+            self.dynamic.pop(child.name, None)
+        for key in [key for key in self.values if key[0] == attr.name]:
+            del self.values[key]
+
+    def fullPathName(self):
+        if not self.type.isA("dagNode"):
+            return ""
+        path = []
+        node = self
+        while node is not None:
+            path.append(node.name)
+            node = node.parent
+        return "|" + "|".join(reversed(path))
+
+class FakeScene(object):
+
+    def __init__(self):
+        """
+        Holds all the nodes, connections, the selection and the registered callbacks.
+
+        [Counter] calls: Number of calls per cmds/mel function and per name based API call
+        [list] warnings: Messages passed to cmds.warning
+        [list] undoQueue: [list] of the undoable commands per undo chunk, cmds.undo reverts the last one
+        """
+        self.nodes = []
+        self.names = {}
+        self.nameCounters = {}
+        self.connections = {}
+        self.nodeConnections = {}
+        self.selection = []
+        self.callbacks = {}
+        self.nodeEditorAddOnCreate = True
+        self.undoChunkDepth = 0
+        self.undoQueue = []
+        self.redoQueue = []
+        self._undoChunk = None
+        self.time = 0.0
+        self.calls = Counter()
+        self.warnings = []
+        self._hashCode = 0
+        self._callbackId = 0
+
+    def nextHashCode(self):
+        self._hashCode += 1
+        return self._hashCode
+
+    def count(self, name):
+        self.calls[name] += 1
+
+    def resetCounters(self):
+        self.calls.clear()
+        del self.warnings[:]
+
+    #
+    # Nodes
+    #
+
+    def uniqueName(self, name, numbered = False):
+        """
+        :param name: [string] requested name
+        :param numbered: [bool] always append a number like Maya does for nodes created without a name
+        :return: [string] the name if it is not taken yet, otherwise the name with the next free number
+        """
+        if not numbered and name not in self.names:
+            return name
+        base = name.rstrip("0123456789")
+        counter = self.nameCounters.get(base, 0) + 1
+        while base + str(counter) in self.names:
+            counter += 1
+        self.nameCounters[base] = counter
+        return base + str(counter)
+
+    def newNode(self, typeName, name = None, parent = None):
+        """
+        Creates a node which is not part of the scene yet, see addNode(). Shapes without a parent get
+        a transform created for them.
+        :return: [FakeNode] the node or for shapes the transform above it
+        """
+        nodeType = getNodeType(typeName)
+        if nodeType.shape and parent is None:
+            # NOTE(fuzes): Same naming as Maya: locator1|locatorShape1
+            transform = FakeNode(self, getNodeType("transform"), self.uniqueName(name or nodeType.shape, not name))
+            self.reserveName(transform)
+            base = transform.name.rstrip("0123456789")
+            shape = FakeNode(self, nodeType, self.uniqueName(base + "Shape" + transform.name[len(base):]))
+            self.reserveName(shape)
+            self.parentNode(shape, transform)
+            return transform
+
+        node = FakeNode(self, nodeType, self.uniqueName(name or typeName, not name))
+        self.reserveName(node)
+        if parent is not None:
+            self.parentNode(node, parent)
+        return node
+
+    def reserveName(self, node):
+        self.names[node.name] = node
+
+    def parentNode(self, node, parent):
+        if node.parent is not None:
+            node.parent.children.remove(node)
+        node.parent = parent
+        if parent is not None:
+            parent.children.append(node)
+
+    def addNode(self, node):
+        """
+        Makes the node and its children part of the scene and notifies the node added callbacks.
+        :param node: [FakeNode]
+        :return: [None]
+        """
+        node.alive = True
+        self.nodes.append(node)
+        self.reserveName(node)
+        self.emitNodeMessage("nodeAdded", node)
+        for child in node.children:
+            self.addNode(child)
+
+    def deleteNode(self, node):
+        """
+        Removes the node, its children and all its connections.
+        :param node: [FakeNode]
+        :return: [None]
+        """
+        if not node.alive:
+            return
+        self.removeNode(node)
+        self.parentNode(node, None)
+
+    def removeNode(self, node):
+        """
+        Takes the node and its children out of the scene and drops their connections. The hierarchy is kept,
+        so addNode() can bring them back like undoing a node creation.
+        :param node: [FakeNode]
+        :return: [None]
+        """
+        for child in node.children:
+            self.removeNode(child)
+        self.emitNodeMessage("nodeRemoved", node)
+        for key in list(self.nodeConnections.pop(node, ())):
+            source = self.connections.pop(key, None)
+            if source is not None:
+                self.nodeConnections.get(key[0], set()).discard(key)
+                self.nodeConnections.get(source[0], set()).discard(key)
+        if node in self.selection:
+            self.selection.remove(node)
+        node.alive = False
+        self.nodes.remove(node)
+        self.names.pop(node.name, None)
+
+    def renameNode(self, node, name):
+        prevName = node.name
+        del self.names[prevName]
+        node.name = self.uniqueName(name)
+        self.reserveName(node)
+        for callbackId, (kind, key, func, clientData) in list(self.callbacks.items()):
+            if kind == "nameChanged" and (key is None or key is node):
+                func(_mob(node), prevName, clientData)
+
+    def findNode(self, name):
+        node = self.names.get(name.split("|")[-1])
+        if node is None or not node.alive:
+            raise RuntimeError("(kInvalidParameter): Object does not exist: {}".format(name))
+        return node
+
+    def findPlug(self, name):
+        nodeName, _, attrName = name.partition(".")
+        node = self.findNode(nodeName)
+        index = None
+        if attrName.endswith("]"):
+            attrName, _, index = attrName[:-1].partition("[")
+            index = int(index)
+        attr = node.attribute(attrName)
+        if attr is None:
+            raise RuntimeError("(kInvalidParameter): No attribute {} on {}".format(attrName, node.name))
+        return node, attr, index
+
+    def setSelection(self, nodes):
+        self.selection = list(nodes)
+        self.emitEvent("SelectionChanged")
+
+    #
+    # Values and connections
+    #
+
+    def readValue(self, node, attr, index = None):
+        """
+        Reads the value of an attribute following the incoming connections.
+        :return: [float]|[bool]|[list] compounds and matrices as lists
+        """
+        source = self.connections.get((node, attr.name, index))
+        if source is not None:
+            return self.readValue(*source)
+
+        if attr.parent is not None:
+            return self.readValue(node, attr.parent, index)[attr.index]
+
+        value = node.values.get((attr.name, index))
+        if value is None:
+            value = attr.defaultValue()
+        return value
+
+    def writeValue(self, node, attr, value, index = None):
+        if attr.parent is not None:
+            current = list(self.readValue(node, attr.parent, index))
+            current[attr.index] = value
+            attr, value = attr.parent, current
+        node.values[(attr.name, index)] = value
+
+    def connect(self, source, destination):
+        """
+        :param source: [tuple] (FakeNode, FakeAttribute, index)
+        :param destination: [tuple] (FakeNode, FakeAttribute, index)
+        """
+        key = (destination[0], destination[1].name, destination[2])
+        previous = self.connections.get(key)
+        if previous is not None:
+            self.nodeConnections[previous[0]].discard(key)
+        self.connections[key] = source
+        self.nodeConnections.setdefault(destination[0], set()).add(key)
+        self.nodeConnections.setdefault(source[0], set()).add(key)
+        self.emitConnection(source, destination, True)
+
+    def disconnect(self, source, destination):
+        key = (destination[0], destination[1].name, destination[2])
+        if self.connections.get(key) == source:
+            del self.connections[key]
+            self.nodeConnections[destination[0]].discard(key)
+            self.nodeConnections[source[0]].discard(key)
+            self.emitConnection(source, destination, False)
+
+    def sourceOf(self, node, attr, index = None):
+        return self.connections.get((node, attr.name, index))
+
+    def destinationsOf(self, node, attr, index = None):
+        return [(key[0], key[0].attribute(key[1]), key[2]) for key in self.nodeConnections.get(node, ())
+                if self.connections[key] == (node, attr, index)]
+
+    #
+    # Undo queue
+    #
+
+    def openUndoChunk(self):
+        if self.undoChunkDepth == 0:
+            self._undoChunk = []
+        self.undoChunkDepth += 1
+
+    def closeUndoChunk(self):
+        self.undoChunkDepth -= 1
+        if self.undoChunkDepth == 0:
+            if self._undoChunk:
+                self.undoQueue.append(self._undoChunk)
+            self._undoChunk = None
+
+    def recordCommand(self, command):
+        """
+        :param command: [MPxCommand] an undoable command which got executed
+        """
+        del self.redoQueue[:]
+        if self._undoChunk is not None:
+            self._undoChunk.append(command)
+        else:
+            self.undoQueue.append([command])
+
+    def undo(self):
+        if not self.undoQueue:
+            return False
+        chunk = self.undoQueue.pop()
+        for command in reversed(chunk):
+            command.undoIt()
+        self.redoQueue.append(chunk)
+        self.emitEvent("Undo")
+        return True
+
+    def redo(self):
+        if not self.redoQueue:
+            return False
+        chunk = self.redoQueue.pop()
+        for command in chunk:
+            command.redoIt()
+        self.undoQueue.append(chunk)
+        self.emitEvent("Redo")
+        return True
+
+    #
+    # Callbacks
+    #
+
+    def addCallback(self, kind, key, func, clientData):
+        self._callbackId += 1
+        self.callbacks[self._callbackId] = (kind, key, func, clientData)
+        return self._callbackId
+
+    def removeCallback(self, callbackId):
+        self.callbacks.pop(callbackId, None)
+
+    def emitNodeMessage(self, kind, node):
+        for callbackId, (callbackKind, typeName, func, clientData) in list(self.callbacks.items()):
+            if callbackKind == kind and node.type.isA(typeName):
+                func(_mob(node), clientData)
+
+    def emitEvent(self, eventName):
+        for callbackId, (kind, key, func, clientData) in list(self.callbacks.items()):
+            if kind == "event" and key == eventName:
+                func(clientData)
+
+    def emitConnection(self, source, destination, made):
+        for callbackId, (kind, key, func, clientData) in list(self.callbacks.items()):
+            if kind == "connection":
+                func(MPlug._fromRef(source), MPlug._fromRef(destination), made, clientData)
+
+    def emitSceneMessage(self, message):
+        for callbackId, (kind, key, func, clientData) in list(self.callbacks.items()):
+            if kind == "scene" and key == message:
+                func(clientData)
+
+    def emitAttributeMessage(self, node, attr, message):
+        for callbackId, (kind, key, func, clientData) in list(self.callbacks.items()):
+            if kind == "attributeAddedOrRemoved" and (key is None or key is node):
+                func(message, MPlug._fromRef((node, attr, None)), clientData)
+
+_SCENE = FakeScene()
+def getScene():
+    """
+    :return: [FakeScene] the scene the stand-in modules currently work on
+    """
+    return _SCENE
+
+def newScene():
+    """
+    Replaces the current scene with an empty one. Registered callbacks are kept like in Maya.
+    :return: [FakeScene]
+    """
+    global _SCENE
+    callbacks = _SCENE.callbacks
+    callbackId = _SCENE._callbackId
+    _SCENE = FakeScene()
+    _SCENE.callbacks = callbacks
+    _SCENE._callbackId = callbackId
+    return _SCENE
+
+#
+# OpenMaya 2.0 stand-in
+#
+
+# noinspection PyClassHasNoInit
+class MFn:
+    kInvalid = 0
+    kDependencyNode = 4
+    kDagNode = 107
+    kTransform = 110
+    kJoint = 121
+    kShape = 248
+    kLocator = 281
+    kPluginLocatorNode = 449
+    kDecomposeMatrix = 1129
+    kAttribute = 554
+    kNumericAttribute = 556
+    kCompoundAttribute = 557
+    kMatrixAttribute = 567
+    kMessageAttribute = 568
+    kTypedAttribute = 569
+
+# noinspection PyClassHasNoInit
+class MFnData:
+    kInvalid = 0
+    kString = 4
+    kMatrix = 5
+
+_ATTRIBUTE_API_TYPES = {
+    "point": MFn.kNumericAttribute,
+    "color": MFn.kNumericAttribute,
+    "float": MFn.kNumericAttribute,
+    "bool": MFn.kNumericAttribute,
+    "matrix": MFn.kMatrixAttribute,
+    "typedMatrix": MFn.kTypedAttribute,
+    "string": MFn.kTypedAttribute,
+    "message": MFn.kMessageAttribute,
+}
+
+_NODE_TYPES = {}
+def registerNodeType(*args, **kwargs):
+    """
+    Registers a node type, see FakeNodeType for the arguments.
+    :return: [FakeNodeType]
+    """
+    parent = kwargs.pop("parent", None)
+    nodeType = FakeNodeType(*args, parent=_NODE_TYPES.get(parent), **kwargs)
+    _NODE_TYPES[nodeType.name] = nodeType
+    return nodeType
+
+def getNodeType(typeName):
+    nodeType = _NODE_TYPES.get(typeName)
+    if nodeType is None:
+        raise RuntimeError("Unknown object type: {}".format(typeName))
+    return nodeType
+
+# NOTE(fuzes): Trimmed down versions of the Maya types, enough attributes to make listAttr realistic
+registerNodeType("containerBase", 0x4e424153, fns=(MFn.kDependencyNode,),
+                 attributes=(("message", "message"), ("caching", "bool"), ("frozen", "bool"),
+                             ("isHistoricallyInteresting", "float"), ("nodeState", "float")))
+registerNodeType("entity", 0x4e454e54, parent="containerBase")
+registerNodeType("dagNode", 0x4e444147, parent="entity", fns=(MFn.kDagNode,), apiType=MFn.kDagNode,
+                 attributes=(("boundingBoxMin", "point"), ("boundingBoxMax", "point"), ("center", "point"),
+                             ("matrix", "matrix"), ("inverseMatrix", "matrix"),
+                             ("worldMatrix", "matrix", True), ("worldInverseMatrix", "matrix", True),
+                             ("parentMatrix", "matrix", True), ("parentInverseMatrix", "matrix", True),
+                             ("visibility", "bool"), ("intermediateObject", "bool"), ("template", "bool"),
+                             ("hiddenInOutliner", "bool"), ("useOutlinerColor", "bool"),
+                             ("outlinerColor", "color"), ("lodVisibility", "bool")))
+registerNodeType("transform", 0x5846524d, parent="dagNode", fns=(MFn.kTransform,), apiType=MFn.kTransform,
+                 attributes=(("translate", "point"), ("rotate", "point"), ("scale", "point"),
+                             ("shear", "point"), ("rotatePivot", "point"), ("rotatePivotTranslate", "point"),
+                             ("scalePivot", "point"), ("scalePivotTranslate", "point"), ("rotateAxis", "point"),
+                             ("offsetParentMatrix", "typedMatrix"), ("xformMatrix", "matrix"),
+                             ("rotateOrder", "float"), ("displayHandle", "bool"), ("displayLocalAxis", "bool"),
+                             ("inheritsTransform", "bool"), ("minTransLimit", "point"),
+                             ("maxTransLimit", "point")))
+registerNodeType("joint", 0x4a4f494e, parent="transform", fns=(MFn.kJoint,), apiType=MFn.kJoint,
+                 attributes=(("jointOrient", "point"), ("segmentScaleCompensate", "bool"), ("radius", "float"),
+                             ("bindPose", "typedMatrix"), ("preferredAngle", "point"), ("stiffness", "point")))
+registerNodeType("shape", 0x4e534850, parent="dagNode", fns=(MFn.kShape,), apiType=MFn.kShape)
+registerNodeType("locator", 0x4c4f4354, parent="shape", fns=(MFn.kLocator,), apiType=MFn.kLocator,
+                 shape="locator", attributes=(("localPosition", "point"), ("worldPosition", "point", True),
+                                              ("localScale", "point")))
+registerNodeType("ddraw_vector", 0x0012e180, parent="locator", fns=(MFn.kPluginLocatorNode,),
+                 apiType=MFn.kPluginLocatorNode, shape="ddraw_vector",
+                 attributes=(("origin", "point"), ("endPoint", "point"), ("vectorColor", "color"),
+                             ("textColor", "color"), ("coneRadius", "float"), ("coneHeight", "float"),
+                             ("displayText", "bool")))
+registerNodeType("ddraw_angle", 0x0012e181, parent="locator", fns=(MFn.kPluginLocatorNode,),
+                 apiType=MFn.kPluginLocatorNode, shape="ddraw_angle",
+                 attributes=(("vector1", "point"), ("vector2", "point"), ("origin", "point"),
+                             ("textColor", "color"), ("normalize", "bool")))
+registerNodeType("ddraw_matrix", 0x0012e182, parent="locator", fns=(MFn.kPluginLocatorNode,),
+                 apiType=MFn.kPluginLocatorNode, shape="ddraw_matrix",
+                 attributes=(("inMatrix", "matrix"), ("displayText", "bool"), ("textColor", "color")))
+registerNodeType("decomposeMatrix", 0x4644434d, fns=(MFn.kDependencyNode, MFn.kDecomposeMatrix),
+                 apiType=MFn.kDecomposeMatrix,
+                 attributes=(("message", "message"), ("inputMatrix", "matrix"), ("outputTranslate", "point"),
+                             ("outputRotate", "point"), ("outputScale", "point"), ("outputShear", "point")))
+
+class MTypeId(object):
+
+    def __init__(self, typeId = 0):
+        self._id = typeId
+
+    def id(self):
+        return self._id
+
+    def __eq__(self, other):
+        return isinstance(other, MTypeId) and other._id == self._id
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(self._id)
+
+class MObject(object):
+
+    # NOTE(fuzes): Like the real MObject these are not hashable, use MObjectHandle.hashCode()
+    __hash__ = None
+
+    def __init__(self, other = None):
+        self._node = other._node if other is not None else None
+        self._attr = other._attr if other is not None else None
+
+    def isNull(self):
+        return self._node is None and self._attr is None
+
+    def hasFn(self, fn):
+        if self._attr is not None:
+            return fn in (MFn.kAttribute, _ATTRIBUTE_API_TYPES[self._attr.kind])
+        if self._node is None:
+            return False
+        return fn in self._node.type.fns
+
+    def apiType(self):
+        if self._attr is not None:
+            return _ATTRIBUTE_API_TYPES[self._attr.kind]
+        if self._node is None:
+            return MFn.kInvalid
+        return self._node.type.apiType
+
+    def __eq__(self, other):
+        return isinstance(other, MObject) and other._node is self._node and other._attr is self._attr
+
+    def __ne__(self, other):
+        return not self == other
+
+MObject.kNullObj = MObject()
+
+def _mob(node = None, attr = None):
+    Result = MObject()
+    Result._node = node
+    Result._attr = attr
+    return Result
+
+class MObjectHandle(object):
+
+    def __init__(self, mob = None):
+        self._node = mob._node if mob is not None else None
+        self._attr = mob._attr if mob is not None else None
+
+    def object(self):
+        return _mob(self._node, self._attr)
+
+    def isValid(self):
+        return self._attr is not None or self._node is not None and self._node.alive
+
+    def isAlive(self):
+        return self.isValid()
+
+    def hashCode(self):
+        if self._attr is not None:
+            return id(self._attr) & 0x7fffffff
+        return self._node.hashCode if self._node is not None else 0
+
+    def __eq__(self, other):
+        if isinstance(other, (MObjectHandle, MObject)):
+            return other._node is self._node and other._attr is self._attr
+        return False
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
+
+class MColor(object):
+
+    def __init__(self, values = (0.0, 0.0, 0.0, 1.0)):
+        values = list(values)
+        if len(values) == 3:
+            values.append(1.0)
+        self.r, self.g, self.b, self.a = [float(v) for v in values]
+
+    def __len__(self):
+        return 4
+
+    def __getitem__(self, i):
+        return (self.r, self.g, self.b, self.a)[i]
+
+    def __eq__(self, other):
+        return isinstance(other, MColor) and tuple(self) == tuple(other)
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __iter__(self):
+        return iter((self.r, self.g, self.b, self.a))
+
+class MFloatVector(object):
+
+    def __init__(self, x = 0.0, y = 0.0, z = 0.0):
+        if isinstance(x, (list, tuple, MFloatVector)):
+            x, y, z = x[0], x[1], x[2]
+        self.x, self.y, self.z = float(x), float(y), float(z)
+
+    def __len__(self):
+        return 3
+
+    def __getitem__(self, i):
+        return (self.x, self.y, self.z)[i]
+
+    def __iter__(self):
+        return iter((self.x, self.y, self.z))
+
+MVector = MFloatVector
+
+class MMatrix(object):
+
+    def __init__(self, values = _IDENTITY):
+        values = list(values)
+        if values and isinstance(values[0], (list, tuple)):
+            values = [v for row in values for v in row]
+        self._values = [float(v) for v in values]
+
+    def __len__(self):
+        return 16
+
+    def __getitem__(self, i):
+        return self._values[i]
+
+    def getElement(self, row, column):
+        return self._values[row * 4 + column]
+
+    def __iter__(self):
+        return iter(self._values)
+
+class MDataHandle(object):
+
+    def __init__(self, value):
+        self._value = value
+
+    def asFloat3(self):
+        return tuple(self._value)
+
+    def asDouble3(self):
+        return tuple(self._value)
+
+    def asFloatVector(self):
+        return MFloatVector(self._value)
+
+    def asVector(self):
+        return MFloatVector(self._value)
+
+    def asMatrix(self):
+        return MMatrix(self._value)
+
+    def asFloat(self):
+        return self._value
+
+    def asBool(self):
+        return bool(self._value)
+
+    def setMFloatVector(self, vector):
+        self._value = [vector[0], vector[1], vector[2]]
+
+    def setMVector(self, vector):
+        self.setMFloatVector(vector)
+
+    def setMMatrix(self, matrix):
+        self._value = list(matrix)
+
+class MPlug(object):
+
+    def __init__(self, node = None, attribute = None):
+        if isinstance(node, MPlug):
+            self._node, self._attr, self._index = node._node, node._attr, node._index
+            return
+        self._node = node._node if node is not None else None
+        self._attr = attribute._attr if attribute is not None else None
+        self._index = None
+
+    @classmethod
+    def _fromRef(cls, ref):
+        Result = cls()
+        Result._node, Result._attr, Result._index = ref
+        return Result
+
+    def _ref(self):
+        return self._node, self._attr, self._index
+
+    @property
+    def isNull(self):
+        return self._node is None or self._attr is None
+
+    @property
+    def isCompound(self):
+        return bool(self._attr.children)
+
+    @property
+    def isArray(self):
+        return self._attr.array and self._index is None
+
+    @property
+    def isElement(self):
+        return self._index is not None
+
+    @property
+    def isChild(self):
+        return self._attr.parent is not None
+
+    @property
+    def isDynamic(self):
+        return self._attr.dynamic
+
+    @property
+    def isDestination(self):
+        return self._node.scene.sourceOf(*self._ref()) is not None
+
+    @property
+    def isSource(self):
+        return bool(self._node.scene.destinationsOf(*self._ref()))
+
+    @property
+    def logicalIndex(self):
+        return self._index
+
+    def node(self):
+        return _mob(self._node)
+
+    def attribute(self):
+        return _mob(attr=self._attr)
+
+    def partialName(self, includeNodeName = False, includeNonMandatoryIndices = False,
+                    includeInstancedIndices = False, useAlias = False, useFullAttributePath = False,
+                    useLongNames = False):
+        Result = self._attr.name
+        if self._index is not None:
+            Result += "[{}]".format(self._index)
+        if includeNodeName:
+            Result = self._node.name + "." + Result
+        return Result
+
+    def name(self):
+        return self.partialName(includeNodeName=True)
+
+    def numChildren(self):
+        return len(self._attr.children)
+
+    def child(self, index):
+        if isinstance(index, MObject):
+            index = index._attr.index
+        Result = MPlug._fromRef((self._node, self._attr.children[index], self._index))
+        return Result
+
+    def parent(self):
+        return MPlug._fromRef((self._node, self._attr.parent, self._index))
+
+    def elementByLogicalIndex(self, index):
+        return MPlug._fromRef((self._node, self._attr, index))
+
+    def source(self):
+        source = self._node.scene.sourceOf(*self._ref())
+        return MPlug._fromRef(source) if source is not None else MPlug()
+
+    def destinations(self):
+        return [MPlug._fromRef(ref) for ref in self._node.scene.destinationsOf(*self._ref())]
+
+    def connectedTo(self, asDst, asSrc):
+        Result = []
+        if asDst and not self.source().isNull:
+            Result.append(self.source())
+        if asSrc:
+            Result.extend(self.destinations())
+        return Result
+
+    def _value(self):
+        return self._node.scene.readValue(*self._ref())
+
+    def asFloat(self):
+        return float(self._value())
+
+    asDouble = asFloat
+
+    def asBool(self):
+        return bool(self._value())
+
+    def asInt(self):
+        return int(self._value())
+
+    def asString(self):
+        return str(self._value())
+
+    def asMDataHandle(self):
+        return MDataHandle(self._value())
+
+    def _write(self, value):
+        self._node.scene.writeValue(self._node, self._attr, value, self._index)
+
+    def setFloat(self, value):
+        self._write(float(value))
+
+    setDouble = setFloat
+
+    def setBool(self, value):
+        self._write(bool(value))
+
+    def setInt(self, value):
+        self._write(int(value))
+
+    def setString(self, value):
+        self._write(str(value))
+
+    def setMDataHandle(self, handle):
+        self._write(handle._value)
+
+    def __eq__(self, other):
+        return isinstance(other, MPlug) and self._ref() == other._ref()
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
+
+class MFnDependencyNode(object):
+
+    def __init__(self, mob = None):
+        self._node = None
+        if mob is not None:
+            self.setObject(mob)
+
+    def setObject(self, mob):
+        if mob._node is None:
+            raise RuntimeError("(kInvalidParameter): Object is incompatible with this method")
+        self._node = mob._node
+        return self
+
+    def object(self):
+        return _mob(self._node)
+
+    def name(self):
+        return self._node.name
+
+    def setName(self, name):
+        self._node.scene.renameNode(self._node, name)
+        return self._node.name
+
+    def absoluteName(self):
+        return ":" + self._node.name
+
+    @property
+    def namespace(self):
+        return self._node.name.rpartition(":")[0]
+
+    @property
+    def typeName(self):
+        return self._node.type.name
+
+    @property
+    def typeId(self):
+        return MTypeId(self._node.type.typeId)
+
+    @property
+    def isFromReferencedFile(self):
+        return False
+
+    def hasAttribute(self, name):
+        self._node.scene.count("om2.MFnDependencyNode.hasAttribute")
+        return self._node.attribute(name) is not None
+
+    def attributeCount(self):
+        return len(self._node.attributeList())
+
+    def attribute(self, nameOrIndex):
+        if isinstance(nameOrIndex, int):
+            return _mob(attr=self._node.attributeList()[nameOrIndex])
+        self._node.scene.count("om2.MFnDependencyNode.attribute")
+        attr = self._node.attribute(nameOrIndex)
+        return _mob(attr=attr) if attr is not None else MObject()
+
+    def findPlug(self, attribute, wantNetworkedPlug):
+        if isinstance(attribute, MObject):
+            attr = attribute._attr
+        else:
+            self._node.scene.count("om2.MFnDependencyNode.findPlug")
+            attr = self._node.attribute(attribute)
+        if attr is None:
+            raise RuntimeError("(kInvalidParameter): Cannot find item of required type")
+        return MPlug._fromRef((self._node, attr, None))
+
+    def getConnections(self):
+        scene = self._node.scene
+        Result = []
+        for key in scene.nodeConnections.get(self._node, ()):
+            source = scene.connections[key]
+            if key[0] is self._node:
+                Result.append(MPlug._fromRef((key[0], key[0].attribute(key[1]), key[2])))
+            elif source[0] is self._node:
+                Result.append(MPlug._fromRef(source))
+        return Result
+
+class MFnDagNode(MFnDependencyNode):
+
+    def parent(self, index):
+        if self._node.parent is None:
+            return MObject()
+        return _mob(self._node.parent)
+
+    def parentCount(self):
+        return 1 if self._node.parent is not None else 0
+
+    def child(self, index):
+        return _mob(self._node.children[index])
+
+    def childCount(self):
+        return len(self._node.children)
+
+    def fullPathName(self):
+        return self._node.fullPathName()
+
+    def partialPathName(self):
+        return self._node.name
+
+class MFnTypedAttribute(object):
+
+    def __init__(self, mob = None):
+        self._attr = mob._attr if mob is not None else None
+
+    def attrType(self):
+        return MFnData.kMatrix if self._attr.kind == "typedMatrix" else MFnData.kString
+
+class MFnAttribute(object):
+
+    def __init__(self, mob = None):
+        self._attr = mob._attr if mob is not None else None
+
+    def setObject(self, mob):
+        self._attr = mob._attr
+        return self
+
+    @property
+    def name(self):
+        return self._attr.name
+
+    @property
+    def dynamic(self):
+        return self._attr.dynamic
+
+    @property
+    def parent(self):
+        return _mob(attr=self._attr.parent) if self._attr.parent is not None else MObject()
+
+class MFnNumericAttribute(MFnAttribute):
+
+    def createPoint(self, longName, shortName):
+        self._attr = FakeAttribute(longName, "point", dynamic=True)
+        return _mob(attr=self._attr)
+
+    def create(self, longName, shortName, dataType = None, defaultValue = 0.0):
+        self._attr = FakeAttribute(longName, "float", dynamic=True)
+        return _mob(attr=self._attr)
+
+class MFnMatrixAttribute(MFnAttribute):
+
+    def create(self, longName, shortName, matrixType = 0):
+        self._attr = FakeAttribute(longName, "matrix", dynamic=True)
+        return _mob(attr=self._attr)
+
+class MSelectionList(object):
+
+    def __init__(self, other = None):
+        self._items = list(other._items) if other is not None else []
+
+    def add(self, item):
+        if isinstance(item, MObject):
+            self._items.append((item._node, None, None))
+        elif isinstance(item, MPlug):
+            self._items.append(item._ref())
+        else:
+            _SCENE.count("om2.MSelectionList.add")
+            if "." in item:
+                self._items.append(_SCENE.findPlug(item))
+            else:
+                self._items.append((_SCENE.findNode(item), None, None))
+        return self
+
+    def length(self):
+        return len(self._items)
+
+    def isEmpty(self):
+        return not self._items
+
+    def clear(self):
+        del self._items[:]
+        return self
+
+    def getDependNode(self, index):
+        return _mob(self._items[index][0])
+
+    def getPlug(self, index):
+        node, attr, plugIndex = self._items[index]
+        if attr is None:
+            raise RuntimeError("(kInvalidParameter): Item is not a plug")
+        return MPlug._fromRef((node, attr, plugIndex))
+
+    def getSelectionStrings(self):
+        return [item[0].name if item[1] is None else MPlug._fromRef(item).name() for item in self._items]
+
+# noinspection PyClassHasNoInit
+class MGlobal:
+
+    @staticmethod
+    def getActiveSelectionList(orderedSelectionIfAvailable = False):
+        Result = MSelectionList()
+        Result._items = [(node, None, None) for node in _SCENE.selection]
+        return Result
+
+    @staticmethod
+    def setActiveSelectionList(selectionList, listAdjustment = 0):
+        _SCENE.setSelection(item[0] for item in selectionList._items)
+
+    @staticmethod
+    def getSelectionListByName(name):
+        return MSelectionList().add(name)
+
+class MItDependencyNodes(object):
+
+    def __init__(self, filter = MFn.kInvalid):
+        fns = filter if isinstance(filter, (list, tuple)) else [filter]
+        self._nodes = [node for node in _SCENE.nodes
+                       if MFn.kInvalid in fns or any(fn in node.type.fns for fn in fns)]
+        self._index = 0
+
+    def isDone(self):
+        return self._index >= len(self._nodes)
+
+    def thisNode(self):
+        return _mob(self._nodes[self._index])
+
+    def next(self):
+        self._index += 1
+
+    def reset(self):
+        self._index = 0
+
+class MItDependencyGraph(object):
+    kDownstream = 0
+    kUpstream = 1
+    kDepthFirst = 0
+    kBreadthFirst = 1
+    kNodeLevel = 0
+    kPlugLevel = 1
+
+    def __init__(self, rootNode, filter = MFn.kInvalid, direction = kDownstream, traversal = kDepthFirst,
+                 level = kNodeLevel):
+        """
+        Node level walk along the connections, every node gets visited once. The root comes first with null plugs,
+        the other nodes with the plug they got reached through and the plug on the node they got reached from.
+        """
+        self._root = rootNode._node
+        self._direction = direction
+        self._traversal = traversal
+        self.reset()
+
+    def _neighbours(self, node):
+        Result = []
+        scene = node.scene
+        for key in scene.nodeConnections.get(node, ()):
+            source = scene.connections[key]
+            destination = (key[0], key[0].attribute(key[1]), key[2])
+            if self._direction == self.kUpstream and key[0] is node:
+                Result.append((source[0], source, destination))
+            elif self._direction == self.kDownstream and source[0] is node:
+                Result.append((key[0], destination, source))
+        Result.sort(key=lambda item: (item[0].name, item[1][1].name, item[1][2]))
+        return Result
+
+    def reset(self):
+        self._pending = deque([(self._root, None, None)])
+        self._visited = set([self._root])
+        self._current = None
+        self._pruned = False
+        self.next()
+
+    def isDone(self):
+        return self._current is None
+
+    def next(self):
+        if self._current is not None and not self._pruned:
+            neighbours = [item for item in self._neighbours(self._current[0]) if item[0] not in self._visited]
+            for item in neighbours:
+                self._visited.add(item[0])
+            if self._traversal == self.kBreadthFirst:
+                self._pending.extend(neighbours)
+            else:
+                self._pending.extendleft(reversed(neighbours))
+        self._pruned = False
+        self._current = self._pending.popleft() if self._pending else None
+
+    def prune(self):
+        self._pruned = True
+
+    def currentNode(self):
+        return _mob(self._current[0])
+
+    def currentPlug(self):
+        return MPlug._fromRef(self._current[1]) if self._current[1] is not None else MPlug()
+
+    def previousPlug(self):
+        return MPlug._fromRef(self._current[2]) if self._current[2] is not None else MPlug()
+
+    def rootNode(self):
+        return _mob(self._root)
+
+class MDGModifier(object):
+
+    def __init__(self):
+        """
+        Records the operations and executes them on doIt() like the real modifier.
+        Every operation is a pair of callables (do, undo).
+        """
+        self._operations = []
+        self._executed = 0
+
+    def _queue(self, do, undo):
+        self._operations.append((do, undo))
+
+    def doIt(self):
+        _SCENE.count("om2.MDGModifier.doIt")
+        while self._executed < len(self._operations):
+            self._operations[self._executed][0]()
+            self._executed += 1
+        return self
+
+    def undoIt(self):
+        while self._executed > 0:
+            self._executed -= 1
+            self._operations[self._executed][1]()
+        return self
+
+    def createNode(self, typeName):
+        node = _SCENE.newNode(typeName)
+        self._queue(lambda: _SCENE.addNode(node), lambda: _SCENE.removeNode(node))
+        return _mob(node)
+
+    def deleteNode(self, mob):
+        node = mob._node
+        self._queue(lambda: _SCENE.deleteNode(node), lambda: None)
+        return self
+
+    def renameNode(self, mob, name):
+        node = mob._node
+        prevName = node.name
+        self._queue(lambda: _SCENE.renameNode(node, name), lambda: _SCENE.renameNode(node, prevName))
+        return self
+
+    def connect(self, source, destination):
+        sourceRef, destinationRef = source._ref(), destination._ref()
+        self._queue(lambda: _SCENE.connect(sourceRef, destinationRef),
+                    lambda: _SCENE.disconnect(sourceRef, destinationRef))
+        return self
+
+    def disconnect(self, source, destination):
+        sourceRef, destinationRef = source._ref(), destination._ref()
+        self._queue(lambda: _SCENE.disconnect(sourceRef, destinationRef),
+                    lambda: _SCENE.connect(sourceRef, destinationRef))
+        return self
+
+    def _newPlugValue(self, plug, value):
+        plug = MPlug(plug)
+        previous = []
+
+        def do():
+            previous[:] = [plug._value()]
+            plug._write(value)
+
+        self._queue(do, lambda: plug._write(previous[0]))
+        return self
+
+    def newPlugValueFloat(self, plug, value):
+        return self._newPlugValue(plug, float(value))
+
+    newPlugValueDouble = newPlugValueFloat
+
+    def newPlugValueBool(self, plug, value):
+        return self._newPlugValue(plug, bool(value))
+
+    def newPlugValueInt(self, plug, value):
+        return self._newPlugValue(plug, int(value))
+
+    def newPlugValueString(self, plug, value):
+        return self._newPlugValue(plug, str(value))
+
+    def addAttribute(self, mob, attribute):
+        node, attr = mob._node, attribute._attr
+
+        def do():
+            node.addDynamicAttribute(attr)
+            _SCENE.emitAttributeMessage(node, attr, MNodeMessage.kAttributeAdded)
+
+        def undo():
+            _SCENE.emitAttributeMessage(node, attr, MNodeMessage.kAttributeRemoved)
+            node.removeDynamicAttribute(attr)
+
+        self._queue(do, undo)
+        return self
+
+    def removeAttribute(self, mob, attribute):
+        node, attr = mob._node, attribute._attr
+
+        def do():
+            _SCENE.emitAttributeMessage(node, attr, MNodeMessage.kAttributeRemoved)
+            node.removeDynamicAttribute(attr)
+
+        def undo():
+            node.addDynamicAttribute(attr)
+            _SCENE.emitAttributeMessage(node, attr, MNodeMessage.kAttributeAdded)
+
+        self._queue(do, undo)
+        return self
+
+class MDagModifier(MDGModifier):
+
+    def createNode(self, typeName, parent = MObject.kNullObj):
+        node = _SCENE.newNode(typeName, parent=parent._node)
+        self._queue(lambda: _SCENE.addNode(node), lambda: _SCENE.removeNode(node))
+        return _mob(node)
+
+    def reparentNode(self, mob, newParent = MObject.kNullObj):
+        node, parent = mob._node, newParent._node
+        prevParent = node.parent
+        self._queue(lambda: _SCENE.parentNode(node, parent), lambda: _SCENE.parentNode(node, prevParent))
+        return self
+
+class MCallbackIdArray(list):
+
+    def clear(self):
+        del self[:]
+
+# noinspection PyClassHasNoInit
+class MMessage:
+
+    @staticmethod
+    def removeCallback(callbackId):
+        _SCENE.removeCallback(callbackId)
+
+    @staticmethod
+    def removeCallbacks(callbackIds):
+        for callbackId in callbackIds:
+            _SCENE.removeCallback(callbackId)
+
+# noinspection PyClassHasNoInit
+class MDGMessage(MMessage):
+
+    @staticmethod
+    def addNodeAddedCallback(func, nodeType = "dependNode", clientData = None):
+        return _SCENE.addCallback("nodeAdded", nodeType, func, clientData)
+
+    @staticmethod
+    def addNodeRemovedCallback(func, nodeType = "dependNode", clientData = None):
+        return _SCENE.addCallback("nodeRemoved", nodeType, func, clientData)
+
+    @staticmethod
+    def addConnectionCallback(func, clientData = None):
+        return _SCENE.addCallback("connection", None, func, clientData)
+
+# noinspection PyClassHasNoInit
+class MEventMessage(MMessage):
+
+    @staticmethod
+    def addEventCallback(eventName, func, clientData = None):
+        return _SCENE.addCallback("event", eventName, func, clientData)
+
+# noinspection PyClassHasNoInit
+class MSceneMessage(MMessage):
+
+    kBeforeNew = 1
+    kAfterNew = 2
+    kBeforeOpen = 5
+    kAfterOpen = 6
+
+    @staticmethod
+    def addCallback(message, func, clientData = None):
+        return _SCENE.addCallback("scene", message, func, clientData)
+
+# noinspection PyClassHasNoInit
+class MNodeMessage(MMessage):
+
+    kAttributeAdded = 0x40
+    kAttributeRemoved = 0x80
+
+    @staticmethod
+    def addNameChangedCallback(mob, func, clientData = None):
+        return _SCENE.addCallback("nameChanged", mob._node, func, clientData)
+
+    @staticmethod
+    def addAttributeAddedOrRemovedCallback(mob, func, clientData = None):
+        return _SCENE.addCallback("attributeAddedOrRemoved", mob._node, func, clientData)
+
+#
+# Python plugins
+#
+
+class MArgList(list):
+    pass
+
+class MPxCommand(object):
+
+    def doIt(self, args):
+        pass
+
+    def redoIt(self):
+        pass
+
+    def undoIt(self):
+        pass
+
+    def isUndoable(self):
+        return False
+
+class MFnPlugin(object):
+
+    def __init__(self, plugin = None, vendor = "", version = "", apiVersion = "Any"):
+        self._plugin = plugin
+
+    def registerCommand(self, name, creator, syntaxCreator = None):
+        setattr(sys.modules["maya.cmds"], name, _commandFunction(name, creator))
+
+    def deregisterCommand(self, name):
+        delattr(sys.modules["maya.cmds"], name)
+
+def _commandFunction(name, creator):
+    """
+    :return: [function] the cmds function running a command of a plugin, undoable commands get recorded
+    """
+    def command(*args, **kwargs):
+        _SCENE.count("cmds." + name)
+        instance = creator()
+        instance.doIt(MArgList(args))
+        if instance.isUndoable():
+            _SCENE.recordCommand(instance)
+
+    command.__name__ = name
+    return command
+
+# NOTE(fuzes): The plug-ins folder of the module, like MAYA_PLUG_IN_PATH in Maya
+PLUGIN_PATHS = [os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "plug-ins")]
+_LOADED_PLUGINS = {}
+
+def loadPythonPlugin(name):
+    """
+    Runs a Python plugin from the PLUGIN_PATHS and calls its initializePlugin. Plugins stay loaded across scenes.
+    :param name: [string] file name of the plugin, Ex: ddraw_commands.py
+    :return: [dict] the globals of the plugin
+    """
+    for path in PLUGIN_PATHS:
+        fileName = os.path.join(path, name)
+        if os.path.isfile(fileName):
+            break
+    else:
+        raise RuntimeError("Plug-in, \"{}\", was not found on MAYA_PLUG_IN_PATH.".format(name))
+
+    plugin = {"__name__": os.path.splitext(name)[0], "__file__": fileName}
+    with open(fileName) as f:
+        exec(compile(f.read(), fileName, "exec"), plugin)
+    plugin["initializePlugin"](MObject())
+    _LOADED_PLUGINS[name] = plugin
+    return plugin
+
+_OM2_NAMES = ("MFn", "MFnData", "MTypeId", "MObject", "MObjectHandle", "MColor", "MFloatVector", "MVector",
+              "MMatrix", "MDataHandle", "MPlug", "MFnDependencyNode", "MFnDagNode", "MFnTypedAttribute",
+              "MFnAttribute", "MFnNumericAttribute", "MFnMatrixAttribute", "MSelectionList", "MGlobal",
+              "MItDependencyNodes", "MItDependencyGraph", "MDGModifier", "MDagModifier", "MCallbackIdArray",
+              "MMessage", "MDGMessage", "MEventMessage", "MSceneMessage", "MNodeMessage", "MArgList", "MPxCommand",
+              "MFnPlugin")
+
+#
+# maya.cmds and maya.mel stand-in
+#
+
+def _counted(func):
+    name = "cmds." + func.__name__.lstrip("_")
+
+    def wrapper(*args, **kwargs):
+        _SCENE.count(name)
+        return func(*args, **kwargs)
+
+    wrapper.__name__ = func.__name__.lstrip("_")
+    return wrapper
+
+@_counted
+def _ls(*args, **kwargs):
+    typeName = kwargs.get("type")
+    if kwargs.get("sl") or kwargs.get("selection"):
+        nodes = list(_SCENE.selection)
+    elif args:
+        names = [name for arg in args for name in ([arg] if isinstance(arg, basestring) else arg)]
+        nodes = [_SCENE.findNode(name) for name in names if name.split("|")[-1] in _SCENE.names]
+    else:
+        nodes = list(_SCENE.nodes)
+    if typeName:
+        nodes = [node for node in nodes if node.type.isA(typeName)]
+    return [node.name for node in nodes]
+
+@_counted
+def _objExists(name):
+    node = _SCENE.names.get(name.split(".")[0])
+    return node is not None and node.alive
+
+@_counted
+def _objectType(name, isType = None, isAType = None):
+    nodeType = _SCENE.findNode(name).type
+    if isType is not None:
+        return nodeType.name == isType
+    if isAType is not None:
+        return nodeType.isA(isAType)
+    return nodeType.name
+
+@_counted
+def _nodeType(name, inherited = False, apiType = False, isTypeName = False):
+    nodeType = getNodeType(name) if isTypeName else _SCENE.findNode(name).type
+    if inherited:
+        return list(nodeType.inherited)
+    return nodeType.name
+
+@_counted
+def _createNode(typeName, name = None, parent = None, skipSelect = False):
+    parentNode = _SCENE.findNode(parent) if parent else None
+    node = _SCENE.newNode(typeName, name, parentNode)
+    _SCENE.addNode(node)
+    # NOTE(fuzes): Like Maya we return the shape when a transform got created for it
+    if node.type.name == "transform" and getNodeType(typeName).shape:
+        node = node.children[0]
+    return node.name
+
+@_counted
+def _delete(*names):
+    for name in names:
+        for item in ([name] if isinstance(name, basestring) else name):
+            _SCENE.deleteNode(_SCENE.findNode(item))
+
+@_counted
+def _rename(name, newName):
+    node = _SCENE.findNode(name)
+    _SCENE.renameNode(node, newName)
+    return node.name
+
+@_counted
+def _select(*names, **kwargs):
+    if kwargs.get("clear") or kwargs.get("cl"):
+        _SCENE.setSelection([])
+        return
+    nodes = [_SCENE.findNode(name) for name in names]
+    if kwargs.get("add"):
+        nodes = _SCENE.selection + [node for node in nodes if node not in _SCENE.selection]
+    _SCENE.setSelection(nodes)
+
+@_counted
+def _listAttr(name, userDefined = False, ud = False):
+    node = _SCENE.findNode(name)
+    Result = []
+    for attr in node.dynamicList if userDefined or ud else node.attributeList():
+        Result.append(attr.name)
+        Result.extend(child.name for child in attr.children)
+    return Result
+
+@_counted
+def _getAttr(name):
+    node, attr, index = _SCENE.findPlug(name)
+    value = _SCENE.readValue(node, attr, index)
+    if attr.children:
+        return [tuple(value)]
+    return value
+
+@_counted
+def _setAttr(name, *values, **kwargs):
+    node, attr, index = _SCENE.findPlug(name)
+    value = list(values) if attr.children or attr.kind in ("matrix", "typedMatrix") else values[0]
+    if attr.kind in ("matrix", "typedMatrix") and len(value) == 1:
+        value = list(value[0])
+    _SCENE.writeValue(node, attr, value, index)
+
+@_counted
+def _connectAttr(source, destination, force = False, f = False):
+    _SCENE.connect(_SCENE.findPlug(source), _SCENE.findPlug(destination))
+
+@_counted
+def _currentTime(*args, **kwargs):
+    if kwargs.get("q") or kwargs.get("query"):
+        return _SCENE.time
+    _SCENE.time = float(args[0])
+    _SCENE.emitEvent("timeChanged")
+    return _SCENE.time
+
+@_counted
+def _warning(message):
+    _SCENE.warnings.append(message)
+
+@_counted
+def _error(message):
+    raise RuntimeError(message)
+
+# NOTE(fuzes): Like mayapy, there are no panels and the UI commands fail in batch mode
+_BATCH_MODE = [False]
+
+def setBatchMode(batch):
+    """
+    :param batch: [bool] whether the stand-in behaves like Maya in batch mode
+    :return: [None]
+    """
+    _BATCH_MODE[0] = bool(batch)
+
+@_counted
+def _about(batch = False):
+    if batch:
+        return _BATCH_MODE[0]
+    return None
+
+@_counted
+def _nodeEditor(name, q = False, e = False, ann = None, exists = False):
+    if _BATCH_MODE[0]:
+        raise RuntimeError("nodeEditor is not available in batch mode")
+    if exists:
+        return name == _MEL_RESULTS["getCurrentNodeEditor"]
+    if q:
+        return _SCENE.nodeEditorAddOnCreate
+    if e and ann is not None:
+        _SCENE.nodeEditorAddOnCreate = bool(ann)
+
+@_counted
+def _undoInfo(openChunk = False, closeChunk = False, chunkName = None, **kwargs):
+    if openChunk:
+        _SCENE.openUndoChunk()
+    elif closeChunk:
+        _SCENE.closeUndoChunk()
+
+@_counted
+def _undo():
+    _SCENE.undo()
+
+@_counted
+def _redo():
+    _SCENE.redo()
+
+@_counted
+def _file(*args, **kwargs):
+    if kwargs.get("new"):
+        _SCENE.emitSceneMessage(MSceneMessage.kBeforeNew)
+        newScene().emitSceneMessage(MSceneMessage.kAfterNew)
+
+@_counted
+def _pluginInfo(name, q = False, l = False, loaded = False):
+    # NOTE(fuzes): The compiled plugins count as loaded, Python plugins have to be loaded with cmds.loadPlugin
+    if name.endswith(".py"):
+        return name in _LOADED_PLUGINS
+    return True
+
+@_counted
+def _loadPlugin(name, quiet = False, qt = False):
+    if name not in _LOADED_PLUGINS:
+        loadPythonPlugin(name)
+    return [os.path.splitext(name)[0]]
+
+@_counted
+def _window(name = None, ex = False, exists = False):
+    return False
+
+@_counted
+def _popupMenu(name = None, ex = False, **kwargs):
+    return False if ex else name
+
+@_counted
+def _menuItem(*args, **kwargs):
+    return None
+
+@_counted
+def _deleteUI(*args, **kwargs):
+    return None
+
+_CMDS_FUNCTIONS = (_ls, _objExists, _objectType, _nodeType, _createNode, _delete, _rename, _select, _listAttr,
+                   _getAttr, _setAttr, _connectAttr, _currentTime, _warning, _error, _about, _nodeEditor, _undoInfo, _undo,
+                   _redo, _file, _pluginInfo, _loadPlugin, _window, _popupMenu, _menuItem, _deleteUI)
+
+_MEL_RESULTS = {"getCurrentNodeEditor": "nodeEditorPanel1NodeEditorEd"}
+def melEval(command):
+    _SCENE.count("mel.eval")
+    command = command.strip().rstrip(";")
+    if _BATCH_MODE[0] and command == "getCurrentNodeEditor":
+        raise RuntimeError("Cannot find procedure \"{}\"".format(command))
+    return _MEL_RESULTS.get(command, "")
+
+#
+# Qt stand-in, only used when PySide2 is not available
+#
+
+class _QtStubType(type):
+
+    # NOTE(fuzes): Enum values like QPalette.Button or QSizePolicy.Minimum
+    def __getattr__(cls, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return 0
+
+class _QtStub(_QtStubType("_QtStubBase", (object,), {})):
+    """
+    Accepts any arguments and any method call. Method calls return another stub so chained calls work.
+    """
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return _QtStub()
+
+    def __call__(self, *args, **kwargs):
+        return _QtStub()
+
+    def __iter__(self):
+        return iter(())
+
+    def __or__(self, other):
+        return self
+
+    def __int__(self):
+        return 0
+
+class _BoundSignal(object):
+
+    def __init__(self):
+        self.slots = []
+
+    def connect(self, slot):
+        self.slots.append(slot)
+
+    def disconnect(self, slot = None):
+        if slot is None:
+            del self.slots[:]
+        elif slot in self.slots:
+            self.slots.remove(slot)
+
+    def emit(self, *args):
+        for slot in list(self.slots):
+            slot(*args)
+
+class Signal(object):
+
+    def __init__(self, *types):
+        self.types = types
+
+    def __get__(self, obj, objType = None):
+        if obj is None:
+            return self
+        signals = obj.__dict__.setdefault("_fakeSignals", {})
+        if id(self) not in signals:
+            signals[id(self)] = _BoundSignal()
+        return signals[id(self)]
+
+# noinspection PyClassHasNoInit
+class Qt:
+    DisplayRole = 0
+    DecorationRole = 1
+    EditRole = 2
+    UserRole = 256
+    Horizontal = 1
+    Vertical = 2
+    Unchecked = 0
+    PartiallyChecked = 1
+    Checked = 2
+    ItemIsSelectable = 1
+    ItemIsEditable = 2
+    ItemIsEnabled = 32
+    MatchRecursive = 64
+    Key_Delete = 0x01000007
+
+class QModelIndex(object):
+
+    def __init__(self, row = -1, column = -1, pointer = None, model = None):
+        self._row = row
+        self._column = column
+        self._pointer = pointer
+        self._model = model
+
+    def isValid(self):
+        return self._model is not None and self._row >= 0
+
+    def row(self):
+        return self._row
+
+    def column(self):
+        return self._column
+
+    def internalPointer(self):
+        return self._pointer
+
+    def model(self):
+        return self._model
+
+    def parent(self):
+        return self._model.parent(self) if self._model is not None else QModelIndex()
+
+    def data(self, role = Qt.DisplayRole):
+        return self._model.data(self, role)
+
+    def __eq__(self, other):
+        return isinstance(other, QModelIndex) and (self._row, self._column, self._pointer, self._model) == \
+               (other._row, other._column, other._pointer, other._model)
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
+
+class QObject(_QtStub):
+    pass
+
+class QDoubleSpinBox(QObject):
+
+    valueChanged = Signal(float)
+
+    def __init__(self, parent = None):
+        """
+        Clamps the value to the range and emits valueChanged on changes like the real spin box.
+        """
+        self._value = 0.0
+        self._minimum = 0.0
+        self._maximum = 99.99
+        self._singleStep = 1.0
+        self._specialValueText = ""
+        self._signalsBlocked = False
+
+    def blockSignals(self, block):
+        previous = self._signalsBlocked
+        self._signalsBlocked = bool(block)
+        return previous
+
+    def value(self):
+        return self._value
+
+    def setValue(self, value):
+        value = min(max(float(value), self._minimum), self._maximum)
+        if value != self._value:
+            self._value = value
+            if not self._signalsBlocked:
+                self.valueChanged.emit(value)
+
+    def minimum(self):
+        return self._minimum
+
+    def setMinimum(self, value):
+        self._minimum = float(value)
+        self._maximum = max(self._maximum, self._minimum)
+        self.setValue(self._value)
+
+    def maximum(self):
+        return self._maximum
+
+    def setMaximum(self, value):
+        self._maximum = float(value)
+        self._minimum = min(self._minimum, self._maximum)
+        self.setValue(self._value)
+
+    def singleStep(self):
+        return self._singleStep
+
+    def setSingleStep(self, value):
+        self._singleStep = float(value)
+
+    def specialValueText(self):
+        return self._specialValueText
+
+    def setSpecialValueText(self, text):
+        self._specialValueText = text
+
+    def text(self):
+        if self._specialValueText and self._value == self._minimum:
+            return self._specialValueText
+        return "{:.2f}".format(self._value)
+
+    def stepBy(self, steps):
+        self.setValue(self._value + steps * self._singleStep)
+
+class QAbstractItemModel(QObject):
+
+    dataChanged = Signal(QModelIndex, QModelIndex)
+
+    def createIndex(self, row, column, pointer = None):
+        return QModelIndex(row, column, pointer, self)
+
+    def hasIndex(self, row, column, parent = QModelIndex()):
+        return 0 <= row < self.rowCount(parent) and 0 <= column < self.columnCount(parent)
+
+    def flags(self, index):
+        return Qt.ItemIsSelectable | Qt.ItemIsEnabled
+
+    def removeRow(self, row, parent = QModelIndex()):
+        return self.removeRows(row, 1, parent)
+
+    def insertRow(self, row, parent = QModelIndex()):
+        return self.insertRows(row, 1, parent)
+
+    def beginInsertRows(self, parent, first, last):
+        pass
+
+    def endInsertRows(self):
+        pass
+
+    def beginRemoveRows(self, parent, first, last):
+        pass
+
+    def endRemoveRows(self):
+        pass
+
+    def beginResetModel(self):
+        pass
+
+    def endResetModel(self):
+        pass
+
+class QAbstractListModel(QAbstractItemModel):
+
+    def columnCount(self, parent = QModelIndex()):
+        return 1
+
+    def index(self, row, column = 0, parent = QModelIndex()):
+        return self.createIndex(row, column)
+
+class QItemSelection(object):
+
+    def __init__(self):
+        self._indexes = []
+
+    def select(self, topLeft, bottomRight):
+        model = topLeft.model()
+        parent = model.parent(topLeft)
+        for row in range(topLeft.row(), bottomRight.row() + 1):
+            self._indexes.append(model.index(row, topLeft.column(), parent))
+
+    def indexes(self):
+        return list(self._indexes)
+
+class QItemSelectionModel(QObject):
+
+    Clear = 1
+    Select = 2
+    Deselect = 4
+    ClearAndSelect = 3
+
+    selectionChanged = Signal(object, object)
+
+    def __init__(self, model = None):
+        self._model = model
+        self._selected = {}
+
+    def select(self, selection, command):
+        """
+        :param selection: [QModelIndex]|[QItemSelection]
+        """
+        previous = set(self._selected)
+        if command & QItemSelectionModel.Clear:
+            self._selected.clear()
+        if command & QItemSelectionModel.Select:
+            indexes = selection.indexes() if isinstance(selection, QItemSelection) else [selection]
+            for index in indexes:
+                if index.isValid():
+                    self._selected[(index.row(), index.column(), id(index.internalPointer()))] = index
+        # NOTE(fuzes): The ranges of the real signal are not modelled, the slots have to ask selectedIndexes()
+        if set(self._selected) != previous:
+            self.selectionChanged.emit(None, None)
+
+    def selectedIndexes(self):
+        return list(self._selected.values())
+
+class QTreeView(QObject):
+
+    def __init__(self, *args, **kwargs):
+        self._model = None
+        self._selectionModel = QItemSelectionModel()
+
+    def setModel(self, model):
+        self._model = model
+        self._selectionModel = QItemSelectionModel(model)
+
+    def model(self):
+        return self._model
+
+    def selectionModel(self):
+        return self._selectionModel
+
+QListView = QTreeView
+
+_ACTIVE_TIMERS = []
+class QTimer(QObject):
+
+    timeout = Signal()
+
+    def __init__(self, parent = None):
+        self._active = False
+        self._singleShot = False
+
+    def setSingleShot(self, singleShot):
+        self._singleShot = singleShot
+
+    def setInterval(self, msec):
+        pass
+
+    def isActive(self):
+        return self._active
+
+    def start(self, msec = None):
+        self._active = True
+        if self not in _ACTIVE_TIMERS:
+            _ACTIVE_TIMERS.append(self)
+
+    def stop(self):
+        self._active = False
+        if self in _ACTIVE_TIMERS:
+            _ACTIVE_TIMERS.remove(self)
+
+def processEvents():
+    """
+    Stand-in for a tick of the Qt event loop: fires every started timer once.
+    :return: [int] number of timers which fired
+    """
+    timers = list(_ACTIVE_TIMERS)
+    for timer in timers:
+        if timer._singleShot:
+            timer.stop()
+        timer.timeout.emit()
+    return len(timers)
+
+class QStackedWidget(QObject):
+
+    def __init__(self, *args, **kwargs):
+        self._widgets = []
+        self._current = None
+
+    def addWidget(self, widget):
+        self._widgets.append(widget)
+        if self._current is None:
+            self._current = widget
+        return len(self._widgets) - 1
+
+    def setCurrentWidget(self, widget):
+        self._current = widget
+
+    def currentWidget(self):
+        return self._current
+
+class QSettings(QObject):
+
+    def value(self, key, defaultValue = None):
+        return defaultValue
+
+class QColor(object):
+
+    def __init__(self, r = 0, g = 0, b = 0, a = 255):
+        self._rgba = (int(r), int(g), int(b), int(a))
+
+    def red(self):
+        return self._rgba[0]
+
+    def green(self):
+        return self._rgba[1]
+
+    def blue(self):
+        return self._rgba[2]
+
+    def alpha(self):
+        return self._rgba[3]
+
+    def __eq__(self, other):
+        return isinstance(other, QColor) and other._rgba == self._rgba
+
+    def __ne__(self, other):
+        return not self == other
+
+_QT_STUB_NAMES = ("QWidget", "QDialog", "QPushButton", "QLineEdit", "QAbstractItemView", "QVBoxLayout",
+                  "QHBoxLayout", "QFormLayout", "QFrame", "QCheckBox", "QColorDialog",
+                  "QShortcut", "QSizePolicy", "QIcon", "QPalette", "QCursor", "QKeySequence", "QPoint",
+                  "QSortFilterProxyModel", "QApplication", "QTableWidget", "QTableWidgetItem", "QFileDialog")
+_QT_NAMES = ("Signal", "Qt", "QObject", "QModelIndex", "QAbstractItemModel", "QAbstractListModel",
+             "QItemSelection", "QItemSelectionModel", "QTreeView", "QListView", "QTimer", "QStackedWidget", "QSettings", "QColor",
+             "QDoubleSpinBox")
+
+class MayaQWidgetBaseMixin(object):
+
+    def __init__(self, *args, **kwargs):
+        super(MayaQWidgetBaseMixin, self).__init__(*args, **kwargs)
+
+#
+# Installation
+#
+
+def _module(name, **attributes):
+    module = types.ModuleType(name)
+    module.__dict__.update(attributes)
+    sys.modules[name] = module
+    return module
+
+def isInstalled():
+    return getattr(sys.modules.get("maya"), "__ddraw_fake__", False)
+
+def install(qt = None):
+    """
+    Registers the stand-in modules as maya, maya.cmds, maya.mel, maya.api.OpenMaya and the UI related maya
+    modules. Has to be called before any of the ddraw modules get imported.
+    :param qt: [bool] also register PySide2 and shiboken2 stand-ins. [None] only does it if PySide2 can not be imported
+    :return: [None]
+    """
+    if isInstalled():
+        return
+
+    g = globals()
+    om2 = _module("maya.api.OpenMaya", **dict((name, g[name]) for name in _OM2_NAMES))
+    api = _module("maya.api", OpenMaya=om2)
+    cmds = _module("maya.cmds", **dict((func.__name__, func) for func in _CMDS_FUNCTIONS))
+    mel = _module("maya.mel", eval=melEval)
+    omui = _module("maya.OpenMayaUI", MQtUtil=_QtStub())
+    mayaMixin = _module("maya.app.general.mayaMixin", MayaQWidgetBaseMixin=MayaQWidgetBaseMixin)
+    general = _module("maya.app.general", mayaMixin=mayaMixin)
+    app = _module("maya.app", general=general)
+    _module("maya", __ddraw_fake__=True, api=api, cmds=cmds, mel=mel, OpenMayaUI=omui, app=app)
+
+    if qt is None:
+        try:
+            __import__("PySide2")
+            qt = False
+        except ImportError:
+            qt = True
+    if qt:
+        qtNames = dict((name, g[name]) for name in _QT_NAMES)
+        qtNames.update((name, type(name, (_QtStub,), {})) for name in _QT_STUB_NAMES)
+        qtCore = _module("PySide2.QtCore", **qtNames)
+        qtWidgets = _module("PySide2.QtWidgets", **qtNames)
+        qtGui = _module("PySide2.QtGui", **qtNames)
+        _module("PySide2", QtCore=qtCore, QtWidgets=qtWidgets, QtGui=qtGui)
+        _module("shiboken2", wrapInstance=lambda pointer, base: base())
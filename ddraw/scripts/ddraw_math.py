@@ -0,0 +1,173 @@
+"""
+Vectorized version of the math the viewport overrides do in prepareForDraw (ddraw_vector_v2.cpp,
+ddraw_angle_v2.cpp, ddraw_matrix_v2.cpp). Computes what gets drawn for whole arrays of debug nodes in one call,
+so scripts can query, filter and validate thousands of debug values without walking plugs one by one.
+
+The precision follows the C++ code step by step: the node attributes are read as float and promoted to double
+(MVector), the magnitude, radians and degrees are rounded to float. tests/test_math.py checks the results bit for
+bit against the C++ statements compiled with a stand-in MVector, see tests/golden. MVector::angle() and
+MVector::normalize() are not inline in the devkit, the stand-in and this module reimplement them. The vector
+magnitude and the matrix data match the plugin, the normalized vectors, radians and degrees only match that
+reimplementation and can differ from Maya in the last bits.
+
+Requires NumPy. Only the NumPy based tools import this module, so the others keep working in sessions without NumPy.
+"""
+import numpy as np
+
+# NOTE(fuzes): Same float literal as in ddraw_angle_v2.cpp
+_RAD_TO_DEG = np.float32(57.2957795)
+
+# NOTE(fuzes): Assumed threshold, MVector::normalize() is not inline in the devkit
+_NORMALIZE_EPSILON = 1e-20
+
+# NOTE(fuzes): Default tolerance of MVector::isEquivalent(), used for the right angle check
+_EQUIVALENT_TOLERANCE = 1e-10
+
+VECTOR_DRAW_DTYPE = np.dtype([
+    ("origin", np.float64, (3,)),
+    ("vectorPoint", np.float64, (3,)),
+    ("endPoint", np.float64, (3,)),
+    ("magnitude", np.float32),
+    ("magnitudeDrawPosition", np.float64, (3,)),
+])
+
+ANGLE_DRAW_DTYPE = np.dtype([
+    ("V1", np.float64, (3,)),
+    ("V2", np.float64, (3,)),
+    ("origin", np.float64, (3,)),
+    ("plane", np.float64, (3,)),
+    ("radians", np.float32),
+    ("degrees", np.float32),
+    ("rightAngle", np.bool_),
+])
+
+MATRIX_DRAW_DTYPE = np.dtype([
+    ("position", np.float64, (3,)),
+    ("xAxis", np.float64, (3,)),
+    ("yAxis", np.float64, (3,)),
+    ("zAxis", np.float64, (3,)),
+])
+
+#
+# MVector operations on (N, 3) arrays
+#
+
+def floatAttributeValues(values):
+    """
+    Rounds the values to float like reading a float attribute through MPlug.asFloat() does, promoted to double.
+    :param values: [array_like] of shape (N, 3)
+    :return: [ndarray] float64 of shape (N, 3)
+    """
+    return np.asarray(values, dtype=np.float64).reshape(-1, 3).astype(np.float32).astype(np.float64)
+
+def lengthSquared(v):
+    # NOTE(fuzes): Same summation order as MVector, x*x + y*y + z*z
+    return v[:, 0] * v[:, 0] + v[:, 1] * v[:, 1] + v[:, 2] * v[:, 2]
+
+def dot(a, b):
+    return a[:, 0] * b[:, 0] + a[:, 1] * b[:, 1] + a[:, 2] * b[:, 2]
+
+def cross(a, b):
+    """
+    MVector::operator^
+    :return: [ndarray] of shape (N, 3)
+    """
+    return np.column_stack((a[:, 1] * b[:, 2] - a[:, 2] * b[:, 1],
+                            a[:, 2] * b[:, 0] - a[:, 0] * b[:, 2],
+                            a[:, 0] * b[:, 1] - a[:, 1] * b[:, 0]))
+
+def normalized(v):
+    """
+    Reimplementation of MVector::normal(), vectors which are too short to be normalized are returned unchanged.
+    :return: [ndarray] of shape (N, 3)
+    """
+    lensq = lengthSquared(v)
+    Result = v.copy()
+    mask = lensq > _NORMALIZE_EPSILON
+    factor = 1.0 / np.sqrt(lensq[mask])
+    Result[mask] *= factor[:, np.newaxis]
+    return Result
+
+def angleBetween(a, b):
+    """
+    Reimplementation of MVector::angle(), the angle in radians in double precision. 0 if one of the vectors has no
+    length.
+    :return: [ndarray] of shape (N,)
+    """
+    denominator = np.sqrt(lengthSquared(a) * lengthSquared(b))
+    valid = denominator > 0.0
+    cosine = np.ones(len(a))
+    cosine[valid] = dot(a[valid], b[valid]) / denominator[valid]
+    return np.arccos(np.clip(cosine, -1.0, 1.0))
+
+#
+# prepareForDraw
+#
+
+def vectorDrawData(origins, endPoints):
+    """
+    DDrawVectorDrawOverride::prepareForDraw for many nodes.
+    :param origins: [array_like] of shape (N, 3) values of the origin attributes
+    :param endPoints: [array_like] of shape (N, 3) values of the endPoint attributes
+    :return: [ndarray] of VECTOR_DRAW_DTYPE
+    """
+    origin = floatAttributeValues(origins)
+    endPoint = floatAttributeValues(endPoints)
+
+    Result = np.zeros(len(origin), dtype=VECTOR_DRAW_DTYPE)
+    Result["origin"] = origin
+    Result["vectorPoint"] = endPoint
+    Result["endPoint"] = endPoint + origin
+
+    magnitude = np.sqrt(lengthSquared(endPoint)).astype(np.float32)
+    Result["magnitude"] = magnitude
+
+    # NOTE(fuzes): Magnitude / 2.0f is a float division, the result gets promoted for the MVector multiplication
+    half = (magnitude / np.float32(2.0)).astype(np.float64)
+    Result["magnitudeDrawPosition"] = origin + normalized(endPoint) * half[:, np.newaxis]
+    return Result
+
+def angleDrawData(vectors1, vectors2, origins, normalize):
+    """
+    DDrawAngleDrawOverride::prepareForDraw for many nodes, including the right angle check of addUIDrawables.
+    :param vectors1: [array_like] of shape (N, 3) values of the vector1 attributes
+    :param vectors2: [array_like] of shape (N, 3) values of the vector2 attributes
+    :param origins: [array_like] of shape (N, 3) values of the origin attributes
+    :param normalize: [bool] or [array_like] of shape (N,) values of the normalize attributes
+    :return: [ndarray] of ANGLE_DRAW_DTYPE
+    """
+    v1 = floatAttributeValues(vectors1)
+    v2 = floatAttributeValues(vectors2)
+    normalize = np.broadcast_to(np.asarray(normalize, dtype=np.bool_), (len(v1),))
+    v1[normalize] = normalized(v1[normalize])
+    v2[normalize] = normalized(v2[normalize])
+
+    Result = np.zeros(len(v1), dtype=ANGLE_DRAW_DTYPE)
+    Result["V1"] = v1
+    Result["V2"] = v2
+    Result["origin"] = floatAttributeValues(origins)
+    Result["plane"] = cross(v1, v2)
+
+    radians = angleBetween(v1, v2).astype(np.float32)
+    degrees = radians * _RAD_TO_DEG
+    Result["radians"] = radians
+    Result["degrees"] = degrees
+
+    difference = degrees.astype(np.float64) - 90.0
+    Result["rightAngle"] = difference * difference < _EQUIVALENT_TOLERANCE * _EQUIVALENT_TOLERANCE
+    return Result
+
+def matrixDrawData(matrices):
+    """
+    DDrawMatrixDrawOverride::prepareForDraw for many nodes. The rows of the matrix are the axes and the position.
+    :param matrices: [array_like] of shape (N, 4, 4) or (N, 16) values of the inMatrix attributes
+    :return: [ndarray] of MATRIX_DRAW_DTYPE
+    """
+    matrix = np.asarray(matrices, dtype=np.float64).reshape(-1, 4, 4)
+
+    Result = np.zeros(len(matrix), dtype=MATRIX_DRAW_DTYPE)
+    Result["xAxis"] = matrix[:, 0, :3]
+    Result["yAxis"] = matrix[:, 1, :3]
+    Result["zAxis"] = matrix[:, 2, :3]
+    Result["position"] = matrix[:, 3, :3]
+    return Result
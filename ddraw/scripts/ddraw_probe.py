@@ -0,0 +1,218 @@
+"""
+Reads what the ddraw nodes are showing as NumPy arrays, meant for validation scripts:
+
+    import ddraw_probe
+    readings = ddraw_probe.probe(["ddraw_vectorShape1", "ddraw_vectorShape2"])
+    vectors = readings[ddraw_core.DDrawTypes.kVector]
+    assert (vectors.values["magnitude"] < 10.0).all(), vectors.names
+
+For reading the same nodes over and over (Ex: every frame) keep a DDrawProbe around, it builds the plugs once.
+Requires NumPy like ddraw_math.
+"""
+from collections import namedtuple
+
+import numpy as np
+
+from maya.api import OpenMaya as om2
+
+import ddraw_core
+import ddraw_math
+from ddraw_core import DDrawTypes
+from ddraw_profile import profiled
+
+# NOTE(fuzes): endPoint is the drawn end point in world space, origin + the endPoint attribute, like the
+# endPoint of DDrawVectorData. The magnitude is the length of the endPoint attribute
+VECTOR_PROBE_DTYPE = np.dtype([
+    ("origin", np.float32, (3,)),
+    ("endPoint", np.float32, (3,)),
+    ("magnitude", np.float32),
+])
+
+ANGLE_PROBE_DTYPE = np.dtype([
+    ("v1", np.float32, (3,)),
+    ("v2", np.float32, (3,)),
+    ("degrees", np.float32),
+])
+
+MATRIX_PROBE_DTYPE = np.dtype([
+    ("matrix", np.float64, (4, 4)),
+])
+
+PROBE_DTYPES = {
+    DDrawTypes.kVector: VECTOR_PROBE_DTYPE,
+    DDrawTypes.kAngle: ANGLE_PROBE_DTYPE,
+    DDrawTypes.kMatrix: MATRIX_PROBE_DTYPE,
+}
+
+# NOTE(fuzes): Input attributes read per node type, in the order DDrawProbe keeps the plugs
+_PROBE_ATTRIBUTES = {
+    DDrawTypes.kVector: ("origin", "endPoint"),
+    DDrawTypes.kAngle: ("vector1", "vector2", "normalize"),
+    DDrawTypes.kMatrix: ("inMatrix",),
+}
+
+DDrawReadings = namedtuple("DDrawReadings", ["names", "values"])
+
+# noinspection PyArgumentList
+def getDDrawMob(node):
+    """
+    Resolves a node to the [MObject] of the ddraw shape. Transforms resolve to their ddraw shape.
+    :param node: [string]|[MObject]|[MObjectHandle]|[DDrawNodeRecord]
+    :return: [MObject], [DDrawTypes] or [None], [None] if the node is not a ddraw node
+    """
+    if isinstance(node, ddraw_core.DDrawNodeRecord):
+        return node.handle.object(), node.type
+    if isinstance(node, om2.MObjectHandle):
+        mob = node.object()
+    elif isinstance(node, om2.MObject):
+        mob = node
+    else:
+        mob = ddraw_core.getMobFromName(node)
+
+    ddrawType = ddraw_core.getDDrawTypeFromMob(mob)
+    if ddrawType is None and mob.hasFn(om2.MFn.kTransform):
+        mfn_dag = om2.MFnDagNode(mob)
+        if mfn_dag.childCount():
+            shape = mfn_dag.child(0)
+            ddrawType = ddraw_core.getDDrawTypeFromMob(shape)
+            if ddrawType is not None:
+                return shape, ddrawType
+    if ddrawType is None:
+        return None, None
+    return mob, ddrawType
+
+def readFloat3Plugs(plugs):
+    """
+    :param plugs: [list] of [MPlug] float3 compound plugs
+    :return: [ndarray] float32 of shape (N, 3)
+    """
+    return np.array([plug.asMDataHandle().asFloat3() for plug in plugs], dtype=np.float32).reshape(-1, 3)
+
+def readMatrixPlugs(plugs):
+    """
+    :param plugs: [list] of [MPlug] matrix plugs
+    :return: [ndarray] float64 of shape (N, 4, 4)
+    """
+    return np.array([list(plug.asMDataHandle().asMatrix()) for plug in plugs], dtype=np.float64).reshape(-1, 4, 4)
+
+class DDrawProbe(object):
+
+    # noinspection PyArgumentList
+    def __init__(self, nodes = None):
+        """
+        Reads the input values of a fixed set of ddraw nodes. The plugs get built once from the cached attribute
+        objects, so every read is a single pass over the plugs without any name lookups.
+
+        [dict] names: [DDrawTypes] -> [list] of [string] names of the nodes, in the order of the rows
+        [dict] handles: [DDrawTypes] -> [list] of [MObjectHandle] of the nodes, in the order of the rows
+        [dict] plugs: [DDrawTypes] -> [tuple] of [list] of [MPlug] per attribute in _PROBE_ATTRIBUTES
+        [list] skipped: nodes which are not ddraw nodes
+
+        :param nodes: [iterable] of [string]|[MObject]|[MObjectHandle]|[DDrawNodeRecord], [None] for all the
+        ddraw nodes in the scene. Rows keep the order of the given nodes per type
+        """
+        if nodes is None:
+            nodes = ddraw_core.iterDDrawNodes()
+
+        self.names = dict((ddrawType, []) for ddrawType in PROBE_DTYPES)
+        self.handles = dict((ddrawType, []) for ddrawType in PROBE_DTYPES)
+        self.skipped = []
+        plugs = dict((ddrawType, [[] for _ in _PROBE_ATTRIBUTES[ddrawType]]) for ddrawType in PROBE_DTYPES)
+
+        mfn_dep = om2.MFnDependencyNode()
+        for node in nodes:
+            mob, ddrawType = getDDrawMob(node)
+            if mob is None:
+                self.skipped.append(node)
+                continue
+            mfn_dep.setObject(mob)
+            self.names[ddrawType].append(mfn_dep.name())
+            self.handles[ddrawType].append(om2.MObjectHandle(mob))
+            for attributePlugs, name in zip(plugs[ddrawType], _PROBE_ATTRIBUTES[ddrawType]):
+                attributePlugs.append(ddraw_core.getStaticPlug(mfn_dep, name))
+
+        self.plugs = dict((ddrawType, tuple(attributePlugs)) for ddrawType, attributePlugs in plugs.items())
+
+    def count(self, ddrawType):
+        return len(self.names[ddrawType])
+
+    def getSourcePlugNames(self):
+        """
+        Names of the plugs driving the input attributes of the nodes, Ex: to tell which joint a debug vector shows.
+        :return: [dict] [DDrawTypes] -> [list] per node of [list] of [string] source plug names per attribute in
+        _PROBE_ATTRIBUTES, empty strings for attributes which are not connected
+        """
+        Result = {}
+        for ddrawType, attributePlugs in self.plugs.items():
+            sources = []
+            for plugs in zip(*attributePlugs):
+                sources.append([])
+                for plug in plugs:
+                    source = plug.source()
+                    sources[-1].append(source.name() if not source.isNull else "")
+            Result[ddrawType] = sources
+        return Result
+
+    def isValid(self):
+        """
+        :return: [bool] False if one of the nodes got deleted since the probe was built
+        """
+        return all(handle.isValid() for handles in self.handles.values() for handle in handles)
+
+    def allocate(self, frames = None):
+        """
+        Allocates arrays matching the nodes of the probe.
+        :param frames: [int] adds a leading frame axis of this size, [None] for a single reading
+        :return: [dict] [DDrawTypes] -> [ndarray] of the PROBE_DTYPES
+        """
+        Result = {}
+        for ddrawType, dtype in PROBE_DTYPES.items():
+            shape = (self.count(ddrawType),) if frames is None else (frames, self.count(ddrawType))
+            Result[ddrawType] = np.zeros(shape, dtype=dtype)
+        return Result
+
+    @profiled("DDrawProbe.read")
+    def read(self, out = None):
+        """
+        Reads the current values of all the nodes.
+        :param out: [dict] [DDrawTypes] -> [ndarray] of the PROBE_DTYPES to fill, Ex: a frame of a buffer from
+        allocate(). [None] allocates new arrays
+        :return: [dict] [DDrawTypes] -> [ndarray] of the PROBE_DTYPES
+        """
+        Result = out if out is not None else self.allocate()
+
+        originPlugs, endPointPlugs = self.plugs[DDrawTypes.kVector]
+        if originPlugs:
+            vectors = Result[DDrawTypes.kVector]
+            drawData = ddraw_math.vectorDrawData(readFloat3Plugs(originPlugs), readFloat3Plugs(endPointPlugs))
+            vectors["origin"] = drawData["origin"]
+            vectors["endPoint"] = drawData["endPoint"]
+            vectors["magnitude"] = drawData["magnitude"]
+
+        vector1Plugs, vector2Plugs, normalizePlugs = self.plugs[DDrawTypes.kAngle]
+        if vector1Plugs:
+            angles = Result[DDrawTypes.kAngle]
+            angles["v1"] = readFloat3Plugs(vector1Plugs)
+            angles["v2"] = readFloat3Plugs(vector2Plugs)
+            normalize = [plug.asBool() for plug in normalizePlugs]
+            # NOTE(fuzes): The origin does not change the angle
+            angles["degrees"] = ddraw_math.angleDrawData(angles["v1"], angles["v2"], np.zeros((len(normalize), 3)),
+                                                         normalize)["degrees"]
+
+        matrixPlugs, = self.plugs[DDrawTypes.kMatrix]
+        if matrixPlugs:
+            Result[DDrawTypes.kMatrix]["matrix"] = readMatrixPlugs(matrixPlugs)
+
+        return Result
+
+def probe(nodes = None):
+    """
+    Reads the values the given ddraw nodes are showing in one pass. Nodes which are not ddraw nodes are skipped.
+    :param nodes: [iterable] of [string]|[MObject]|[MObjectHandle]|[DDrawNodeRecord], [None] for all the
+    ddraw nodes in the scene
+    :return: [dict] [DDrawTypes] -> [DDrawReadings] with the node names and the values as [ndarray] of the
+    PROBE_DTYPES, rows in the order of the given nodes
+    """
+    prober = DDrawProbe(nodes)
+    values = prober.read()
+    return dict((ddrawType, DDrawReadings(prober.names[ddrawType], values[ddrawType])) for ddrawType in values)
@@ -0,0 +1,212 @@
+"""
+Opt-in instrumentation of the ddraw hot paths. Functions decorated with @profiled() only pay for a flag
+check until profiling gets enabled:
+
+    import ddraw_profile
+    ddraw_profile.getProfiler().enable()
+    # ... use the tools
+    ddraw_profile.getProfiler().dump("c:/temp/ddraw_profile.json")
+
+While enabled every call records its duration and the number of Maya command round-trips (cmds and mel)
+into a ring buffer, the DDrawWindow shows the aggregated stats in its performance panel.
+"""
+import sys
+import json
+import timeit
+from collections import deque
+from functools import wraps
+
+# NOTE(fuzes): Modules whose cmds and mel globals get swapped for counting proxies while profiling
+_WATCHED_MODULES = ("ddraw_core", "ddraw_ui", "ddraw")
+
+class DDrawCommandCounter(object):
+
+    def __init__(self, module, prefix, profiler):
+        """
+        Proxy for the cmds or mel module which reports every call to the profiler.
+        :param module: [module] maya.cmds or maya.mel
+        :param prefix: [string] "cmds" or "mel"
+        :param profiler: [DDrawProfiler]
+        """
+        self.module = module
+        self.prefix = prefix
+        self.profiler = profiler
+
+    def __getattr__(self, name):
+        func = getattr(self.module, name)
+        profiler = self.profiler
+
+        def wrapper(*args, **kwargs):
+            profiler.countCommand()
+            return func(*args, **kwargs)
+
+        return wrapper
+
+class DDrawProfiler(object):
+
+    def __init__(self, capacity = 4096):
+        """
+        Records timings of the profiled functions.
+
+        [bool] enabled: Whether calls get recorded
+        [deque] samples: Ring buffer of the last capacity calls as (name, start, seconds, commands)
+        [dict] totals: name -> [calls, seconds, commands] over all the calls since the last reset
+
+        :param capacity: [int] number of samples the ring buffer keeps
+        """
+        self.enabled = False
+        self.samples = deque(maxlen=capacity)
+        self.totals = {}
+        self.stack = []
+
+    def enable(self):
+        if self.enabled:
+            return
+        self.enabled = True
+        self._swapCommandModules(True)
+
+    def disable(self):
+        if not self.enabled:
+            return
+        self.enabled = False
+        self._swapCommandModules(False)
+
+    def _swapCommandModules(self, counting):
+        # HACK(fuzes): The modules imported cmds and mel by name, so we swap their globals instead of
+        # wrapping every single call site. Nothing is wrapped while profiling is disabled.
+        for moduleName in _WATCHED_MODULES:
+            module = sys.modules.get(moduleName)
+            if module is None:
+                continue
+            for name in ("cmds", "mel"):
+                current = getattr(module, name, None)
+                if current is None:
+                    continue
+                if counting and not isinstance(current, DDrawCommandCounter):
+                    setattr(module, name, DDrawCommandCounter(current, name, self))
+                elif not counting and isinstance(current, DDrawCommandCounter):
+                    setattr(module, name, current.module)
+
+    def reset(self):
+        self.samples.clear()
+        self.totals.clear()
+
+    def countCommand(self):
+        if self.stack:
+            self.stack[-1][1] += 1
+
+    def begin(self, name):
+        """
+        :param name: [string]
+        :return: [list] the frame of the call, has to be passed to end()
+        """
+        frame = [name, 0, timeit.default_timer()]
+        self.stack.append(frame)
+        return frame
+
+    def end(self, frame):
+        """
+        Records the call of the frame begin() returned. Only the frame itself and frames of nested calls which
+        never ended get popped, never the frames of the callers.
+        :param frame: [list]
+        :return: [None]
+        """
+        for i in range(len(self.stack) - 1, -1, -1):
+            if self.stack[i] is frame:
+                del self.stack[i:]
+                break
+        name, commands, start = frame
+        elapsed = timeit.default_timer() - start
+        # NOTE(fuzes): Commands of nested calls also count for the caller
+        if self.stack:
+            self.stack[-1][1] += commands
+
+        self.samples.append((name, start, elapsed, commands))
+        total = self.totals.get(name)
+        if total is None:
+            total = self.totals[name] = [0, 0.0, 0]
+        total[0] += 1
+        total[1] += elapsed
+        total[2] += commands
+
+    def stats(self):
+        """
+        Aggregates the recorded calls. Percentiles are computed from the samples still in the ring buffer.
+        :return: [list] of [dict] per profiled function, sorted by cumulative time
+        """
+        durations = {}
+        for name, start, elapsed, commands in self.samples:
+            durations.setdefault(name, []).append(elapsed)
+
+        Result = []
+        for name, (calls, seconds, commands) in self.totals.items():
+            recent = sorted(durations.get(name, []))
+            Result.append({
+                "name": name,
+                "calls": calls,
+                "totalMs": seconds * 1000.0,
+                "meanMs": seconds * 1000.0 / calls,
+                "p50Ms": percentile(recent, 50) * 1000.0,
+                "p90Ms": percentile(recent, 90) * 1000.0,
+                "p99Ms": percentile(recent, 99) * 1000.0,
+                "maxMs": recent[-1] * 1000.0 if recent else 0.0,
+                "commands": commands,
+            })
+        Result.sort(key=lambda s: s["totalMs"], reverse=True)
+        return Result
+
+    def dump(self, path):
+        """
+        Writes the stats and the samples in the ring buffer as json, meant to be attached to bug reports.
+        :param path: [string]
+        :return: [None]
+        """
+        data = {
+            "stats": self.stats(),
+            "samples": [{"name": name, "start": start, "ms": elapsed * 1000.0, "commands": commands}
+                        for name, start, elapsed, commands in self.samples],
+        }
+        with open(path, "w") as f:
+            json.dump(data, f, indent=2)
+
+def percentile(values, p):
+    """
+    Nearest rank percentile.
+    :param values: [list] of sorted values
+    :param p: [float] between 0 and 100
+    :return: [float] 0.0 for an empty list
+    """
+    if not values:
+        return 0.0
+    rank = int(round(p / 100.0 * (len(values) - 1)))
+    return values[rank]
+
+_PROFILER = DDrawProfiler()
+def getProfiler():
+    """
+    :return: [DDrawProfiler] the process wide profiler
+    """
+    return _PROFILER
+
+def profiled(name = None):
+    """
+    Decorator which records the calls of the function while profiling is enabled.
+    :param name: [string] name in the stats, defaults to the function name
+    """
+    def decorator(func):
+        label = name or func.__name__
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            profiler = _PROFILER
+            if not profiler.enabled:
+                return func(*args, **kwargs)
+            # NOTE(fuzes): Profiling can get toggled during the call, only the call which pushed a frame pops it
+            frame = profiler.begin(label)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                profiler.end(frame)
+
+        return wrapper
+    return decorator
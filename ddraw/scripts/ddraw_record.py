@@ -0,0 +1,237 @@
+"""
+Records the values of the ddraw nodes over a frame range, so a pop at frame 812 can be looked up by slicing
+an array instead of scrubbing the timeline:
+
+    import ddraw_record
+    recorder = ddraw_record.DDrawRecorder("c:/temp/shot010_ddraw", 1001, 1250)
+    recorder.start()        # records every frame the time changes to, Ex: during playback
+    ...
+    recorder.stop()
+    # or step through the whole range: recorder.recordRange()
+
+    recording = ddraw_record.DDrawRecording("c:/temp/shot010_ddraw")
+    recording.values[DDrawTypes.kVector]["magnitude"][recording.row(812)]
+
+The values land in one .npy file per node type holding a (frames, nodes) array of the ddraw_probe dtypes,
+next to recording.json with the frame range, the node names and the plugs driving the nodes. Frames get
+collected in a preallocated buffer of chunkFrames frames and flushed into the memory mapped files, so long shots
+do not have to fit in RAM.
+Requires NumPy like ddraw_math.
+"""
+import os
+import json
+
+import numpy as np
+
+from maya import cmds
+from maya.api import OpenMaya as om2
+
+from ddraw_core import DDrawTypes
+from ddraw_probe import DDrawProbe, PROBE_DTYPES
+from ddraw_profile import profiled
+
+_MANIFEST_NAME = "recording.json"
+_RECORDED_NAME = "recorded.npy"
+
+# NOTE(fuzes): Base names of the files holding the values of each node type, also the keys of the manifest
+_RECORDING_FILES = {
+    DDrawTypes.kVector: "vectors",
+    DDrawTypes.kAngle: "angles",
+    DDrawTypes.kMatrix: "matrices",
+}
+
+class DDrawRecorder(object):
+
+    def __init__(self, path, startFrame, endFrame, nodes = None, chunkFrames = 64):
+        """
+        Records the ddraw nodes into the directory at path, existing recordings in there get overwritten.
+        Frames are rounded to the nearest whole frame, frames outside of the range are ignored.
+
+        [DDrawProbe] probe: Reads the nodes, the order of its names is the order of the columns
+        [int] startFrame: The frame of the first row
+        [int] frameCount: Number of rows in the files
+        [dict] files: [DDrawTypes] -> [memmap] (frames, nodes) arrays in the files
+        [memmap] recorded: (frames,) [bool] which rows got recorded
+        [dict] buffers: [DDrawTypes] -> [ndarray] (chunkFrames, nodes) frames not flushed yet
+        [int] bufferStart: Row of the first frame in the buffers, [None] if the buffers are empty
+
+        :param path: [string] directory of the recording, gets created if it does not exist
+        :param startFrame: [float] first frame of the range
+        :param endFrame: [float] last frame of the range
+        :param nodes: [iterable] of nodes for DDrawProbe, [None] for all the ddraw nodes in the scene
+        :param chunkFrames: [int] number of frames the buffers hold before they get flushed
+        """
+        self.path = path
+        self.startFrame = int(round(startFrame))
+        self.frameCount = max(int(round(endFrame)) - self.startFrame + 1, 0)
+        self.probe = DDrawProbe(nodes)
+        self.callbacks = om2.MCallbackIdArray()
+
+        if not os.path.isdir(path):
+            os.makedirs(path)
+
+        self.files = {}
+        for ddrawType, dtype in PROBE_DTYPES.items():
+            self.files[ddrawType] = np.lib.format.open_memmap(
+                os.path.join(path, _RECORDING_FILES[ddrawType] + ".npy"), mode="w+", dtype=dtype,
+                shape=(self.frameCount, self.probe.count(ddrawType)))
+        self.recorded = np.lib.format.open_memmap(os.path.join(path, _RECORDED_NAME), mode="w+", dtype=np.bool_,
+                                                  shape=(self.frameCount,))
+
+        chunkFrames = max(min(chunkFrames, self.frameCount), 1)
+        self.buffers = self.probe.allocate(chunkFrames)
+        self.bufferRecorded = np.zeros(chunkFrames, dtype=np.bool_)
+        self.bufferStart = None
+
+        manifest = {
+            "startFrame": self.startFrame,
+            "frameCount": self.frameCount,
+            "names": dict((_RECORDING_FILES[ddrawType], names) for ddrawType, names in self.probe.names.items()),
+            "sources": dict((_RECORDING_FILES[ddrawType], sources)
+                            for ddrawType, sources in self.probe.getSourcePlugNames().items()),
+        }
+        with open(os.path.join(path, _MANIFEST_NAME), "w") as f:
+            json.dump(manifest, f, indent=2)
+
+    def rowFromFrame(self, frame):
+        """
+        :param frame: [float]
+        :return: [int] row of the frame or [None] if the frame is outside of the range
+        """
+        row = int(round(frame)) - self.startFrame
+        if 0 <= row < self.frameCount:
+            return row
+        return None
+
+    @profiled("DDrawRecorder.recordFrame")
+    def recordFrame(self, frame = None):
+        """
+        Reads the nodes into the row of the frame. The scene has to be at that frame already.
+        :param frame: [float] [None] for the current frame
+        :return: [bool] False if the frame is outside of the range
+        """
+        if frame is None:
+            frame = cmds.currentTime(q=True)
+        row = self.rowFromFrame(frame)
+        if row is None:
+            return False
+
+        chunkFrames = len(self.bufferRecorded)
+        if self.bufferStart is None or not self.bufferStart <= row < self.bufferStart + chunkFrames:
+            self.flush()
+            self.bufferStart = row
+
+        index = row - self.bufferStart
+        self.probe.read(out=dict((ddrawType, buffer[index]) for ddrawType, buffer in self.buffers.items()))
+        self.bufferRecorded[index] = True
+        return True
+
+    def flush(self):
+        """
+        Writes the buffered frames into the files.
+        :return: [None]
+        """
+        if self.bufferStart is None:
+            return
+
+        indices = np.flatnonzero(self.bufferRecorded)
+        rows = indices + self.bufferStart
+        for ddrawType, values in self.files.items():
+            values[rows] = self.buffers[ddrawType][indices]
+            values.flush()
+        self.recorded[rows] = True
+        self.recorded.flush()
+
+        self.bufferRecorded[:] = False
+        self.bufferStart = None
+
+    def isRecording(self):
+        return len(self.callbacks) > 0
+
+    def start(self):
+        """
+        Records every frame the time changes to until stop() gets called, starting with the current frame.
+        :return: [None]
+        """
+        if self.isRecording():
+            return
+        self.callbacks.append(om2.MEventMessage.addEventCallback("timeChanged", self._on_time_changed))
+        self.recordFrame()
+
+    def stop(self):
+        """
+        Stops recording on time changes and flushes the buffered frames.
+        :return: [None]
+        """
+        for i in self.callbacks:
+            om2.MMessage.removeCallback(i)
+        self.callbacks.clear()
+        self.flush()
+
+    def _on_time_changed(self, clientData):
+        try:
+            self.recordFrame()
+        except RuntimeError:
+            # NOTE(fuzes): One of the recorded nodes got deleted, its plugs can not be read anymore
+            self.stop()
+            cmds.warning("Stopped recording to {}, the recorded nodes changed".format(self.path))
+
+    def recordRange(self):
+        """
+        Steps the scene through every frame of the range and records it, then goes back to the current frame.
+        :return: [None]
+        """
+        currentFrame = cmds.currentTime(q=True)
+        try:
+            for row in xrange(self.frameCount):
+                cmds.currentTime(self.startFrame + row)
+                # NOTE(fuzes): While started the time changed callback records the frame already
+                if not self.isRecording():
+                    self.recordFrame(self.startFrame + row)
+        finally:
+            cmds.currentTime(currentFrame)
+        self.flush()
+
+class DDrawRecording(object):
+
+    def __init__(self, path, mode = "r"):
+        """
+        A recording written by DDrawRecorder, the values stay memory mapped.
+
+        [int] startFrame: The frame of the first row
+        [int] frameCount: Number of rows
+        [dict] names: [DDrawTypes] -> [list] of [string] node names, in the order of the columns
+        [dict] sources: [DDrawTypes] -> [list] of source plug names per node, see DDrawProbe.getSourcePlugNames
+        [dict] values: [DDrawTypes] -> [memmap] (frames, nodes) arrays of the ddraw_probe dtypes
+        [memmap] recorded: (frames,) [bool] which rows got recorded
+
+        :param path: [string] directory of the recording
+        :param mode: [string] "r" or "r+" memmap mode of the files
+        """
+        self.path = path
+        with open(os.path.join(path, _MANIFEST_NAME), "r") as f:
+            manifest = json.load(f)
+
+        self.startFrame = manifest["startFrame"]
+        self.frameCount = manifest["frameCount"]
+        self.names = {}
+        self.sources = {}
+        self.values = {}
+        for ddrawType, name in _RECORDING_FILES.items():
+            self.names[ddrawType] = manifest["names"][name]
+            self.sources[ddrawType] = manifest["sources"][name]
+            self.values[ddrawType] = np.load(os.path.join(path, name + ".npy"), mmap_mode=mode)
+        self.recorded = np.load(os.path.join(path, _RECORDED_NAME), mmap_mode=mode)
+
+    def row(self, frame):
+        """
+        :param frame: [float]
+        :return: [int] row of the frame
+        """
+        return int(round(frame)) - self.startFrame
+
+    def frames(self):
+        """
+        :return: [ndarray] the frames which got recorded
+        """
+        return np.flatnonzero(self.recorded) + self.startFrame
@@ -0,0 +1,350 @@
+"""
+Declarative auto instrumentation, draws debug nodes for a whole rig in one pass:
+
+    import ddraw_rules
+    rules = [
+        {"name": "joints", "draw": "matrix", "types": ["joint"], "attributes": ["worldMatrix"],
+         "namespaces": ["rig"]},
+        {"name": "ik handles", "draw": "vector", "types": ["ikHandle"], "attributes": ["translate"],
+         "names": ["*_L_*"], "options": {"vectorColor": [1, 0, 0, 1], "coneRadius": 0.05}},
+    ]
+    instrumentation = ddraw_rules.instrumentScene(rules, "c:/temp/rig_instrumentation.json")
+    ...
+    ddraw_rules.removeInstrumentation("c:/temp/rig_instrumentation.json")
+
+A rule is a dictionary, every filter is optional and a missing filter matches everything:
+
+    name: [string] label of the rule in the manifest
+    draw: [string] "vector" draws point attributes, "matrix" draws matrix attributes
+    types: [list] of Maya node types, inherited types count, Ex: "transform" matches joints as well
+    attributes: [list] of globs on the long attribute names
+    names: [list] of globs on the node names, including the namespace
+    namespaces: [list] of globs on the namespaces, "" is the root namespace
+    options: [dict] option attribute -> value, see _OPTION_ATTRIBUTES of ddraw_core. Colors are RGBA lists
+
+Globs are case sensitive. An attribute matched by more than one rule gets drawn by the first of them.
+"""
+import os
+import re
+import fnmatch
+
+from maya import cmds
+from maya.api import OpenMaya as om2
+
+import ddraw_core
+from ddraw_core import DDrawTypes
+from ddraw_profile import profiled
+
+_RULE_DRAW_TYPES = {
+    "vector": DDrawTypes.kVector,
+    "matrix": DDrawTypes.kMatrix,
+}
+
+_RULE_KEYS = frozenset(("name", "draw", "types", "attributes", "names", "namespaces", "options"))
+
+def compileGlobs(patterns):
+    """
+    :param patterns: [list] of [string] fnmatch style globs or [None]
+    :return: [list] of the match functions of the compiled globs, [None] if there are no patterns
+    """
+    if not patterns:
+        return None
+    return [re.compile(fnmatch.translate(pattern)).match for pattern in patterns]
+
+def matchesGlobs(globs, value):
+    """
+    :param globs: [list] of match functions from compileGlobs or [None]
+    :param value: [string]
+    :return: [bool] True if one of the globs matches or there are no globs
+    """
+    return globs is None or any(match(value) for match in globs)
+
+# noinspection PyArgumentList
+def optionsFromData(ddrawType, data):
+    """
+    :param ddrawType: [DDrawTypes]
+    :param data: [dict] option attribute -> value, colors as RGB or RGBA lists
+    :return: [DDrawVectorOptions]|[DDrawMatrixOptions] the default options with the values of data
+    """
+    Result = ddraw_core._OPTIONS_CLASSES[ddrawType]()
+    kinds = dict(ddraw_core._OPTION_ATTRIBUTES[ddrawType])
+    for name, value in data.items():
+        kind = kinds.get(name)
+        if kind is None:
+            raise ValueError("Unknown option {} for a {} rule".format(name, ddraw_core._DDRAW_TYPE_NAMES[ddrawType]))
+        if kind == "color":
+            value = om2.MColor(list(value) + [1.0] * (4 - len(value)))
+        setattr(Result, name, value)
+    return Result
+
+# noinspection PyArgumentList
+def isDDrawTransform(mob):
+    """
+    :param mob: [MObject]
+    :return: [bool] True if the node is the transform of a ddraw node
+    """
+    if not mob.hasFn(om2.MFn.kTransform):
+        return False
+    mfn_dag = om2.MFnDagNode(mob)
+    return mfn_dag.childCount() > 0 and ddraw_core.getDDrawTypeFromMob(mfn_dag.child(0)) is not None
+
+class DDrawRule(object):
+
+    def __init__(self, data):
+        """
+        A rule with its globs compiled once, see the module docstring for the keys of data.
+
+        [string] name: Label of the rule in the manifest
+        [DDrawTypes] ddrawType: kVector or kMatrix
+        [frozenset] types: Maya type names, empty for every type
+        [list] attributes: Match functions of the attribute globs or [None]
+        [list] names: Match functions of the node name globs or [None]
+        [list] namespaces: Match functions of the namespace globs or [None]
+        [DDrawVectorOptions]|[DDrawMatrixOptions] options: Options of the nodes or [None] if the rule has none,
+        see ddraw_core.drawDDrawNodes()
+
+        :param data: [dict]
+        """
+        unknown = set(data) - _RULE_KEYS
+        if unknown:
+            raise ValueError("Unknown rule keys: {}".format(", ".join(sorted(unknown))))
+        if data.get("draw") not in _RULE_DRAW_TYPES:
+            raise ValueError("Rule draw has to be one of {}, got {}".format(sorted(_RULE_DRAW_TYPES),
+                                                                          data.get("draw")))
+
+        self.name = data.get("name", "")
+        self.ddrawType = _RULE_DRAW_TYPES[data["draw"]]
+        self.types = frozenset(data.get("types") or ())
+        self.attributes = compileGlobs(data.get("attributes"))
+        self.names = compileGlobs(data.get("names"))
+        self.namespaces = compileGlobs(data.get("namespaces"))
+        self.options = optionsFromData(self.ddrawType, data["options"]) if data.get("options") else None
+
+    def matchesTypes(self, inheritedTypes):
+        """
+        :param inheritedTypes: [frozenset] of [string] the type of a node and all the types it inherits from
+        :return: [bool]
+        """
+        return not self.types or not self.types.isdisjoint(inheritedTypes)
+
+    def matchesNode(self, name, namespace):
+        """
+        :param name: [string] node name including the namespace
+        :param namespace: [string] namespace of the node, empty for the root namespace
+        :return: [bool]
+        """
+        return matchesGlobs(self.namespaces, namespace) and matchesGlobs(self.names, name)
+
+class DDrawRuleSet(object):
+
+    def __init__(self, rules):
+        """
+        Compiled rules, can be kept around and matched against the scene again.
+
+        [list] rules: [DDrawRule] in the order of priority
+
+        :param rules: [iterable] of [dict]|[DDrawRule]
+        """
+        self.rules = [rule if isinstance(rule, DDrawRule) else DDrawRule(rule) for rule in rules]
+
+    # noinspection PyArgumentList
+    def _rulesForType(self, mob):
+        if ddraw_core.getDDrawTypeFromMob(mob) is not None:
+            return ()
+        typeService = ddraw_core.getTypeService()
+        typeService.inheritedTypes(mob)
+        inheritedTypes = typeService.inheritedSets[om2.MFnDependencyNode(mob).typeId.id()]
+        return tuple(rule for rule in self.rules if rule.matchesTypes(inheritedTypes))
+
+    # noinspection PyArgumentList
+    def _matchAttributes(self, rule, handles):
+        mfn_attr = om2.MFnAttribute()
+        Result = []
+        for handle in handles:
+            mfn_attr.setObject(handle.object())
+            if matchesGlobs(rule.attributes, mfn_attr.name):
+                Result.append(handle)
+        return Result
+
+    # noinspection PyArgumentList
+    @profiled("DDrawRuleSet.match")
+    def match(self):
+        """
+        Walks the scene once with the API iterator. The type filters and the static attribute globs get evaluated
+        once per node type, only the name globs and the dynamic attributes are looked at per node.
+        The ddraw nodes and their transforms never match.
+        :return: [list] of [tuple] of [DDrawRule], [list] of [MPlug] per rule in the order of the rules,
+        every plug only shows up once
+        """
+        typeRules = {}
+        staticMatches = {}
+        candidates = ddraw_core.getAttributeCandidates()
+        matches = dict((id(rule), []) for rule in self.rules)
+        seen = set()
+
+        mfn_dep = om2.MFnDependencyNode()
+        it = om2.MItDependencyNodes()
+        while not it.isDone():
+            mob = it.thisNode()
+            mfn_dep.setObject(mob)
+            typeId = mfn_dep.typeId.id()
+            rules = typeRules.get(typeId)
+            if rules is None:
+                rules = typeRules[typeId] = self._rulesForType(mob)
+
+            if rules and not isDDrawTransform(mob):
+                name = mfn_dep.name()
+                namespace = mfn_dep.namespace
+                for rule in rules:
+                    if not rule.matchesNode(name, namespace):
+                        continue
+                    key = (id(rule), typeId)
+                    handles = staticMatches.get(key)
+                    if handles is None:
+                        handles = staticMatches[key] = self._matchAttributes(
+                            rule, candidates.staticAttributes(mob, rule.ddrawType))
+                    handles = handles + self._matchAttributes(rule, candidates.dynamicAttributes(mob, rule.ddrawType))
+
+                    for handle in handles:
+                        plug = om2.MPlug(mob, handle.object())
+                        # NOTE(fuzes): Same as wMtxPlugFromMob, array attributes get drawn by their first element
+                        if plug.isArray:
+                            plug = plug.elementByLogicalIndex(0)
+                        plugKey = (rule.ddrawType, ddraw_core.getPlugKey(plug))
+                        if plugKey not in seen:
+                            seen.add(plugKey)
+                            matches[id(rule)].append(plug)
+            it.next()
+
+        return [(rule, matches[id(rule)]) for rule in self.rules]
+
+class DDrawInstrumentation(object):
+
+    def __init__(self, entries, handles = None):
+        """
+        Manifest of the ddraw nodes an instrumentation pass created, nodes which got reused are not part of it.
+
+        [list] entries: [dict] per node with the keys rule, node (full path of the transform), shape and source
+        [list] handles: [MObjectHandle] of the created shapes matching the entries, [None] for loaded manifests
+
+        :param entries: [list] of [dict]
+        :param handles: [list] of [MObjectHandle] or [None]
+        """
+        self.entries = entries
+        self.handles = handles
+
+    def save(self, path):
+        """
+        :param path: [string] json file
+        :return: [None]
+        """
+        ddraw_core.saveData(path, {"nodes": self.entries})
+
+    @classmethod
+    def load(cls, path):
+        """
+        :param path: [string] json file written by save
+        :return: [DDrawInstrumentation]
+        """
+        if not os.path.isfile(path):
+            raise IOError("No instrumentation manifest at {}".format(path))
+        return cls(ddraw_core.loadData(path)["nodes"])
+
+    # noinspection PyArgumentList
+    def getNodePaths(self):
+        """
+        :return: [list] of [string] full paths of the transforms which still exist
+        """
+        if self.handles is None:
+            return cmds.ls([entry["node"] for entry in self.entries], long=True) or []
+
+        Result = []
+        mfn_dag = om2.MFnDagNode()
+        for handle in self.handles:
+            if handle.isValid():
+                mfn_dag.setObject(handle.object())
+                mfn_dag.setObject(mfn_dag.parent(0))
+                Result.append(mfn_dag.fullPathName())
+        return Result
+
+    def remove(self):
+        """
+        Deletes the nodes of the pass which still exist with a single undoable delete.
+        :return: [int] number of deleted nodes
+        """
+        paths = self.getNodePaths()
+        if paths:
+            cmds.delete(paths)
+        return len(paths)
+
+# noinspection PyArgumentList
+@profiled()
+def instrumentScene(rules, manifestPath = None, reuseExisting = True):
+    """
+    Matches the rules against the scene and draws every matched attribute. The nodes of each rule get created
+    with one batch of ddraw_core.drawDDrawNodes, the whole pass is a single undo chunk.
+    :param rules: [DDrawRuleSet]|[iterable] of [dict]|[DDrawRule]
+    :param manifestPath: [string] json file to save the manifest to or [None]
+    :param reuseExisting: [bool] whether attributes which are drawn already reuse their ddraw node
+    :return: [DDrawInstrumentation] of the created nodes
+    """
+    ruleSet = rules if isinstance(rules, DDrawRuleSet) else DDrawRuleSet(rules)
+
+    entries = []
+    handles = []
+    mfn_dag = om2.MFnDagNode()
+    with ddraw_core.undoChunk("DDrawInstrument"):
+        for rule, plugs in ruleSet.match():
+            if not plugs:
+                continue
+            if rule.ddrawType == DDrawTypes.kVector:
+                sourcePlugs = [(plug, None) for plug in plugs]
+            else:
+                sourcePlugs = [(plug,) for plug in plugs]
+
+            created = []
+            mobs = ddraw_core.drawDDrawNodes(rule.ddrawType, sourcePlugs, rule.options, reuseExisting,
+                                             "DDrawInstrument", created)
+            # NOTE(fuzes): Hash codes are not unique, the handles get compared within a hash code. Nodes are
+            # removed once listed, plugs given twice share one node
+            createdHandles = {}
+            for mob in created:
+                handle = om2.MObjectHandle(mob)
+                createdHandles.setdefault(handle.hashCode(), []).append(handle)
+            for plug, mob in zip(plugs, mobs):
+                handle = om2.MObjectHandle(mob)
+                bucket = createdHandles.get(handle.hashCode(), [])
+                if not any(h == handle for h in bucket):
+                    continue
+                bucket[:] = [h for h in bucket if not h == handle]
+                mfn_dag.setObject(mob)
+                shape = mfn_dag.name()
+                mfn_dag.setObject(mfn_dag.parent(0))
+                entries.append({"rule": rule.name, "node": mfn_dag.fullPathName(), "shape": shape,
+                                "source": plug.name()})
+                handles.append(handle)
+
+    Result = DDrawInstrumentation(entries, handles)
+    if manifestPath is not None:
+        Result.save(manifestPath)
+    return Result
+
+def loadRules(path):
+    """
+    :param path: [string] json file holding a list of rules or a dictionary with a "rules" list
+    :return: [DDrawRuleSet]
+    """
+    if not os.path.isfile(path):
+        raise IOError("No rules at {}".format(path))
+    data = ddraw_core.loadData(path)
+    return DDrawRuleSet(data["rules"] if isinstance(data, dict) else data)
+
+def removeInstrumentation(instrumentation):
+    """
+    Deletes the nodes created by an instrumentation pass.
+    :param instrumentation: [DDrawInstrumentation]|[string] path of a saved manifest
+    :return: [int] number of deleted nodes
+    """
+    if not isinstance(instrumentation, DDrawInstrumentation):
+        instrumentation = DDrawInstrumentation.load(instrumentation)
+    return instrumentation.remove()
@@ -0,0 +1,1746 @@
+"""
+Qt based UI of the debug draw tools. Only gets imported on first UI use, see ddraw.loadUI()
+"""
+import os
+
+from maya import cmds
+from maya.app.general.mayaMixin import MayaQWidgetBaseMixin
+from maya.api import OpenMaya as om2
+
+from PySide2.QtCore import *
+from PySide2.QtWidgets import *
+from PySide2.QtGui import *
+
+from shiboken2 import wrapInstance
+from maya import OpenMayaUI as omui
+
+from ddraw_core import *
+from ddraw_profile import profiled, getProfiler
+
+# Global public variables
+DDRAW_WINDOW_NAME = "ddraw_window"
+
+#
+# General utility functions
+#
+
+_XBMLANGPATHS = None
+_ICON_INDEX = None
+_ICON_CACHE = {}
+
+def getXbmLangPaths():
+    """
+    Lazily evaluates the existing image paths from the XBMLANGPATH environment variable.
+    :return: [list] of [string] paths
+    """
+    global _XBMLANGPATHS
+    if _XBMLANGPATHS is None:
+        _XBMLANGPATHS = [p for p in (os.getenv("XBMLANGPATH") or "").split(";") if os.path.exists(p)]
+    return _XBMLANGPATHS
+
+def getIconIndex():
+    """
+    Returns the icon index mapping the icon name without extension to its full path.
+    The index gets built once on first use. When multiple paths contain the same icon the last one wins.
+    :return: [dict]
+    """
+    global _ICON_INDEX
+    if _ICON_INDEX is None:
+        index = {}
+        for path in getXbmLangPaths():
+            for icon in os.listdir(path):
+                index[icon.split(".")[0]] = os.path.join(path, icon)
+        _ICON_INDEX = index
+    return _ICON_INDEX
+
+def refreshIconIndex():
+    """
+    Drops the icon index and the cached icons. Call this after the XBMLANGPATH changed.
+    The index will be built again on the next lookup.
+    :return: [None]
+    """
+    global _XBMLANGPATHS, _ICON_INDEX
+    _XBMLANGPATHS = None
+    _ICON_INDEX = None
+    _ICON_CACHE.clear()
+
+def getImagePath(name):
+    """
+    Searches all the image paths in the Maya environment matching to the given [string] parameter.
+    If we find a path we return the full path to it.
+    :param name: [string] name of the image to search
+    :return: [string] If found returns the a valid path to the found icon. If not returns [None]
+    """
+    return getIconIndex().get(name)
+
+def getIcon(name):
+    """
+    Returns a [QIcon] for the given image name. Icons are shared between all callers asking for the same path.
+    :param name: [string] name of the image to search
+    :return: [QIcon] an empty [QIcon] if no image was found
+    """
+    path = getImagePath(name)
+    icon = _ICON_CACHE.get(path)
+    if icon is None:
+        icon = QIcon(path) if path else QIcon()
+        _ICON_CACHE[path] = icon
+    return icon
+
+# noinspection PyArgumentList
+def convertQColorToMColor(c):
+    """
+    Utility function to convert from a [QColor] to a [MColor]
+    :param c: [QColor]
+    :return: [MColor]
+    """
+    return om2.MColor([c.red() / 255.0, c.green() / 255.0, c.blue() / 255.0])
+
+def convertMColorToQColor(c):
+    """
+    Simple utility function to convert from a MColor to a QColor
+    :param c: [MColor]
+    :return: [QColor]
+    """
+    return QColor(int(c[0]*255), int(c[1]*255), int(c[2]*255))
+
+def getDDrawAngleOptionFromQSettings():
+    """
+    Retrieves the options for a ddraw_angle node from the QSettings. If there are None available,
+    the default attribute types will be set.
+
+    :return: [DDrawAngleOption] with the all the option parameters used from QSettings
+    """
+    Result = DDrawAngleOptions()
+
+    settings = QSettings("fuzes", "ddraw")
+    if settings.value("angleNormalize"):
+        Result.normalize = settings.value("angleNormalize") == u'true'
+    if settings.value("angleTextColor"):
+        Result.textColor = convertQColorToMColor(settings.value("angleTextColor"))
+
+    return Result
+
+def DrawAngleFromQSettings(*args):
+    """
+    Convenience function which draws a angle from the QSetttings
+    :param args:
+    :return:
+    """
+    DrawAngle(getDDrawAngleOptionFromQSettings())
+
+def DrawVectorFromQSettings(*args):
+    """
+    Convenience function which draws a vector from the QSettings
+    :return: [None]
+    """
+    DrawVector(getDDrawVectorOptionFromQSettings())
+
+def getDDrawVectorOptionFromQSettings():
+    """
+    Fetches all the options from the QSettings and returns a new [DDrawVectorOption] from the settings.
+    If no settings are found the values are set to the default settings from DDrawVectorOption
+    :return: [DDrawVectorOptions] filled up with all the settings
+    """
+
+    Result = DDrawVectorOptions()
+
+    settings = QSettings("fuzes", "ddraw")
+    if settings.value("vectorColor"):
+        Result.vectorColor = convertQColorToMColor(settings.value("vectorColor"))
+    if settings.value("coneRadius"):
+        Result.coneRadius = float(settings.value("coneRadius"))
+    if settings.value("coneHeight"):
+        Result.coneHeight = float(settings.value("coneHeight"))
+    if settings.value("displayText"):
+        Result.displayText = settings.value("displayText") == u'true'
+    if settings.value("textColor"):
+        Result.textColor = convertQColorToMColor(settings.value("textColor"))
+
+    return Result
+
+def getDDrawMatrixOptionFromQSettings():
+    """
+        Retrieves the options for a ddraw_matrix node from the QSettings. If there are None available,
+        the default attribute types will be set.
+
+        :return: [DDrawMatrixOption] with the all the option parameters used from QSettings
+    """
+    Result = DDrawMatrixOptions()
+
+    settings = QSettings("fuzes", "ddraw")
+    if settings.value("matrixDisplayText"):
+        Result.displayText = settings.value("matrixDisplayText") == u'true'
+    if settings.value("matrixTextColor"):
+        Result.textColor = convertQColorToMColor(settings.value("matrixTextColor"))
+    return Result
+
+def DrawMatrixFromQSettings(*args):
+    """
+    Convenience function which draws a matrix from the QSettings
+    :return: [None]
+    """
+    DrawMatrix(getDDrawMatrixOptionFromQSettings())
+
+#
+# UI related code
+#
+
+class DDrawAttribute(MayaQWidgetBaseMixin, QDialog):
+    # noinspection PyArgumentList
+    def __init__(self, mob, mode, parent=None):
+        """
+        Creates a UI which list's all the available attributes which can be drawn from the given node.
+
+        :param mode: [DDrawDrawables] type of enumeration
+        :param mob: [MObject] from which to list all the attributes
+        :param parent: [Q*] any Q*
+        """
+        super(DDrawAttribute, self).__init__(parent=parent)
+
+        self.mode = mode
+        self.mobHandle = om2.MObjectHandle(mob)
+
+        self.setWindowIcon(QIcon("W:/maya/plugins/debugdraw/data/design.svg"))
+        self.setWindowTitle("Save default attribute")
+
+        self.txt = QLineEdit()
+        self.txt.setMinimumHeight(26)
+        self.txt.setPlaceholderText("Filter:")
+        self.txt.textChanged.connect(self._on_filter_text_changed)
+
+        self.view = QListView()
+        plugList = []
+        if mode == DDrawTypes.kVector:
+            plugList = getVectorAttributesFromMob(mob)
+        elif mode == DDrawTypes.kMatrix:
+            plugList = getMatrixAttributesFromMob(mob)
+
+        model = DDrawPlugListModel(plugList)
+
+        self.sortModel = QSortFilterProxyModel()
+        self.sortModel.setSourceModel(model)
+        self.view.setModel(self.sortModel)
+
+        btn = QPushButton("Save as Default")
+        btn.setIcon(QIcon("W:/maya/plugins/debugdraw/data/floppy-disk.svg"))
+        btn.clicked.connect(self._run_save_as_default)
+
+        lyt = QVBoxLayout()
+        lyt.addWidget(self.txt)
+        lyt.addWidget(self.view)
+        lyt.addWidget(btn)
+
+        self.setLayout(lyt)
+
+    def _on_filter_text_changed(self):
+        self.sortModel.setFilterFixedString(self.txt.text())
+
+    def _run_save_as_default(self):
+        index = self.view.currentIndex()
+        plugData = index.data(Qt.UserRole)
+        store = getDefaultsStore()
+        data = store.get()
+        mob = list(iterSelection())[0]
+        # TODO(fuzes): Check if the key already exists in the dictionary
+        if self.mode == DDrawTypes.kMatrix:
+            data["matrix"][getStringTypeFromMob(mob)] = plugData.partialName(useLongNames = False)
+        elif self.mode == DDrawTypes.kVector:
+            data["vector"][getStringTypeFromMob(mob)] = plugData.partialName(useLongNames = False)
+        store.save(data)
+        self.close()
+
+# noinspection PyMethodOverriding,PyMethodOverriding
+class DDrawPlugListModel(QAbstractListModel):
+    def __init__(self, data, parent=None, *args):
+        """
+        A basic implementation of the QAbstractListModel to show all the available plugs.
+
+        :param data: [list] containing [MPlug]'s
+        :param parent: [Q*]
+        :param args:
+        """
+        QAbstractListModel.__init__(self, parent, *args)
+        self.listdata = data
+
+    def rowCount(self, parent=QModelIndex()):
+        return len(self.listdata)
+
+    def data(self, index, role):
+
+        if not index.isValid():
+            return
+
+        if  role == Qt.DisplayRole:
+            return self.listdata[index.row()].name().split(".")[-1]
+        if role == Qt.UserRole:
+            return self.listdata[index.row()]
+
+def runSaveDefaultAttributeDialog(mode, *args):
+    """
+    Creates a dialog window prompting the user to choose from the attribute list.
+    The selected attribute will be saved once the Save buttons gets pressed and the drawing
+    will automatically choose that attribute to be displayed.
+    If no node is selected a warning call gets executed (cmds.warning)
+    :param mode: [DDrawDrawables] for know can be either kMatrix or kVector. kAngle is not supported
+    :return: [None]
+    """
+    selection = cmds.ls(sl=True)
+    if len(selection) > 0:
+        app = DDrawAttribute(getMobFromName(selection[0]), mode)
+        app.show()
+    else:
+        cmds.warning("Nothing selected. Can not display attributes")
+
+# noinspection PyUnresolvedReferences
+class ColorPushButton(QPushButton):
+
+    colorChanged = Signal(QColor)
+
+    def __init__(self, color = QColor(255, 255, 255), parent = None):
+        """
+        Simple [QPushButton] which changes its color depending on what gets chosen from the QColorDialog.
+        The QColorDialog is connected to the button clicked event
+
+        Signal slots:
+        colorChanged: emitted after the QDialog has been closed with the chosen color
+
+        :param color: [QColor] The default color of the button
+        :param parent: [Q*] Any Q*
+        """
+        super(ColorPushButton, self).__init__(parent = parent)
+
+        self.color = color
+
+        self.setColor(color)
+        self.clicked.connect(self._run_color_dialog)
+
+    def setMixed(self):
+        """
+        Shows that the button represents multiple different colors.
+        """
+        self.setColor(QColor(128, 128, 128))
+        self.setText("mixed")
+
+    def setColor(self, color):
+        self.setText("")
+        pal = self.palette()
+        pal.setColor(QPalette.Button, color)
+        self.setAutoFillBackground(True)
+        self.setPalette(pal)
+        self.update()
+
+    def _run_color_dialog(self):
+        color = QColorDialog(self)
+        color.exec_()
+        selectedColor = color.selectedColor()
+        self.setColor(selectedColor)
+        self.color = selectedColor
+        self.colorChanged.emit(self.color)
+
+# noinspection PyUnresolvedReferences
+class MixedDoubleSpinBox(QDoubleSpinBox):
+
+    def __init__(self, parent = None):
+        """
+        [QDoubleSpinBox] which can show that it represents multiple different values.
+        Qt only shows the special value text at the minimum, so while mixed the minimum is lowered by one step and the
+        spin box sits there. Every value of the real range, the real minimum included, is then a change which emits
+        valueChanged and ends the mixed state.
+
+        :param parent: [Q*] Any Q*
+        """
+        super(MixedDoubleSpinBox, self).__init__(parent = parent)
+
+        self.mixed = False
+        self.rangeMinimum = 0.0
+        self.valueChanged.connect(self._on_value_changed)
+
+    def setMixed(self):
+        if not self.mixed:
+            self.mixed = True
+            self.rangeMinimum = self.minimum()
+            self.setSpecialValueText("mixed")
+            self.setMinimum(self.rangeMinimum - self.singleStep())
+        self.setValue(self.minimum())
+
+    def clearMixed(self):
+        if self.mixed:
+            self.mixed = False
+            self.setSpecialValueText("")
+            self.setMinimum(self.rangeMinimum)
+
+    def _on_value_changed(self, value):
+        self.clearMixed()
+
+def sharedValue(values):
+    """
+    Checks whether all the values are the same.
+    :param values: [list] of values which can be compared with ==
+    :return: [tuple] ([*] the first value, [bool] True if the values are mixed)
+    """
+    first = values[0]
+    for value in values[1:]:
+        if not value == first:
+            return first, True
+    return first, False
+
+def setColorButtonValue(button, color, mixed):
+    if mixed:
+        button.setMixed()
+    else:
+        button.color = convertMColorToQColor(color)
+        button.setColor(button.color)
+
+def setSpinBoxValue(spinBox, value, mixed):
+    spinBox.blockSignals(True)
+    if mixed:
+        spinBox.setMixed()
+    else:
+        spinBox.clearMixed()
+        spinBox.setValue(value)
+    spinBox.blockSignals(False)
+
+def setCheckBoxValue(checkBox, value, mixed):
+    checkBox.blockSignals(True)
+    checkBox.setTristate(mixed)
+    if mixed:
+        checkBox.setCheckState(Qt.PartiallyChecked)
+    else:
+        checkBox.setCheckState(Qt.Checked if value else Qt.Unchecked)
+    checkBox.blockSignals(False)
+
+# noinspection PyUnresolvedReferences,PyUnresolvedReferences,PyUnresolvedReferences
+class DDrawVectorParametersWidget(QWidget):
+
+    dataChanged = Signal()
+    vectorColorChanged = Signal(QColor)
+    coneRadiusChanged = Signal(float)
+    coneHeightChanged = Signal(float)
+    displayTextToggled = Signal(bool)
+    textColorChanged = Signal(QColor)
+
+    def __init__(self, settings = DDrawVectorOptions(), parent = None):
+        """
+        Creates a QWidget from the [DDrawVectorOptions] options. List all the possible parameters for a
+        ddraw_vector node. Allows you to easily change the relevant attributes and receive signals from the changes.
+
+        Signals:
+        dataChanged: Signal will be emitted if any of the data changes on the widget
+        vectorColorChanged: [QColor] Signal will be emitted when the vectorColor changes
+        coneRadiusChanged: [float] Signal will be emitted when the coneRadius changes
+        coneHeightChanged: [float] Signal will be emitted when the coneHeight changes
+        displayTextToggled: [bool] Signal will be emitted when the displayText checkbox is being toggled
+        textColorChanged: [QColor] Signal will be emitted when the vectorColor changes
+
+        :param settings: [DDrawVectorOptions] for the initial values on the attributes on the widget
+        :param parent: [Q*]
+        """
+        super(DDrawVectorParametersWidget, self).__init__(parent = parent)
+
+        # NOTE(fuzes): Attribute names which got changed by the user since the last takeEditedOptions()
+        self.editedFields = set()
+
+        self.vectorColorBtn = ColorPushButton(convertMColorToQColor(settings.vectorColor))
+        self.vectorColorBtn.colorChanged.connect(self._on_vector_color_changed)
+
+        self.coneRadius = MixedDoubleSpinBox()
+        self.coneRadius.setSingleStep(0.1)
+        self.coneRadius.setMinimum(0)
+        self.coneRadius.setValue(settings.coneRadius)
+        self.coneRadius.valueChanged.connect(self._on_cone_radius_changed)
+
+        self.coneHeight = MixedDoubleSpinBox()
+        self.coneHeight.setSingleStep(0.1)
+        self.coneHeight.setMinimum(0)
+        self.coneHeight.setValue(settings.coneHeight)
+        self.coneHeight.valueChanged.connect(self._on_cone_height_changed)
+
+        self.displayText = QCheckBox()
+        self.displayText.setChecked(settings.displayText)
+        self.displayText.stateChanged.connect(self._on_display_text_state_changed)
+
+        self.textColorBtn = ColorPushButton(convertMColorToQColor(settings.textColor))
+        self.textColorBtn.colorChanged.connect(self._on_text_color_changed)
+
+        layout = QFormLayout()
+        layout.addRow("Vector Color", self.vectorColorBtn)
+        layout.addRow("Cone Radius", self.coneRadius)
+        layout.addRow("Cone Height", self.coneHeight)
+        layout.addRow("Display Text", self.displayText)
+        layout.addRow("Text Color", self.textColorBtn)
+
+        self.setLayout(layout)
+
+    def _on_vector_color_changed(self, color):
+        self.editedFields.add("vectorColor")
+        self.vectorColorChanged.emit(color)
+        self.dataChanged.emit()
+    def _on_cone_radius_changed(self, value):
+        self.editedFields.add("coneRadius")
+        self.coneRadiusChanged.emit(value)
+        self.dataChanged.emit()
+    def _on_cone_height_changed(self, value):
+        self.editedFields.add("coneHeight")
+        self.coneHeightChanged.emit(value)
+        self.dataChanged.emit()
+    def _on_display_text_state_changed(self, state):
+        if state == Qt.PartiallyChecked:
+            return
+        self.displayText.setTristate(False)
+        self.editedFields.add("displayText")
+        self.displayTextToggled.emit(state == Qt.Checked)
+        self.dataChanged.emit()
+    def _on_text_color_changed(self, color):
+        self.editedFields.add("textColor")
+        self.textColorChanged.emit(color)
+        self.dataChanged.emit()
+
+    def setOptionsList(self, optionsList):
+        """
+        Shows the values of multiple [DDrawVectorOptions]. Values which differ are shown as mixed.
+        :param optionsList: [list] of [DDrawVectorOptions], must not be empty
+        :return: [None]
+        """
+        setColorButtonValue(self.vectorColorBtn, *sharedValue([o.vectorColor for o in optionsList]))
+        setSpinBoxValue(self.coneRadius, *sharedValue([o.coneRadius for o in optionsList]))
+        setSpinBoxValue(self.coneHeight, *sharedValue([o.coneHeight for o in optionsList]))
+        setCheckBoxValue(self.displayText, *sharedValue([o.displayText for o in optionsList]))
+        setColorButtonValue(self.textColorBtn, *sharedValue([o.textColor for o in optionsList]))
+        self.editedFields.clear()
+
+    def takeEditedOptions(self):
+        """
+        Returns the values the user changed since the last call.
+        :return: [dict] attribute name -> value
+        """
+        options = self.getDrawVectorOptions()
+        Result = dict((field, getattr(options, field)) for field in self.editedFields)
+        self.editedFields.clear()
+        return Result
+
+    def getDrawVectorOptions(self):
+
+        Result = DDrawVectorOptions()
+
+        Result.vectorColor = convertQColorToMColor(self.vectorColorBtn.color)
+        Result.textColor = convertQColorToMColor(self.textColorBtn.color)
+        Result.coneRadius = self.coneRadius.value()
+        Result.coneHeight = self.coneHeight.value()
+        Result.displayText = self.displayText.isChecked()
+
+        return Result
+
+class DDrawVectorOptionsWindow(MayaQWidgetBaseMixin, QWidget):
+
+    def __init__(self, parent = None):
+        super(DDrawVectorOptionsWindow, self).__init__(parent = parent)
+
+        self.setWindowIcon(QIcon("W:/maya/plugins/debugdraw/data/design.svg"))
+        self.setWindowTitle("Draw Vector Options")
+
+        self.vectorWidget = DDrawVectorParametersWidget(getDDrawVectorOptionFromQSettings())
+
+        drawBtn = QPushButton("Draw")
+        drawBtn.clicked.connect(self._run_draw_vector)
+        closeBtn = QPushButton("Close")
+        closeBtn.clicked.connect(self.close)
+
+        buttonLayout = QHBoxLayout()
+        buttonLayout.addWidget(drawBtn)
+        buttonLayout.addWidget(closeBtn)
+
+        line = QFrame()
+        line.setFrameShape(QFrame.HLine)
+
+        mainLayout = QVBoxLayout()
+        mainLayout.addWidget(self.vectorWidget)
+        mainLayout.addWidget(line)
+        mainLayout.addLayout(buttonLayout)
+
+        self.setLayout(mainLayout)
+
+    def _run_draw_vector(self):
+        # NOTE(fuzes): We just fetch all the data from the UI for the command to draw the vector
+        options = self.vectorWidget.getDrawVectorOptions()
+        DrawVector(options)
+
+        settings = QSettings("fuzes", "ddraw")
+        settings.setValue("vectorColor", convertMColorToQColor(options.vectorColor))
+        settings.setValue("coneRadius", options.coneRadius)
+        settings.setValue("coneHeight", options.coneHeight)
+        settings.setValue("displayText", options.displayText)
+        settings.setValue("textColor", convertMColorToQColor(options.textColor))
+
+        self.close()
+
+    def showAtCursor(self):
+        cursor = self.mapFromGlobal(QCursor.pos())
+        width = 300
+        height = 100
+        self.setGeometry(0,0, width, height)
+        t = QPoint(-width/2, -height/2)
+
+        t += cursor
+
+        self.move(t)
+        self.show()
+
+# noinspection PyUnresolvedReferences,PyUnresolvedReferences,PyUnresolvedReferences
+class DDrawMatrixParametersWidget(QWidget):
+
+    dataChanged = Signal()
+    displayTextToggled = Signal(bool)
+    textColorChanged = Signal(QColor)
+
+    def __init__(self, settings = DDrawMatrixOptions(), parent = None):
+        """
+        Creates a QWidget from the [DDrawMatrixOptions] options. List all the possible parameters for a
+        ddraw_matrix node. Allows you to easily change the relevant attributes and receive signals from the changes.
+
+        Signals:
+        dataChanged: Signal will be emitted if any of the data changes on the widget
+        displayTextToggled: [bool] Signal will be emitted when the displayText checkbox is being toggled
+        textColorChanged: [QColor] Signal will be emitted when the vectorColor changes
+
+        :param settings: [DDrawMatrixOptions] for the initial values on the attributes on the widget
+        :param parent: [Q*]
+        """
+        super(DDrawMatrixParametersWidget, self).__init__(parent = parent)
+
+        # NOTE(fuzes): Attribute names which got changed by the user since the last takeEditedOptions()
+        self.editedFields = set()
+
+        self.displayText = QCheckBox()
+        self.displayText.setChecked(settings.displayText)
+        self.displayText.stateChanged.connect(self._on_display_text_state_changed)
+
+        self.textColorBtn = ColorPushButton(convertMColorToQColor(settings.textColor))
+        self.textColorBtn.colorChanged.connect(self._on_text_color_changed)
+
+        mainLayout = QFormLayout()
+        mainLayout.addRow("Display Text", self.displayText)
+        mainLayout.addRow("Text Color", self.textColorBtn)
+
+        self.setLayout(mainLayout)
+
+    def _on_display_text_state_changed(self, state):
+        if state == Qt.PartiallyChecked:
+            return
+        self.displayText.setTristate(False)
+        self.editedFields.add("displayText")
+        self.displayTextToggled.emit(state == Qt.Checked)
+        self.dataChanged.emit()
+    def _on_text_color_changed(self, color):
+        self.editedFields.add("textColor")
+        self.textColorChanged.emit(color)
+        self.dataChanged.emit()
+
+    def setOptionsList(self, optionsList):
+        """
+        Shows the values of multiple [DDrawMatrixOptions]. Values which differ are shown as mixed.
+        :param optionsList: [list] of [DDrawMatrixOptions], must not be empty
+        :return: [None]
+        """
+        setCheckBoxValue(self.displayText, *sharedValue([o.displayText for o in optionsList]))
+        setColorButtonValue(self.textColorBtn, *sharedValue([o.textColor for o in optionsList]))
+        self.editedFields.clear()
+
+    def takeEditedOptions(self):
+        """
+        Returns the values the user changed since the last call.
+        :return: [dict] attribute name -> value
+        """
+        options = self.getDrawMatrixOptions()
+        Result = dict((field, getattr(options, field)) for field in self.editedFields)
+        self.editedFields.clear()
+        return Result
+
+    def getDrawMatrixOptions(self):
+        Result = DDrawMatrixOptions()
+
+        Result.textColor = convertQColorToMColor(self.textColorBtn.color)
+        Result.displayText = self.displayText.isChecked()
+
+        return Result
+
+class DDrawMatrixOptionsWindow(MayaQWidgetBaseMixin, QWidget):
+
+    def __init__(self, parent = None):
+        super(DDrawMatrixOptionsWindow, self).__init__(parent = parent)
+
+        self.setWindowIcon(QIcon("W:/maya/plugins/debugdraw/data/design.svg"))
+        self.setWindowTitle("Draw Matrix Options")
+
+        self.matrixWidget = DDrawMatrixParametersWidget()
+
+        drawBtn = QPushButton("Draw")
+        drawBtn.clicked.connect(self._run_draw_matrix)
+        closeBtn = QPushButton("Close")
+        closeBtn.clicked.connect(self.close)
+
+        lyt1 = QHBoxLayout()
+        lyt1.addWidget(drawBtn)
+        lyt1.addWidget(closeBtn)
+
+        line = QFrame()
+        line.setFrameShape(QFrame.HLine)
+
+        mainLayout = QVBoxLayout()
+        mainLayout.addWidget(self.matrixWidget)
+        mainLayout.addWidget(line)
+        mainLayout.addLayout(lyt1)
+
+        self.setLayout(mainLayout)
+
+    def _run_draw_matrix(self):
+        options = self.matrixWidget.getDrawMatrixOptions()
+
+        DrawMatrix(options)
+
+        settings = QSettings("fuzes", "ddraw")
+        settings.setValue("matrixDisplayText", options.displayText)
+        settings.setValue("matrixTextColor", convertMColorToQColor(options.textColor))
+
+        self.close()
+
+    def showAtCursor(self):
+        cursor = self.mapFromGlobal(QCursor.pos())
+        width = 300
+        height = 100
+        self.setGeometry(0,0, width, height)
+        t = QPoint(-width/2, -height/2)
+
+        t += cursor
+
+        self.move(t)
+        self.show()
+
+# noinspection PyUnresolvedReferences,PyUnresolvedReferences,PyUnresolvedReferences
+class DDrawAngleParametersWidget(QWidget):
+
+    dataChanged = Signal()
+    normalizeToggled = Signal(bool)
+    textColorChanged = Signal(QColor)
+
+    def __init__(self, settings = DDrawAngleOptions(), parent = None):
+        """
+        Creates a QWidget from the [DDrawAngleOptions] options. List all the possible parameters for a
+        ddraw_angle node. Allows you to easily change the relevant attributes and receive signals from the changes.
+
+        Signals:
+        dataChanged: Signal will be emitted if any of the data changes on the widget
+        normalizeToggled: [bool] Signal will be emitted when the normalize checkbox is being toggled
+        textColorChanged: [QColor] Signal will be emitted when the vectorColor changes
+
+        :param settings: [DDrawAngleOptions] for the initial values on the attributes on the widget
+        :param parent: [Q*]
+        """
+        super(DDrawAngleParametersWidget, self).__init__(parent = parent)
+
+        # NOTE(fuzes): Attribute names which got changed by the user since the last takeEditedOptions()
+        self.editedFields = set()
+
+        self.normalize = QCheckBox()
+        self.normalize.setChecked(settings.normalize)
+        self.normalize.stateChanged.connect(self._on_normalize_state_changed)
+
+        self.textColorBtn = ColorPushButton(convertMColorToQColor(settings.textColor))
+        self.textColorBtn.colorChanged.connect(self._on_text_color_changed)
+
+        mainLayout = QFormLayout()
+        mainLayout.addRow("Normalize", self.normalize)
+        mainLayout.addRow("Text Color", self.textColorBtn)
+
+        self.setLayout(mainLayout)
+
+    def _on_normalize_state_changed(self, state):
+        if state == Qt.PartiallyChecked:
+            return
+        self.normalize.setTristate(False)
+        self.editedFields.add("normalize")
+        self.normalizeToggled.emit(state == Qt.Checked)
+        self.dataChanged.emit()
+    def _on_text_color_changed(self, color):
+        self.editedFields.add("textColor")
+        self.textColorChanged.emit(color)
+        self.dataChanged.emit()
+
+    def setOptionsList(self, optionsList):
+        """
+        Shows the values of multiple [DDrawAngleOptions]. Values which differ are shown as mixed.
+        :param optionsList: [list] of [DDrawAngleOptions], must not be empty
+        :return: [None]
+        """
+        setCheckBoxValue(self.normalize, *sharedValue([o.normalize for o in optionsList]))
+        setColorButtonValue(self.textColorBtn, *sharedValue([o.textColor for o in optionsList]))
+        self.editedFields.clear()
+
+    def takeEditedOptions(self):
+        """
+        Returns the values the user changed since the last call.
+        :return: [dict] attribute name -> value
+        """
+        options = self.getDrawAngleOptions()
+        Result = dict((field, getattr(options, field)) for field in self.editedFields)
+        self.editedFields.clear()
+        return Result
+
+    def getDrawAngleOptions(self):
+        Result = DDrawAngleOptions()
+
+        Result.textColor = convertQColorToMColor(self.textColorBtn.color)
+        Result.normalize = self.normalize.isChecked()
+
+        return Result
+
+class DDrawAngleOptionsWindow(MayaQWidgetBaseMixin, QWidget):
+
+    def __init__(self, parent = None):
+        super(DDrawAngleOptionsWindow, self).__init__(parent = parent)
+
+        self.setWindowIcon(QIcon("W:/maya/plugins/debugdraw/data/design.svg"))
+        self.setWindowTitle("Draw Angle Options")
+
+        self.angleWidget = DDrawAngleParametersWidget()
+
+        drawBtn = QPushButton("Draw")
+        drawBtn.clicked.connect(self._run_draw_angle)
+        closeBtn = QPushButton("Close")
+        closeBtn.clicked.connect(self.close)
+
+        buttonLayout = QHBoxLayout()
+        buttonLayout.addWidget(drawBtn)
+        buttonLayout.addWidget(closeBtn)
+
+        line = QFrame()
+        line.setFrameShape(QFrame.HLine)
+
+        mainLayout = QVBoxLayout()
+        mainLayout.addWidget(self.angleWidget)
+        mainLayout.addWidget(line)
+        mainLayout.addLayout(buttonLayout)
+
+        self.setLayout(mainLayout)
+
+    def _run_draw_angle(self):
+        options = self.angleWidget.getDrawAngleOptions()
+
+        DrawAngle(options)
+
+        settings = QSettings("fuzes", "ddraw")
+        settings.setValue("angleNormalize", options.normalize)
+        settings.setValue("angleTextColor", convertMColorToQColor(options.textColor))
+
+        self.close()
+
+    def showAtCursor(self):
+        cursor = self.mapFromGlobal(QCursor.pos())
+        width = 300
+        height = 100
+        self.setGeometry(0,0, width, height)
+        t = QPoint(-width/2, -height/2)
+
+        t += cursor
+
+        self.move(t)
+        self.show()
+
+def RunVectorOptions(*args):
+    app = DDrawVectorOptionsWindow()
+    app.showAtCursor()
+
+def RunMatrixOptions(*args):
+    app = DDrawMatrixOptionsWindow()
+    app.showAtCursor()
+
+def RunAngleOptions(*args):
+    app = DDrawAngleOptionsWindow()
+    app.showAtCursor()
+
+class BaseTreeItem(object):
+
+    def __init__(self, typeIdentifier, data = None, parent = None):
+        """
+        A generic implementation of a Tree data structure.
+        The main purpose of this class was to make it easier to use with the QAbstractItemModel.
+        This is just the same class used in the Qt examples:
+        http://doc.qt.io/qt-5/qtwidgets-itemviews-editabletreemodel-treeitem-cpp.html
+
+        :param data: [*] The data which should be stored with the node
+        :param parent: [BaseTreeItem] which is the parent of this instance
+        """
+        self.parent = parent
+        self.data = data
+        self.type = typeIdentifier
+        self.children = []
+
+        # NOTE(fuzes): Cached position inside of the parent's children. Only rows from dirtyRow onwards
+        # might be stale, see row()
+        self.cachedRow = 0
+        self.dirtyRow = 0
+
+        # NOTE(fuzes): Children which are not loaded yet. [MObjectHandle]'s of nodes of the pendingType,
+        # the TreeModel turns them into items in chunks through fetchMore()
+        self.pending = []
+        self.pendingType = -1
+
+    def childCount(self):
+        return len(self.children)
+
+    def child(self, row):
+        return self.children[row]
+
+    def addChild(self, node):
+        node.parent = self
+        node.cachedRow = len(self.children)
+        self.children.append(node)
+
+    def removeChildren(self, position, count):
+
+        if position < 0 or position + count > self.childCount():
+            return False
+
+        del self.children[position:position + count]
+        self.dirtyRow = min(self.dirtyRow, position)
+
+        return True
+
+    def insertChild(self, position, item):
+
+        if position < 0 or position > self.childCount():
+            return False
+
+        item.parent = self
+        item.cachedRow = position
+        self.children.insert(position, item)
+        self.dirtyRow = min(self.dirtyRow, position + 1)
+        return True
+
+    def insertChildItems(self, position, items):
+
+        if position < 0 or position > self.childCount():
+            return False
+
+        for offset, item in enumerate(items):
+            item.parent = self
+            item.cachedRow = position + offset
+        self.children[position:position] = items
+        self.dirtyRow = min(self.dirtyRow, position + len(items))
+        return True
+
+    def insertChildren(self, position, count):
+
+        for x in xrange(count):
+            item = BaseTreeItem(-1, parent=self)
+            self.insertChild(position, item)
+
+        return True
+
+    def updateRows(self):
+        """
+        Renumbers the cached rows of all children which might be stale.
+        :return: [None]
+        """
+        children = self.children
+        for row in xrange(self.dirtyRow, len(children)):
+            children[row].cachedRow = row
+        self.dirtyRow = len(children)
+
+    def row(self):
+        if self.parent:
+            # NOTE(fuzes): If the cached row still points at us it is correct, otherwise we renumber the
+            # stale part of the siblings once, so a batch of inserts/removes costs one pass in total.
+            siblings = self.parent.children
+            row = self.cachedRow
+            if row < len(siblings) and siblings[row] is self:
+                return row
+            self.parent.updateRows()
+            return self.cachedRow
+
+        return 0
+
+# noinspection PyMethodOverriding,PyMethodOverriding,PyMethodOverriding,PyMethodOverriding,PyMethodOverriding,PyMethodOverriding,PyMethodOverriding,PyMethodOverriding,PyMethodOverriding,PyMethodOverriding
+class TreeModel(QAbstractItemModel):
+
+    def __init__(self, root):
+        """
+        Implementation of the QAbstractItemModel for using with the BaseTreeItem model.
+
+        :param root: [BaseTreeItem] the root which will not be visible and acts as a invalid index
+        """
+        super(TreeModel, self).__init__()
+        self.root = root
+        self.fetchChunkSize = 256
+
+        # NOTE(fuzes): Lookup tables for the items holding a Maya node. Kept up to date by setData, removeRows
+        # and renameItem so we never have to walk the whole tree to find a node.
+        self.nameIndex = {}
+        self.handleIndex = {}
+        # NOTE(fuzes): hashCode -> [list] of ([MObjectHandle], [BaseTreeItem] group) for the nodes which are still
+        # pending in a group, so they can be found without loading the whole group
+        self.pendingIndex = {}
+        self.registerItems(root)
+
+    def data(self, index, role):
+
+        if not index.isValid():
+            return
+
+        item = index.internalPointer()
+        data = item.data
+
+        if role == Qt.DisplayRole:
+            return data["displayName"]
+        elif role == Qt.DecorationRole:
+            # NOTE(fuzes): The icon of a node is only looked up once the view wants to paint it
+            if data["decoration"] is None and data["data"] is not None:
+                data["decoration"] = getIcon(getStringTypeFromMob(data["data"].object()))
+            return data["decoration"]
+
+    def headerData(self, section, orientation, role = Qt.DisplayRole):
+
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return "DDraw Outliner"
+
+    def index(self, row, column, parent = QModelIndex()):
+
+        if not QAbstractItemModel.hasIndex(self, row, column, parent):
+            return QModelIndex()
+
+        parentItem = self.getItem(parent)
+
+        childItem = parentItem.child(row)
+        if childItem:
+            return self.createIndex(row, 0, childItem)
+        else:
+            return QModelIndex()
+
+    def parent(self, index):
+
+        if not index.isValid():
+            return QModelIndex()
+
+        childItem = index.internalPointer()
+        parentItem = childItem.parent
+
+        if parentItem == self.root:
+            return QModelIndex()
+
+        return self.createIndex(parentItem.row(), 0, parentItem)
+
+    def hasChildren(self, parent = QModelIndex()):
+
+        parentItem = self.getItem(parent)
+        return parentItem.childCount() > 0 or len(parentItem.pending) > 0
+
+    def canFetchMore(self, parent):
+
+        return len(self.getItem(parent).pending) > 0
+
+    def fetchMore(self, parent):
+
+        parentItem = self.getItem(parent)
+        chunk = parentItem.pending[:self.fetchChunkSize]
+        del parentItem.pending[:self.fetchChunkSize]
+        self.unregisterPending(parentItem, chunk)
+
+        # NOTE(fuzes): Nodes might have been deleted since we collected them
+        items = [BaseTreeItem(parentItem.pendingType, getDataFromMob(handle.object())) for handle in chunk
+                 if handle.isValid()]
+        self.insertItems(parentItem.childCount(), items, parent)
+
+    def rowCount(self, parent = QModelIndex()):
+
+        parentItem = self.getItem(parent)
+        return parentItem.childCount()
+
+    def flags(self, index):
+
+        if not index.isValid():
+            return 0
+
+        return Qt.ItemIsEditable | QAbstractItemModel.flags(self, index)
+
+    def columnCount(self, parent = QModelIndex()):
+        return 1
+
+    #
+    # These functions are here for a TreeView which can be edited
+    #
+
+    def setData(self, index, value, role = Qt.EditRole):
+
+        if role != Qt.EditRole:
+            return False
+
+        item = self.getItem(index)
+        self.unregisterItem(item)
+        item.data = value[1]
+        item.type = value[0]
+        self.registerItem(item)
+        self.dataChanged.emit(index, index)
+
+        return True
+
+    def insertRows(self, position, rows, parent = QModelIndex()):
+
+        parentItem = self.getItem(parent)
+
+        self.beginInsertRows(parent, position, position + rows - 1)
+        Result = parentItem.insertChildren(position, rows)
+        self.endInsertRows()
+
+        return Result
+
+    def removeRows(self, position, rows, parent = QModelIndex()):
+
+        Result = False
+        if not parent.isValid():
+            return Result
+
+        parentItem = self.getItem(parent)
+
+        self.beginRemoveRows(parent, position, position + rows - 1)
+        for item in parentItem.children[position:position + rows]:
+            self.unregisterItems(item)
+        Result = parentItem.removeChildren(position, rows)
+        self.endRemoveRows()
+
+        return Result
+
+    def insertItems(self, position, items, parent = QModelIndex()):
+        """
+        Inserts all the given items with a single begin/endInsertRows cycle.
+        :param position: [int] row at which to insert the items
+        :param items: [list] of [BaseTreeItem]
+        :param parent: [QModelIndex]
+        :return: [bool]
+        """
+        if not items:
+            return False
+
+        parentItem = self.getItem(parent)
+
+        self.beginInsertRows(parent, position, position + len(items) - 1)
+        Result = parentItem.insertChildItems(position, items)
+        for item in items:
+            self.registerItems(item)
+        self.endInsertRows()
+
+        return Result
+
+    def removeItems(self, items):
+        """
+        Removes all the given items. Items next to each other are removed with a single removeRows call.
+        :param items: [list] of [BaseTreeItem]
+        :return: [None]
+        """
+        rowsPerParent = {}
+        for item in items:
+            if item.parent is not None:
+                rowsPerParent.setdefault(item.parent, set()).add(item.row())
+
+        for parentItem, rows in rowsPerParent.items():
+            parent = self.indexFromItem(parentItem)
+            # NOTE(fuzes): Walk from the bottom so the rows we did not handle yet stay valid
+            rows = sorted(rows, reverse=True)
+            end = start = rows[0]
+            for row in rows[1:]:
+                if row == start - 1:
+                    start = row
+                    continue
+                self.removeRows(start, end - start + 1, parent)
+                end = start = row
+            self.removeRows(start, end - start + 1, parent)
+
+    #
+    # Lookup of the items holding a Maya node
+    #
+
+    def registerItem(self, item):
+        for handle in item.pending:
+            self.pendingIndex.setdefault(handle.hashCode(), []).append((handle, item))
+
+        data = item.data
+        if not data or data["data"] is None:
+            return
+
+        self.nameIndex[data["displayName"]] = item
+        self.handleIndex[data["data"].hashCode()] = item
+
+    def unregisterItem(self, item):
+        self.unregisterPending(item, item.pending)
+
+        data = item.data
+        if not data or data["data"] is None:
+            return
+
+        if self.nameIndex.get(data["displayName"]) is item:
+            del self.nameIndex[data["displayName"]]
+        hashCode = data["data"].hashCode()
+        if self.handleIndex.get(hashCode) is item:
+            del self.handleIndex[hashCode]
+
+    def registerItems(self, item):
+        self.registerItem(item)
+        for child in item.children:
+            self.registerItems(child)
+
+    def unregisterItems(self, item):
+        self.unregisterItem(item)
+        for child in item.children:
+            self.unregisterItems(child)
+
+    def itemFromName(self, name):
+        """
+        :param name: [string] name of the Maya node
+        :return: [BaseTreeItem] or [None] if no item holds a node with that name
+        """
+        return self.nameIndex.get(name)
+
+    # noinspection PyArgumentList
+    def itemFromMob(self, mob):
+        """
+        :param mob: [MObject]
+        :return: [BaseTreeItem] or [None] if no item holds the given node
+        """
+        handle = om2.MObjectHandle(mob)
+        item = self.handleIndex.get(handle.hashCode())
+        if item is not None and item.data["data"] == handle:
+            return item
+        return None
+
+    def unregisterPending(self, group, handles):
+        """
+        :param group: [BaseTreeItem] the group the handles are pending in
+        :param handles: [list] of [MObjectHandle] which are not pending in the group anymore
+        :return: [None]
+        """
+        for handle in handles:
+            hashCode = handle.hashCode()
+            entries = self.pendingIndex.get(hashCode)
+            if entries is None:
+                continue
+            entries[:] = [entry for entry in entries if entry[1] is not group or entry[0] != handle]
+            if not entries:
+                del self.pendingIndex[hashCode]
+
+    # noinspection PyArgumentList
+    def pendingGroupFromMob(self, mob):
+        """
+        :param mob: [MObject]|[MObjectHandle]
+        :return: [BaseTreeItem] the group the node is still pending in or [None]
+        """
+        handle = mob if isinstance(mob, om2.MObjectHandle) else om2.MObjectHandle(mob)
+        for pendingHandle, group in self.pendingIndex.get(handle.hashCode(), ()):
+            if pendingHandle == handle:
+                return group
+        return None
+
+    def fetchItemFromMob(self, mob):
+        """
+        Like itemFromMob but a node which is still pending gets loaded, together with the chunks pending before it.
+        :param mob: [MObject]
+        :return: [BaseTreeItem] or [None] if no item holds the given node
+        """
+        item = self.itemFromMob(mob)
+        if item is not None:
+            return item
+
+        group = self.pendingGroupFromMob(mob)
+        if group is None:
+            return None
+        parent = self.indexFromItem(group)
+        while self.pendingGroupFromMob(mob) is group:
+            self.fetchMore(parent)
+        return self.itemFromMob(mob)
+
+    def removePending(self, handles):
+        """
+        Drops nodes which are still pending from their groups, with a single pass over every group.
+        :param handles: [list] of [MObjectHandle]
+        :return: [None]
+        """
+        removed = {}
+        for handle in handles:
+            group = self.pendingGroupFromMob(handle)
+            if group is not None:
+                removed.setdefault(group, []).append(handle)
+
+        for group, handles in removed.items():
+            self.unregisterPending(group, handles)
+            hashCodes = set(handle.hashCode() for handle in handles)
+            group.pending = [pending for pending in group.pending
+                             if pending.hashCode() not in hashCodes or pending not in handles]
+
+    def indexFromItem(self, item):
+        """
+        :param item: [BaseTreeItem]
+        :return: [QModelIndex] of the given item
+        """
+        if item is None or item is self.root:
+            return QModelIndex()
+        return self.createIndex(item.row(), 0, item)
+
+    def renameItem(self, item, name):
+        """
+        Updates the display name of an item after the Maya node got renamed.
+        :param item: [BaseTreeItem]
+        :param name: [string] the new name
+        :return: [None]
+        """
+        self.unregisterItem(item)
+        item.data["displayName"] = name
+        self.registerItem(item)
+        index = self.indexFromItem(item)
+        self.dataChanged.emit(index, index)
+
+    #
+    # Utility function to return the item
+    #
+
+    def getItem(self, index):
+
+        if index.isValid():
+            item = index.internalPointer()
+            if item:
+                return item
+
+        return self.root
+
+# noinspection PyArgumentList,PyArgumentList
+def getDataFromMob(mob):
+    """
+    Retrieves the relevant data for a [MObject]
+    The icon is not searched here, the TreeModel looks it up from the string type of the object once it is painted.
+
+    :param mob: [MObject]
+    :return: [dict] Filled up with the data. Key[data] = [MObjectHandle], Key[displayName] = Object name,
+    Key[decoration] = [None] until the TreeModel resolved the shared [QIcon] for the node type
+    """
+
+    mfn_dep = om2.MFnDependencyNode(mob)
+    return getDataDict(mfn_dep.name(), om2.MObjectHandle(mob), icon=None)
+
+def getDataDict(displayName = "", data = None, icon = QIcon(":/group")):
+    """
+    Utility function for creating a data dictionary for using the the BaseTreeItem
+
+    :param displayName: [string] which gets display by the TreeView
+    :param data: [*] any data the user might want to store with the item
+    :param icon: [string] path to a valid icon which gets displayed by the TreeView
+    :return: [dict]
+    """
+    return {
+        "data":data,
+        "displayName":displayName,
+        "decoration":icon
+    }
+
+@profiled()
+def getDDrawTreeRoot():
+    """
+    Creates a tree data structure with the [BaseTreeItem] object.
+    Creates groups for all the ddraw_nodes and finds all the ddraw_nodes. The nodes are only stored as pending
+    children of the correct groups, the TreeModel loads them in chunks once the groups are expanded.
+
+    :return: [BaseTreeItem] root item of the tree
+    """
+
+    # TODO(fuzes): For now we just pass -1 as the type for the root so we know this is a invalid type to be ignored
+    root = BaseTreeItem(-1, getDataDict())
+
+    groups = {}
+    for displayName, ddrawType in (("Vectors", DDrawTypes.kVector),
+                                   ("Matrices", DDrawTypes.kMatrix),
+                                   ("Angles", DDrawTypes.kAngle)):
+        group = BaseTreeItem(DDrawTypes.kGroup, getDataDict(displayName=displayName))
+        group.pendingType = ddrawType
+        root.addChild(group)
+        groups[ddrawType] = group
+
+    for record in iterDDrawNodes():
+        groups[record.type].pending.append(record.handle)
+
+    return root
+
+# noinspection PyUnresolvedReferences
+class DDrawPerformancePanel(QWidget):
+
+    columns = (("name", "Function"), ("calls", "Calls"), ("totalMs", "Total ms"), ("p50Ms", "p50 ms"),
+               ("p90Ms", "p90 ms"), ("p99Ms", "p99 ms"), ("maxMs", "Max ms"), ("commands", "Maya cmds"))
+
+    def __init__(self, parent = None):
+        """
+        Shows the stats of the ddraw profiler, see ddraw_profile. Profiling only runs while the Profile
+        checkbox is checked, the table gets refreshed once per second in the meantime.
+
+        :param parent: [Q*]
+        """
+        super(DDrawPerformancePanel, self).__init__(parent = parent)
+
+        self.enableCheckBox = QCheckBox("Profile")
+        self.enableCheckBox.setChecked(getProfiler().enabled)
+        self.enableCheckBox.stateChanged.connect(self._on_enable_state_changed)
+
+        self.resetBtn = QPushButton("Reset")
+        self.resetBtn.clicked.connect(self._on_reset)
+
+        self.dumpBtn = QPushButton("Dump JSON")
+        self.dumpBtn.clicked.connect(self._on_dump)
+
+        self.table = QTableWidget(0, len(self.columns))
+        self.table.setHorizontalHeaderLabels([label for key, label in self.columns])
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+
+        self.refreshTimer = QTimer(self)
+        self.refreshTimer.setInterval(1000)
+        self.refreshTimer.timeout.connect(self.refresh)
+        if getProfiler().enabled:
+            self.refreshTimer.start()
+
+        buttonLayout = QHBoxLayout()
+        buttonLayout.addWidget(self.enableCheckBox)
+        buttonLayout.addWidget(self.resetBtn)
+        buttonLayout.addWidget(self.dumpBtn)
+
+        layout = QVBoxLayout()
+        layout.addLayout(buttonLayout)
+        layout.addWidget(self.table)
+        self.setLayout(layout)
+
+        self.refresh()
+
+    def _on_enable_state_changed(self, state):
+        if state == Qt.Checked:
+            getProfiler().enable()
+            self.refreshTimer.start()
+        else:
+            getProfiler().disable()
+            self.refreshTimer.stop()
+        self.refresh()
+
+    def _on_reset(self):
+        getProfiler().reset()
+        self.refresh()
+
+    def _on_dump(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Dump DDraw Profile", "ddraw_profile.json", "JSON (*.json)")
+        if path:
+            getProfiler().dump(path)
+
+    def refresh(self):
+        stats = getProfiler().stats()
+        self.table.setRowCount(len(stats))
+        for row, stat in enumerate(stats):
+            for column, (key, label) in enumerate(self.columns):
+                value = stat[key]
+                text = "{:.3f}".format(value) if isinstance(value, float) else str(value)
+                self.table.setItem(row, column, QTableWidgetItem(text))
+
+_GROUP_ROWS = {DDrawTypes.kVector: 0, DDrawTypes.kMatrix: 1, DDrawTypes.kAngle: 2}
+
+# noinspection PyMethodOverriding,PyArgumentList
+class DDrawWindow(MayaQWidgetBaseMixin, QWidget):
+
+    callbacks = om2.MCallbackIdArray()
+    runSelectionCallback = True
+
+    def __init__(self, parent = None):
+        super(DDrawWindow, self).__init__(parent = parent)
+
+        qss = """
+        QTreeView{
+        font-size: 14px;
+        }
+        """
+
+        # TODO(fuzes): Size policy
+        self.setObjectName(DDRAW_WINDOW_NAME)
+
+        # NOTE(fuzes): One editor per node type which gets reused for every selection
+        self.parameterStack = QStackedWidget()
+        self.emptyParameterWidget = QWidget()
+        self.parameterStack.addWidget(self.emptyParameterWidget)
+        self.parameterWidgets = {
+            DDrawTypes.kVector: DDrawVectorParametersWidget(parent = self),
+            DDrawTypes.kMatrix: DDrawMatrixParametersWidget(parent = self),
+            DDrawTypes.kAngle: DDrawAngleParametersWidget(parent = self),
+        }
+        for widget in self.parameterWidgets.values():
+            self.parameterStack.addWidget(widget)
+            widget.dataChanged.connect(self._on_data_changed)
+
+        # NOTE(fuzes): Options of the currently selected items, so we only read nodes which got newly selected
+        self.selectedOptions = {}
+
+        self.view = QTreeView()
+        self.view.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        self.view.setStyleSheet(qss)
+        self.view.setSizePolicy(QSizePolicy(QSizePolicy.Minimum, QSizePolicy.Minimum))
+
+        self.root = getDDrawTreeRoot()
+        self.model = TreeModel(self.root)
+        self.view.setModel(self.model)
+        self.view.selectionModel().selectionChanged.connect(self._on_tree_view_selection_changed)
+
+        shortcut = QShortcut(QKeySequence(Qt.Key_Delete), self)
+        shortcut.activated.connect(self.removeRow)
+
+        self.perfPanel = DDrawPerformancePanel(parent = self)
+
+        treeLayout = QVBoxLayout()
+        treeLayout.addWidget(self.view)
+        treeLayout.addWidget(self.perfPanel)
+
+        self.mainLayout = QHBoxLayout()
+        self.mainLayout.addLayout(treeLayout)
+        self.mainLayout.addWidget(self.parameterStack)
+
+        self.setLayout(self.mainLayout)
+
+        # NOTE(fuzes): The Maya callbacks only queue up their events. They get processed all at once on the
+        # next tick of the event loop, so importing thousands of nodes does not update the view thousands of times
+        self.pendingAdded = dict((ddrawType, []) for ddrawType in _GROUP_ROWS)
+        self.pendingRemoved = []
+        self.pendingRemovedHandles = []
+        self.pendingSelection = False
+
+        self.flushTimer = QTimer(self)
+        self.flushTimer.setSingleShot(True)
+        self.flushTimer.setInterval(0)
+        self.flushTimer.timeout.connect(self.flushPendingEvents)
+
+        #
+        # Maya related stuff starts here
+        #
+
+        # NOTE(fuzes): All callbacks related to when we create our nodes
+        vectorCallbackID = om2.MDGMessage.addNodeAddedCallback(self._on_ddraw_node_added, "ddraw_vector",
+                                                               DDrawTypes.kVector)
+        matrixCallbackID = om2.MDGMessage.addNodeAddedCallback(self._on_ddraw_node_added, "ddraw_matrix",
+                                                               DDrawTypes.kMatrix)
+        angleCallbackID = om2.MDGMessage.addNodeAddedCallback(self._on_ddraw_node_added, "ddraw_angle",
+                                                              DDrawTypes.kAngle)
+        self.callbacks.append(vectorCallbackID)
+        self.callbacks.append(matrixCallbackID)
+        self.callbacks.append(angleCallbackID)
+
+        # NOTE(fuzes): When our nodes get deleted callbacks
+        vectorNodeRemovedCallbackID = om2.MDGMessage.addNodeRemovedCallback(self.nodeRemovedCallback, "ddraw_vector")
+        matrixNodeRemovedCallbackID = om2.MDGMessage.addNodeRemovedCallback(self.nodeRemovedCallback, "ddraw_matrix")
+        angleNodeRemovedCallbackID = om2.MDGMessage.addNodeRemovedCallback(self.nodeRemovedCallback, "ddraw_angle")
+        self.callbacks.append(vectorNodeRemovedCallbackID)
+        self.callbacks.append(matrixNodeRemovedCallbackID)
+        self.callbacks.append(angleNodeRemovedCallbackID)
+
+        # NOTE(fuzes): Selection changed callback
+        self.callbacks.append(om2.MEventMessage.addEventCallback("SelectionChanged", self._on_maya_selection_changed))
+
+        # NOTE(fuzes): Keep the names in the tree in sync when nodes get renamed
+        self.callbacks.append(om2.MNodeMessage.addNameChangedCallback(om2.MObject(), self._on_maya_node_renamed))
+
+        # NOTE(fuzes): Undoing an edit changes the nodes behind our cached options
+        self.callbacks.append(om2.MEventMessage.addEventCallback("Undo", self._on_maya_undo))
+        self.callbacks.append(om2.MEventMessage.addEventCallback("Redo", self._on_maya_undo))
+
+    def schedulePendingEvents(self):
+        if not self.flushTimer.isActive():
+            self.flushTimer.start()
+
+    @profiled("DDrawWindow.flushPendingEvents")
+    def flushPendingEvents(self):
+        """
+        Processes all the queued Maya events. Removals first, then one batched insert per group and finally
+        the selection sync if the Maya selection changed in the meantime.
+        """
+        if self.pendingRemoved:
+            self.model.removeItems(self.pendingRemoved)
+            self.pendingRemoved = []
+        if self.pendingRemovedHandles:
+            self.model.removePending(self.pendingRemovedHandles)
+            self.pendingRemovedHandles = []
+
+        for ddrawType, handles in self.pendingAdded.items():
+            if not handles:
+                continue
+            # NOTE(fuzes): Nodes which got deleted again before we processed them are not valid anymore
+            items = [BaseTreeItem(ddrawType, getDataFromMob(handle.object())) for handle in handles
+                     if handle.isValid()]
+            self.model.insertItems(0, items, self.model.index(_GROUP_ROWS[ddrawType], 0))
+            self.pendingAdded[ddrawType] = []
+
+        if self.pendingSelection:
+            self.pendingSelection = False
+            self.syncSelectionFromMaya()
+
+    @profiled("DDrawWindow._on_maya_selection_changed")
+    def _on_maya_selection_changed(self, clientData):
+
+        if not self.runSelectionCallback:
+            return
+
+        self.pendingSelection = True
+        self.schedulePendingEvents()
+
+    # noinspection PyArgumentList
+    @profiled("DDrawWindow.syncSelectionFromMaya")
+    def syncSelectionFromMaya(self):
+
+        selection = QItemSelection()
+        for mob in iterSelection():
+            item = None
+            # NOTE(fuzes): If we are selecting a shape we can just search for it. Nodes of groups which were not
+            # expanded yet get loaded so they can be selected
+            if mob.hasFn(om2.MFn.kShape):
+                item = self.model.fetchItemFromMob(mob)
+
+            # NOTE(fuzes): Check if the shape under the transform might be a interesting object for us
+            # If it is one of our nodes it is in the lookup table of the model
+            elif mob.hasFn(om2.MFn.kTransform):
+                mfn_dag = om2.MFnDagNode(mob)
+                if mfn_dag.childCount() == 1:
+                    item = self.model.fetchItemFromMob(mfn_dag.child(0))
+
+            if item is not None:
+                index = self.model.indexFromItem(item)
+                selection.select(index, index)
+
+        # NOTE(fuzes): A single selection change, every select() call would make the view and
+        # _on_tree_view_selection_changed go over the whole selection again
+        self.view.selectionModel().select(selection, QItemSelectionModel.ClearAndSelect)
+
+    @profiled("DDrawWindow._on_data_changed")
+    def _on_data_changed(self):
+
+        widget = self.parameterStack.currentWidget()
+        if widget is self.emptyParameterWidget:
+            return
+
+        values = widget.takeEditedOptions()
+        items = [item for item in self.selectedOptions
+                 if self.parameterWidgets[item.type] is widget and item.data["data"].isValid()]
+        # NOTE(fuzes): The nodes might have been edited outside of this window, so the engine diffs against
+        # the values on the nodes and not against our cached options. Every edit is one undoable command
+        applyOptionValues([item.data["data"].object() for item in items], values)
+
+        # NOTE(fuzes): Keep our cached options in sync with what we just wrote
+        for item in items:
+            for attr, value in values.items():
+                setattr(self.selectedOptions[item], attr, value)
+
+    def _on_maya_undo(self, clientData):
+
+        self.selectedOptions = {}
+        self._on_tree_view_selection_changed(None, None)
+
+    # noinspection PyArgumentList
+    @profiled("DDrawWindow._on_tree_view_selection_changed")
+    def _on_tree_view_selection_changed(self, selected, deselected):
+
+        self.runSelectionCallback = False
+
+        optionsFromMob = {
+            DDrawTypes.kVector: getVectorOptionsFromMob,
+            DDrawTypes.kMatrix: getMatrixOptionsFromMob,
+            DDrawTypes.kAngle: getAngleOptionsFromMob,
+        }
+
+        selectedOptions = {}
+        for index in self.view.selectionModel().selectedIndexes():
+            item = index.internalPointer()
+            if item.type not in optionsFromMob or not item.data["data"].isValid():
+                continue
+            options = self.selectedOptions.get(item)
+            if options is None:
+                options = optionsFromMob[item.type](item.data["data"].object())
+            selectedOptions[item] = options
+        self.selectedOptions = selectedOptions
+
+        # NOTE(fuzes): We can only edit the selection if all the nodes are of the same type
+        types = set(item.type for item in selectedOptions)
+        if len(types) == 1:
+            widget = self.parameterWidgets[types.pop()]
+            widget.setOptionsList(list(selectedOptions.values()))
+            self.parameterStack.setCurrentWidget(widget)
+        else:
+            self.parameterStack.setCurrentWidget(self.emptyParameterWidget)
+
+        self.runSelectionCallback = True
+
+    # noinspection PyArgumentList
+    @profiled("DDrawWindow._on_ddraw_node_added")
+    def _on_ddraw_node_added(self, mob, clientData):
+
+        if clientData not in self.pendingAdded:
+            global_logger.error("_on_ddraw_node_added callback failed: ClientData is invalid.")
+            return
+
+        self.pendingAdded[clientData].append(om2.MObjectHandle(mob))
+        self.schedulePendingEvents()
+
+    # noinspection PyArgumentList
+    @profiled("DDrawWindow._on_maya_node_renamed")
+    def _on_maya_node_renamed(self, mob, prevName, clientData):
+
+        # NOTE(fuzes): Nodes which are still pending read their name once they get loaded
+        item = self.model.itemFromMob(mob)
+        if item is not None:
+            self.model.renameItem(item, om2.MFnDependencyNode(mob).name())
+
+    # noinspection PyArgumentList
+    @profiled("DDrawWindow.nodeRemovedCallback")
+    def nodeRemovedCallback(self, mob, clientData):
+
+        item = self.model.itemFromMob(mob)
+        if item is not None:
+            self.pendingRemoved.append(item)
+            self.schedulePendingEvents()
+        elif self.model.pendingGroupFromMob(mob) is not None:
+            # NOTE(fuzes): Otherwise the node would show up twice if the deletion gets undone
+            self.pendingRemovedHandles.append(om2.MObjectHandle(mob))
+            self.schedulePendingEvents()
+
+    def removeItem(self, item):
+        index = self.model.indexFromItem(item)
+        self.model.removeRow(index.row(), index.parent())
+
+    def removeItemFromName(self, name):
+        item = self.model.itemFromName(name)
+        if item is not None:
+            self.removeItem(item)
+        else:
+            global_logger.info("No valid item found to be deleted: {}".format(name))
+
+    def removeRow(self):
+
+        for index in self.view.selectionModel().selectedIndexes():
+            item = index.internalPointer()
+            data = item.data
+            itemData = data["data"]
+            if itemData:
+                mob = itemData.object()
+                if not mob.isNull():
+                    # NOTE(fuzes): We let the nodeRemovedCallback handle the deletion from the TreeView
+                    deleteDDrawMob(mob)
+                    #model.removeRow(index.row(), index.parent())
+            else:
+                cmds.warning("Can not delete top group: {}".format(data["displayName"]))
+
+    def closeEvent(self, event):
+
+        self.flushTimer.stop()
+        self.perfPanel.refreshTimer.stop()
+        for i in self.callbacks:
+            om2.MMessage.removeCallback(i)
+        self.callbacks.clear()
+
+def RunDDrawWindow(*args):
+    if not cmds.pluginInfo("debugDraw.mll", q=True, l=True):
+        print "Not loaded can not Run DDraw Window"
+        return
+
+    if cmds.window(DDRAW_WINDOW_NAME, ex = True):
+        cmds.deleteUI(DDRAW_WINDOW_NAME)
+    app = DDrawWindow()
+    app.show()
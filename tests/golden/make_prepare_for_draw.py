@@ -0,0 +1,122 @@
+"""
+Regenerates tests/data/prepare_for_draw.json, the values the C++ prepareForDraw code produces for the cases
+test_math checks ddraw_math against. Needs a C++ compiler and NumPy, not Maya. The MVector of prepare_for_draw.cpp
+reimplements angle() and normalize(), so the angle values are not Maya's own:
+
+    python tests/golden/make_prepare_for_draw.py
+"""
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+
+import numpy as np
+
+GOLDEN_PATH = os.path.dirname(os.path.abspath(__file__))
+DATA_PATH = os.path.join(os.path.dirname(GOLDEN_PATH), "data", "prepare_for_draw.json")
+SOURCE_PATH = os.path.join(GOLDEN_PATH, "prepare_for_draw.cpp")
+
+RANDOM_COUNT = 100
+RANDOM_SEED = 0
+
+# NOTE(fuzes): Hand picked edge cases: zero and tiny vectors which do not get normalized, values which are not
+# representable as float, parallel, opposite and perpendicular vectors
+VECTOR_CASES = [
+    [[0.0, 0.0, 0.0], [3.0, 4.0, 0.0]],
+    [[1.0, 2.0, 3.0], [0.0, 0.0, 0.0]],
+    [[0.1, 0.2, 0.3], [1e-11, 0.0, 0.0]],
+    [[-5.5, 0.25, 1e6], [0.1, -0.7, 123.456]],
+    [[1e-3, -1e-3, 7.0], [-1e5, 3e5, -2.5e4]],
+]
+
+ANGLE_CASES = [
+    [[1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 0.0], False],
+    [[2.0, 0.0, 0.0], [0.0, 0.0, 5.0], [1.0, 1.0, 1.0], True],
+    [[1.0, 1.0, 0.0], [2.0, 2.0, 0.0], [0.0, 0.0, 0.0], False],
+    [[1.0, 1.0, 0.0], [-3.0, -3.0, 0.0], [0.0, 0.0, 0.0], True],
+    [[0.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 0.0], False],
+    [[0.1, 0.2, 0.3], [-0.3, 0.2, 0.1], [4.0, 5.0, 6.0], False],
+    [[1e-11, 0.0, 0.0], [0.0, 1e-11, 0.0], [0.0, 0.0, 0.0], True],
+]
+
+MATRIX_CASES = [
+    [1.0, 0.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 0.0, 1.0],
+    [0.0, 1.0, 0.0, 0.0, -1.0, 0.0, 0.0, 0.0, 0.0, 0.0, 2.0, 0.0, 10.5, -3.25, 0.1, 1.0],
+]
+
+VECTOR_FIELDS = [("origin", 3), ("vectorPoint", 3), ("endPoint", 3), ("magnitude", 1),
+                 ("magnitudeDrawPosition", 3)]
+ANGLE_FIELDS = [("V1", 3), ("V2", 3), ("origin", 3), ("plane", 3), ("radians", 1), ("degrees", 1),
+                ("rightAngle", 1)]
+MATRIX_FIELDS = [("position", 3), ("xAxis", 3), ("yAxis", 3), ("zAxis", 3)]
+
+def randomCases(count, seed):
+    random = np.random.RandomState(seed)
+    vectors = [[o, e] for o, e in zip(random.uniform(-100, 100, (count, 3)).tolist(),
+                                      random.uniform(-100, 100, (count, 3)).tolist())]
+    angles = [[a, b, o, bool(n)] for a, b, o, n in zip(random.normal(size=(count, 3)).tolist(),
+                                                       random.normal(size=(count, 3)).tolist(),
+                                                       random.normal(size=(count, 3)).tolist(),
+                                                       random.randint(0, 2, count))]
+    matrices = random.uniform(-10, 10, (count, 16)).tolist()
+    return vectors, angles, matrices
+
+def formatCase(kind, case):
+    values = []
+    for value in case:
+        if isinstance(value, bool):
+            values.append(str(int(value)))
+        elif isinstance(value, list):
+            values.extend(float(v).hex() for v in value)
+        else:
+            values.append(float(value).hex())
+    return " ".join([kind] + values)
+
+def parseResult(line, fields):
+    words = line.split()
+    values = words[1:]
+    Result = {}
+    for name, size in fields:
+        if name == "rightAngle":
+            Result[name] = bool(int(values.pop(0)))
+        elif size == 1:
+            Result[name] = float.fromhex(values.pop(0))
+        else:
+            Result[name] = [float.fromhex(values.pop(0)) for _ in range(size)]
+    return Result
+
+def runPrepareForDraw(lines):
+    tempDir = tempfile.mkdtemp()
+    try:
+        executable = os.path.join(tempDir, "prepare_for_draw")
+        subprocess.check_call(["g++", "-O0", "-ffp-contract=off", "-o", executable, SOURCE_PATH])
+        process = subprocess.Popen([executable], stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+        output = process.communicate("\n".join(lines) + "\n")[0]
+        if process.returncode != 0:
+            raise RuntimeError("prepare_for_draw failed with {}".format(process.returncode))
+        return output.splitlines()
+    finally:
+        shutil.rmtree(tempDir)
+
+def main():
+    vectors, angles, matrices = randomCases(RANDOM_COUNT, RANDOM_SEED)
+    cases = {"vector": VECTOR_CASES + vectors, "angle": ANGLE_CASES + angles,
+             "matrix": [[m] for m in MATRIX_CASES + matrices]}
+    fields = {"vector": VECTOR_FIELDS, "angle": ANGLE_FIELDS, "matrix": MATRIX_FIELDS}
+
+    kinds = sorted(cases)
+    lines = [formatCase(kind, case) for kind in kinds for case in cases[kind]]
+    results = iter(runPrepareForDraw(lines))
+
+    golden = {}
+    for kind in kinds:
+        golden[kind] = [{"inputs": case, "expected": parseResult(next(results), fields[kind])}
+                        for case in cases[kind]]
+
+    with open(DATA_PATH, "w") as outFile:
+        json.dump(golden, outFile, sort_keys=True)
+    print("Wrote {}".format(DATA_PATH))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+/*
+  Writes the golden values of tests/data/prepare_for_draw.json, see make_prepare_for_draw.py.
+
+  The statements of the prepareForDraw functions are copied from ddraw_vector_v2.cpp, ddraw_angle_v2.cpp and
+  ddraw_matrix_v2.cpp, the Maya types they use are replaced by the minimal MVector below. The operators and
+  length() follow the inline implementation of the devkit MVector.h. normalize() and angle() are not inline in the
+  devkit, they are reimplementations, so the normalized vectors, radians and degrees this writes are not
+  guaranteed to match Maya. Build it like the plugin, without FMA contraction:
+  g++ -O0 -ffp-contract=off prepare_for_draw.cpp
+
+  Reads one case per line from stdin, floats are hex floats:
+  vector ox oy oz ex ey ez
+  angle v1x v1y v1z v2x v2y v2z ox oy oz normalize
+  matrix m00 m01 ... m33
+  and writes the draw data of each case on one line in the same order as the fields of the case.
+*/
+#include <math.h>
+#include <stdio.h>
+#include <string.h>
+
+typedef float f32;
+typedef double f64;
+typedef int b32;
+
+struct MVector
+{
+    f64 x, y, z;
+    
+    MVector() : x(0.0), y(0.0), z(0.0) {}
+    MVector(f64 xx, f64 yy, f64 zz) : x(xx), y(yy), z(zz) {}
+    
+    MVector operator+(const MVector& other) const { return MVector(x + other.x, y + other.y, z + other.z); }
+    MVector operator*(f64 scale) const { return MVector(x * scale, y * scale, z * scale); }
+    f64 operator*(const MVector& other) const { return x * other.x + y * other.y + z * other.z; }
+    MVector operator^(const MVector& other) const
+    {
+        return MVector(y * other.z - z * other.y, z * other.x - x * other.z, x * other.y - y * other.x);
+    }
+    
+    f64 length() const { return sqrt(x * x + y * y + z * z); }
+    
+    MVector& normalize()
+    {
+        f64 lensq = x * x + y * y + z * z;
+        if(lensq > 1.0e-20)
+        {
+            f64 factor = 1.0 / sqrt(lensq);
+            x *= factor;
+            y *= factor;
+            z *= factor;
+        }
+        return *this;
+    }
+    
+    MVector normal() const
+    {
+        MVector Result = *this;
+        Result.normalize();
+        return Result;
+    }
+    
+    f64 angle(const MVector& other) const
+    {
+        f64 cosine = 1.0;
+        f64 denominator = sqrt((x * x + y * y + z * z) * (other.x * other.x + other.y * other.y + other.z * other.z));
+        if(denominator > 0.0)
+        {
+            cosine = (*this * other) / denominator;
+        }
+        if(cosine > 1.0)
+        {
+            cosine = 1.0;
+        }
+        if(cosine < -1.0)
+        {
+            cosine = -1.0;
+        }
+        return acos(cosine);
+    }
+    
+    bool isEquivalent(const MVector& other, f64 tolerance = 1.0e-10) const
+    {
+        MVector diff(x - other.x, y - other.y, z - other.z);
+        return (diff * diff) < tolerance * tolerance;
+    }
+};
+
+// NOTE(fuzes): GetMVectorFromCompound reads the children with MPlug::asFloat()
+static MVector
+ReadFloatVector()
+{
+    f64 Points[3];
+    for(int Index = 0; Index < 3; ++Index)
+    {
+        f64 Value;
+        scanf("%la", &Value);
+        Points[Index] = (f32)Value;
+    }
+    return MVector(Points[0], Points[1], Points[2]);
+}
+
+static void
+WriteVector(const MVector& V)
+{
+    printf(" %a %a %a", V.x, V.y, V.z);
+}
+
+static void
+PrepareVector()
+{
+    MVector Origin = ReadFloatVector();
+    MVector EndPoint = ReadFloatVector();
+    
+    // NOTE(fuzes): Copied from DDrawVectorDrawOverride::prepareForDraw
+    MVector WrldEndPoint = EndPoint + Origin;
+    f32 Magnitude = (f32)EndPoint.length();
+    
+    MVector Direction = EndPoint.normal();
+    MVector MagnitudeDrawPosition = Origin + (Direction * (Magnitude / 2.0f));
+    
+    printf("vector");
+    WriteVector(Origin);
+    WriteVector(EndPoint);
+    WriteVector(WrldEndPoint);
+    printf(" %a", (f64)Magnitude);
+    WriteVector(MagnitudeDrawPosition);
+    printf("\n");
+}
+
+static void
+PrepareAngle()
+{
+    MVector V1 = ReadFloatVector();
+    MVector V2 = ReadFloatVector();
+    MVector Origin = ReadFloatVector();
+    int Normalize;
+    scanf("%d", &Normalize);
+    
+    // NOTE(fuzes): Copied from DDrawAngleDrawOverride::prepareForDraw
+    if(Normalize)
+    {
+        V1.normalize();
+        V2.normalize();
+    }
+    
+    MVector Plane = V1 ^ V2;
+    f32 Radians = (f32)V1.angle(V2);
+    f32 Degrees = Radians * 57.2957795f;
+    
+    // NOTE(fuzes): Copied from DDrawAngleDrawOverride::addUIDrawables
+    MVector AngleVector = MVector((f64)Degrees, 0 ,0);
+    b32 RightAngle = AngleVector.isEquivalent(MVector(90, 0, 0));
+    
+    printf("angle");
+    WriteVector(V1);
+    WriteVector(V2);
+    WriteVector(Origin);
+    WriteVector(Plane);
+    printf(" %a %a %d\n", (f64)Radians, (f64)Degrees, RightAngle ? 1 : 0);
+}
+
+static void
+PrepareMatrix()
+{
+    f64 Matrix[4][4];
+    for(int Index = 0; Index < 16; ++Index)
+    {
+        scanf("%la", &Matrix[Index / 4][Index % 4]);
+    }
+    
+    // NOTE(fuzes): Copied from DDrawMatrixDrawOverride::prepareForDraw
+    f64 XAxisRow[3] = {Matrix[0][0], Matrix[0][1], Matrix[0][2]};
+    f64 YAxisRow[3] = {Matrix[1][0], Matrix[1][1], Matrix[1][2]};
+    f64 ZAxisRow[3] = {Matrix[2][0], Matrix[2][1], Matrix[2][2]};
+    
+    f64 PositionRow[3] = {Matrix[3][0], Matrix[3][1], Matrix[3][2]};
+    
+    printf("matrix");
+    WriteVector(MVector(PositionRow[0], PositionRow[1], PositionRow[2]));
+    WriteVector(MVector(XAxisRow[0], XAxisRow[1], XAxisRow[2]));
+    WriteVector(MVector(YAxisRow[0], YAxisRow[1], YAxisRow[2]));
+    WriteVector(MVector(ZAxisRow[0], ZAxisRow[1], ZAxisRow[2]));
+    printf("\n");
+}
+
+int
+main()
+{
+    char Kind[16];
+    while(scanf("%15s", Kind) == 1)
+    {
+        if(strcmp(Kind, "vector") == 0)
+        {
+            PrepareVector();
+        }
+        else if(strcmp(Kind, "angle") == 0)
+        {
+            PrepareAngle();
+        }
+        else if(strcmp(Kind, "matrix") == 0)
+        {
+            PrepareMatrix();
+        }
+        else
+        {
+            fprintf(stderr, "Unknown case %s\n", Kind);
+            return 1;
+        }
+    }
+    return 0;
+}
@@ -0,0 +1,105 @@
+"""
+Shared setup of the tests. They run without Maya against the stand-in backend of ddraw_fake, with Python 2.7
+like the Maya versions the scripts target:
+
+    python -m unittest discover -s tests
+
+Importing this module puts ddraw/scripts on the path and installs the stand-in modules, so it has to be
+imported before any of the ddraw modules.
+"""
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+
+SCRIPTS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "ddraw", "scripts")
+if SCRIPTS_PATH not in sys.path:
+    sys.path.insert(0, SCRIPTS_PATH)
+
+import ddraw_fake
+ddraw_fake.install()
+
+from maya import cmds
+from maya.api import OpenMaya as om2
+
+import ddraw_core
+
+# noinspection PyArgumentList
+def getMob(name):
+    """
+    :param name: [string] node name
+    :return: [MObject]
+    """
+    return ddraw_core.getMobFromName(name)
+
+# noinspection PyArgumentList
+def getName(mob):
+    """
+    :param mob: [MObject]
+    :return: [string] node name
+    """
+    return om2.MFnDependencyNode(mob).name()
+
+# noinspection PyArgumentList
+def selectMobs(mobs):
+    """
+    Replaces the Maya selection, the SelectionChanged callbacks get notified like in Maya.
+    :param mobs: [iterable] of [MObject]
+    :return: [None]
+    """
+    sel = om2.MSelectionList()
+    for mob in mobs:
+        sel.add(mob)
+    om2.MGlobal.setActiveSelectionList(sel)
+
+# noinspection PyArgumentList
+def createDDrawNodes(nodeType, count):
+    """
+    Creates ddraw nodes without connecting them.
+    :param nodeType: [string] ddraw node type
+    :param count: [int]
+    :return: [list] of [MObject] the shapes
+    """
+    dagMod = om2.MDagModifier()
+    Result = ddraw_core.createDDrawNodes(nodeType, count, dagMod)
+    dagMod.doIt()
+    return Result
+
+def createJoints(count, prefix = "joint"):
+    """
+    :param count: [int]
+    :param prefix: [string] the joints get named prefix0, prefix1...
+    :return: [list] of [string] names of the joints
+    """
+    return [cmds.createNode("joint", name="{}{}".format(prefix, i)) for i in range(count)]
+
+def processEvents():
+    """
+    One tick of the Qt event loop, runs the deferred work of the DDrawWindow.
+    :return: [int] number of timers which fired
+    """
+    return ddraw_fake.processEvents()
+
+class SceneTestCase(unittest.TestCase):
+    """
+    Every test starts in a new empty scene with the call counters reset.
+    """
+
+    def setUp(self):
+        cmds.file(new=True, force=True)
+        ddraw_fake.getScene().resetCounters()
+
+    def getWarnings(self):
+        """
+        :return: [list] of [string] the messages passed to cmds.warning during the test
+        """
+        return ddraw_fake.getScene().warnings
+
+    def makeTempDir(self):
+        """
+        :return: [string] directory which gets deleted after the test
+        """
+        path = tempfile.mkdtemp(prefix="ddraw_test_")
+        self.addCleanup(shutil.rmtree, path, True)
+        return path
@@ -0,0 +1,36 @@
+import unittest
+
+import support
+from support import cmds, om2
+
+import ddraw_core
+import ddraw_fake
+
+class BatchModeTest(support.SceneTestCase):
+
+    def setUp(self):
+        super(BatchModeTest, self).setUp()
+        self.joints = support.createJoints(2)
+
+    def getPlugs(self):
+        return [om2.MFnDependencyNode(support.getMob(joint)).findPlug("translate", False) for joint in self.joints]
+
+    def test_batch_draws_without_the_node_editor(self):
+        ddraw_fake.setBatchMode(True)
+        self.addCleanup(ddraw_fake.setBatchMode, False)
+
+        mobs = ddraw_core.DDrawVectorBatch(self.getPlugs())
+        self.assertEqual(len(mobs), 2)
+        self.assertEqual(len(cmds.ls(type="ddraw_vector")), 2)
+        calls = ddraw_fake.getScene().calls
+        self.assertNotIn("cmds.nodeEditor", calls)
+        self.assertNotIn("mel.eval", calls)
+
+    def test_interactive_draws_restore_the_node_editor(self):
+        cmds.nodeEditor("nodeEditorPanel1NodeEditorEd", e=True, ann=True)
+        ddraw_core.DDrawVectorBatch(self.getPlugs())
+        self.assertTrue(cmds.nodeEditor("nodeEditorPanel1NodeEditorEd", q=True, ann=True))
+        self.assertIn("cmds.nodeEditor", ddraw_fake.getScene().calls)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+
+import support
+from support import cmds, om2
+
+import ddraw_core
+
+class DeduplicateTest(support.SceneTestCase):
+
+    def setUp(self):
+        super(DeduplicateTest, self).setUp()
+        self.joint = support.createJoints(1)[0]
+        self.plug = om2.MFnDependencyNode(support.getMob(self.joint)).findPlug("translate", False)
+
+    def drawDuplicates(self, count):
+        return [support.getName(ddraw_core.DDrawVectorBatch([self.plug], reuseExisting=False)[0])
+                for _ in range(count)]
+
+    def getTransform(self, name):
+        return support.getName(om2.MFnDagNode(support.getMob(name)).parent(0))
+
+    def test_reused_nodes_keep_their_options(self):
+        name = self.drawDuplicates(1)[0]
+        cmds.setAttr(name + ".vectorColor", 1.0, 0.0, 0.0)
+
+        self.assertEqual(support.getName(ddraw_core.DDrawVectorBatch([self.plug])[0]), name)
+        self.assertEqual(cmds.getAttr(name + ".vectorColor"), [(1.0, 0.0, 0.0)])
+
+        options = ddraw_core.DDrawVectorOptions()
+        options.coneRadius = 0.5
+        ddraw_core.DDrawVectorBatch([self.plug], options)
+        self.assertEqual(cmds.getAttr(name + ".coneRadius"), 0.5)
+        self.assertEqual(cmds.getAttr(name + ".vectorColor"), [(0.0, 0.0, 1.0)])
+
+    def test_outgoing_connections_move_to_the_kept_node(self):
+        kept, duplicate = self.drawDuplicates(2)
+        target = support.createJoints(1, prefix="target")[0]
+        decompose = cmds.createNode("decomposeMatrix")
+        cmds.connectAttr(duplicate + ".worldPosition[0]", target + ".translate")
+        cmds.connectAttr(self.getTransform(duplicate) + ".worldMatrix[0]", decompose + ".inputMatrix")
+
+        self.assertEqual(ddraw_core.DeduplicateDDrawNodes(), 1)
+        self.assertEqual(cmds.ls(type="ddraw_vector"), [kept])
+        self.assertEqual(support.getName(om2.MFnDependencyNode(support.getMob(target)).findPlug("translate", False)
+                                         .source().node()), kept)
+        source = om2.MFnDependencyNode(support.getMob(decompose)).findPlug("inputMatrix", False).source()
+        self.assertEqual(source.name(), self.getTransform(kept) + ".worldMatrix[0]")
+
+    def test_duplicates_with_their_own_options_are_kept(self):
+        kept, custom, plain = self.drawDuplicates(3)
+        cmds.setAttr(custom + ".coneRadius", 0.5)
+
+        self.assertEqual(ddraw_core.DeduplicateDDrawNodes(), 1)
+        self.assertEqual(sorted(cmds.ls(type="ddraw_vector")), sorted([kept, custom]))
+        self.assertEqual(len(self.getWarnings()), 1)
+        self.assertIn(custom, self.getWarnings()[0])
+
+if __name__ == "__main__":
+    unittest.main()
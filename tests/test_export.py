@@ -0,0 +1,122 @@
+import os
+import json
+import unittest
+
+import numpy as np
+
+import support
+from support import cmds, om2
+
+import ddraw_core
+import ddraw_export
+
+class ExportTest(support.SceneTestCase):
+
+    def setUp(self):
+        super(ExportTest, self).setUp()
+        self.path = self.makeTempDir()
+        self.joints = support.createJoints(2)
+        # NOTE(fuzes): Stands in for the animation, the first joint moves along x with the frame
+        callbackId = om2.MEventMessage.addEventCallback("timeChanged", self._on_time_changed)
+        self.addCleanup(om2.MMessage.removeCallback, callbackId)
+
+    def _on_time_changed(self, clientData):
+        cmds.setAttr(self.joints[0] + ".translate", cmds.currentTime(q=True), 0.0, 0.0)
+
+    def getPlug(self, name, attribute):
+        return om2.MFnDependencyNode(support.getMob(name)).findPlug(attribute, False)
+
+    def drawVectors(self):
+        plugs = [self.getPlug(joint, "translate") for joint in self.joints]
+        return [support.getName(mob) for mob in ddraw_core.DDrawVectorBatch(plugs)]
+
+    def drawAllTypes(self):
+        vectors = self.drawVectors()
+        ddraw_core.DDrawMatrixBatch([ddraw_core.wMtxPlugFromMob(support.getMob(self.joints[0]))])
+        ddraw_core.DDrawAngleBatch([(self.getPlug(self.joints[0], "translate"),
+                                     self.getPlug(self.joints[1], "translate"))])
+        return vectors
+
+    def test_npz_blocks_hold_every_frame(self):
+        vectors = self.drawVectors()
+        Result = ddraw_export.exportScene(self.path, 1, 5, fileFormat="npz", blockFrames=2)
+        self.assertEqual(Result["frames"], 5)
+
+        with open(os.path.join(self.path, "manifest.json")) as f:
+            manifest = json.load(f)
+        self.assertEqual(manifest["blocks"], ["block_00000.npz", "block_00001.npz", "block_00002.npz"])
+        self.assertEqual(manifest["names"]["vectors"], vectors)
+
+        frames = []
+        endPoints = []
+        for fileName in manifest["blocks"]:
+            with np.load(os.path.join(self.path, fileName)) as block:
+                frames.extend(block["frames"].tolist())
+                endPoints.append(block["vectors"]["endPoint"])
+        endPoints = np.concatenate(endPoints)
+        self.assertEqual(frames, [1, 2, 3, 4, 5])
+        self.assertEqual(endPoints.shape, (5, 2, 3))
+        np.testing.assert_array_equal(endPoints[:, 0, 0], [1, 2, 3, 4, 5])
+        np.testing.assert_array_equal(endPoints[:, 1], 0.0)
+
+    def test_blocks_are_cut_to_the_row_budget(self):
+        self.drawVectors()
+        Result = ddraw_export.exportScene(self.path, 1, 5, fileFormat="npz", blockRows=4)
+        self.assertEqual(Result["frames"], 5)
+
+        with open(os.path.join(self.path, "manifest.json")) as f:
+            blocks = json.load(f)["blocks"]
+        frameCounts = []
+        for fileName in blocks:
+            with np.load(os.path.join(self.path, fileName)) as block:
+                frameCounts.append(len(block["frames"]))
+        self.assertEqual(frameCounts, [2, 2, 1])
+
+    def test_csv_has_a_row_per_frame_and_node(self):
+        vectors = self.drawAllTypes()
+        # NOTE(fuzes): Every row gets written on its own
+        self.addCleanup(setattr, ddraw_export, "_CSV_CHUNK_ROWS", ddraw_export._CSV_CHUNK_ROWS)
+        ddraw_export._CSV_CHUNK_ROWS = 1
+        ddraw_export.exportScene(self.path, 1, 3, fileFormat="csv", blockFrames=2)
+
+        with open(os.path.join(self.path, "vectors.csv")) as f:
+            lines = f.read().splitlines()
+        self.assertEqual(lines[0].split(","), ["frame", "node", "origin_0", "origin_1", "origin_2", "endPoint_0",
+                                               "endPoint_1", "endPoint_2", "magnitude"])
+        rows = [line.split(",") for line in lines[1:]]
+        self.assertEqual([(int(row[0]), row[1]) for row in rows],
+                         [(frame, name) for frame in (1, 2, 3) for name in vectors])
+        self.assertEqual([float(row[5]) for row in rows if row[1] == vectors[0]], [1.0, 2.0, 3.0])
+
+        with open(os.path.join(self.path, "matrices.csv")) as f:
+            lines = f.read().splitlines()
+        self.assertEqual(len(lines), 4)
+        self.assertEqual(len(lines[0].split(",")), 2 + 16)
+
+    def test_csv_with_a_single_node_type(self):
+        vectors = self.drawVectors()
+        ddraw_export.exportScene(self.path, 1, 2, fileFormat="csv")
+
+        with open(os.path.join(self.path, "vectors.csv")) as f:
+            lines = f.read().splitlines()
+        self.assertEqual([line.split(",")[:2] for line in lines[1:]],
+                         [[str(frame), name] for frame in (1, 2) for name in vectors])
+
+        # NOTE(fuzes): Node types without nodes only get the header
+        with open(os.path.join(self.path, "angles.csv")) as f:
+            lines = f.read().splitlines()
+        self.assertEqual(len(lines), 1)
+        self.assertEqual(lines[0].split(",")[:3], ["frame", "node", "v1_0"])
+
+    def test_the_scene_goes_back_to_the_current_frame(self):
+        self.drawVectors()
+        cmds.currentTime(7)
+        ddraw_export.exportScene(self.path, 1, 3)
+        self.assertEqual(cmds.currentTime(q=True), 7)
+
+    def test_unknown_format_is_refused(self):
+        with self.assertRaises(ValueError):
+            ddraw_export.exportScene(self.path, 1, 3, fileFormat="xlsx")
+
+if __name__ == "__main__":
+    unittest.main()
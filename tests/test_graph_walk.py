@@ -0,0 +1,100 @@
+import unittest
+
+import support
+from support import cmds, om2
+
+import ddraw_core
+import ddraw_fake
+
+class GraphWalkTest(support.SceneTestCase):
+
+    def setUp(self):
+        super(GraphWalkTest, self).setUp()
+        # NOTE(fuzes): joint0 -> decompose0 -> joint1 -> decompose1 -> joint2
+        self.joints = support.createJoints(3)
+        self.decomposes = []
+        for i, (source, destination) in enumerate(zip(self.joints, self.joints[1:])):
+            decompose = cmds.createNode("decomposeMatrix", name="decompose{}".format(i))
+            cmds.connectAttr(source + ".worldMatrix[0]", decompose + ".inputMatrix")
+            cmds.connectAttr(decompose + ".outputTranslate", destination + ".translate")
+            self.decomposes.append(decompose)
+
+    def walk(self, root, upstream = True, **kwargs):
+        return [support.getName(mob) for mob in
+                ddraw_core.walkDependencyGraph([support.getMob(root)], upstream, **kwargs)]
+
+    def test_walk_follows_the_direction(self):
+        self.assertEqual(self.walk("joint2"), ["joint2", "decompose1", "joint1", "decompose0", "joint0"])
+        self.assertEqual(self.walk("joint0", upstream=False),
+                         ["joint0", "decompose0", "joint1", "decompose1", "joint2"])
+
+    def test_walk_stops_at_max_depth_and_max_nodes(self):
+        self.assertEqual(self.walk("joint2", maxDepth=0), ["joint2"])
+        self.assertEqual(self.walk("joint2", maxDepth=2), ["joint2", "decompose1", "joint1"])
+
+        self.assertEqual(self.walk("joint2", maxNodes=2), ["joint2", "decompose1"])
+        self.assertEqual(len(self.getWarnings()), 1)
+
+    def test_roots_reached_by_another_root_are_visited_once(self):
+        roots = [support.getMob(name) for name in ("joint2", "joint1")]
+        names = [support.getName(mob) for mob in ddraw_core.walkDependencyGraph(roots, maxDepth=1)]
+        self.assertEqual(sorted(names), ["decompose0", "decompose1", "joint1", "joint2"])
+
+    def createDiamond(self):
+        # NOTE(fuzes): start -> decomposeS -> top -> (decomposeA, decomposeB) -> bottom
+        start, top, bottom = support.createJoints(3, prefix="diamond")
+        names = ["decomposeS", "decomposeA", "decomposeB"]
+        for name in names:
+            cmds.createNode("decomposeMatrix", name=name)
+        cmds.connectAttr(start + ".worldMatrix[0]", "decomposeS.inputMatrix")
+        cmds.connectAttr("decomposeS.outputTranslate", top + ".translate")
+        cmds.connectAttr(top + ".worldMatrix[0]", "decomposeA.inputMatrix")
+        cmds.connectAttr(top + ".worldMatrix[0]", "decomposeB.inputMatrix")
+        cmds.connectAttr("decomposeA.outputTranslate", bottom + ".translate")
+        cmds.connectAttr("decomposeB.outputRotate", bottom + ".rotate")
+
+    def test_diamond_is_cut_at_max_depth(self):
+        self.createDiamond()
+        self.assertEqual(self.walk("diamond2", maxDepth=2), ["diamond2", "decomposeA", "decomposeB", "diamond1"])
+        self.assertEqual(self.walk("diamond0", upstream=False, maxDepth=3),
+                         ["diamond0", "decomposeS", "diamond1", "decomposeA", "decomposeB"])
+
+    def test_nodes_sharing_a_hash_code_are_walked(self):
+        # NOTE(fuzes): Every node of the diamond gets the same hash code
+        scene = ddraw_fake.getScene()
+        scene.nextHashCode = lambda: 1
+        self.addCleanup(delattr, scene, "nextHashCode")
+        self.createDiamond()
+
+        self.assertEqual(self.walk("diamond2", maxDepth=2), ["diamond2", "decomposeA", "decomposeB", "diamond1"])
+        self.assertEqual(self.walk("diamond2"),
+                         ["diamond2", "decomposeA", "decomposeB", "diamond1", "decomposeS", "diamond0"])
+
+    def test_chain_draws_each_connection_once_and_reuses_the_nodes(self):
+        vectors, matrices = ddraw_core.drawDependencyChain([support.getMob("joint2")])
+        self.assertEqual(self.drawnPlugKeys(vectors, "endPoint"),
+                         self.plugKeys("decompose0.outputTranslate", "decompose1.outputTranslate"))
+        self.assertEqual(self.drawnPlugKeys(matrices, "inMatrix"),
+                         self.plugKeys("joint0.worldMatrix[0]", "joint1.worldMatrix[0]"))
+
+        nodeCount = len(cmds.ls(type="ddraw_vector")) + len(cmds.ls(type="ddraw_matrix"))
+        again = ddraw_core.drawDependencyChain([support.getMob("joint2")])
+        self.assertEqual(len(cmds.ls(type="ddraw_vector")) + len(cmds.ls(type="ddraw_matrix")), nodeCount)
+        self.assertEqual([support.getName(mob) for mob in again[0]], [support.getName(mob) for mob in vectors])
+
+        # NOTE(fuzes): The walk does not go through the ddraw nodes
+        self.assertEqual(self.walk("joint0", upstream=False),
+                         ["joint0", "decompose0", "joint1", "decompose1", "joint2"])
+
+    def drawnPlugKeys(self, mobs, attribute):
+        return sorted(ddraw_core.getPlugKey(ddraw_core.getStaticPlug(om2.MFnDependencyNode(mob), attribute).source())
+                      for mob in mobs)
+
+    def plugKeys(self, *names):
+        sel = om2.MSelectionList()
+        for name in names:
+            sel.add(name)
+        return sorted(ddraw_core.getPlugKey(sel.getPlug(i)) for i in range(len(names)))
+
+if __name__ == "__main__":
+    unittest.main()
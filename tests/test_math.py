@@ -0,0 +1,59 @@
+import json
+import os
+import unittest
+
+import numpy as np
+
+import support  # NOTE(fuzes): Puts ddraw/scripts on the path
+
+import ddraw_math
+
+GOLDEN_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "prepare_for_draw.json")
+
+class PrepareForDrawTest(unittest.TestCase):
+    """
+    Compares ddraw_math bit for bit with the values the C++ prepareForDraw code produces with a stand-in MVector,
+    written by tests/golden/make_prepare_for_draw.py. MVector::angle() and MVector::normalize() are reimplemented
+    there, so the angle cases check the consistency with that reimplementation, not with Maya.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        with open(GOLDEN_PATH) as inFile:
+            cls.golden = json.load(inFile)
+
+    def assertMatchesGolden(self, kind, data):
+        cases = self.golden[kind]
+        self.assertEqual(len(data), len(cases))
+        mismatches = []
+        for index, case in enumerate(cases):
+            for field, expected in sorted(case["expected"].items()):
+                value = data[field][index]
+                if value.tobytes() != np.asarray(expected, dtype=value.dtype).tobytes():
+                    mismatches.append("{}[{}].{}: {!r} != {!r}".format(kind, index, field, value.tolist(), expected))
+        self.assertEqual(mismatches, [])
+
+    def test_vector_draw_data(self):
+        inputs = [case["inputs"] for case in self.golden["vector"]]
+        data = ddraw_math.vectorDrawData([i[0] for i in inputs], [i[1] for i in inputs])
+        self.assertMatchesGolden("vector", data)
+
+    def test_angle_draw_data(self):
+        inputs = [case["inputs"] for case in self.golden["angle"]]
+        data = ddraw_math.angleDrawData([i[0] for i in inputs], [i[1] for i in inputs], [i[2] for i in inputs],
+                                        [i[3] for i in inputs])
+        self.assertMatchesGolden("angle", data)
+
+    def test_matrix_draw_data(self):
+        data = ddraw_math.matrixDrawData([case["inputs"][0] for case in self.golden["matrix"]])
+        self.assertMatchesGolden("matrix", data)
+
+    def test_perpendicular_vectors_are_a_right_angle(self):
+        # NOTE(fuzes): The angle node shows 90.00deg|1.57rad for perpendicular vectors
+        data = ddraw_math.angleDrawData([(1.0, 0.0, 0.0), (1e-11, 0.0, 0.0)], [(0.0, 1.0, 0.0), (0.0, 1e-11, 0.0)],
+                                        np.zeros((2, 3)), [False, True])
+        self.assertEqual(data["degrees"].tolist(), [90.0, 90.0])
+        self.assertEqual(data["rightAngle"].tolist(), [True, True])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+import unittest
+
+import support
+
+from ddraw_core import DDrawVectorOptions
+from ddraw_ui import DDrawVectorParametersWidget
+
+def vectorOptions(coneRadius):
+    Result = DDrawVectorOptions()
+    Result.coneRadius = coneRadius
+    return Result
+
+class ParameterWidgetTest(support.SceneTestCase):
+
+    def setUp(self):
+        super(ParameterWidgetTest, self).setUp()
+        self.widget = DDrawVectorParametersWidget()
+        self.changes = []
+        self.widget.dataChanged.connect(lambda: self.changes.append(True))
+
+    def test_mixed_values_show_as_mixed(self):
+        self.widget.setOptionsList([vectorOptions(0.5), vectorOptions(1.0)])
+        self.assertTrue(self.widget.coneRadius.mixed)
+        self.assertEqual(self.widget.coneRadius.text(), "mixed")
+        self.assertFalse(self.widget.coneHeight.mixed)
+        self.assertEqual(self.changes, [])
+        self.assertEqual(self.widget.takeEditedOptions(), {})
+
+    def test_the_minimum_can_be_set_on_mixed_values(self):
+        self.widget.setOptionsList([vectorOptions(0.5), vectorOptions(1.0)])
+        self.widget.coneRadius.setValue(0.0)
+
+        self.assertFalse(self.widget.coneRadius.mixed)
+        self.assertEqual(self.widget.coneRadius.minimum(), 0.0)
+        self.assertEqual(self.widget.coneRadius.text(), "0.00")
+        self.assertEqual(self.changes, [True])
+        self.assertEqual(self.widget.takeEditedOptions(), {"coneRadius": 0.0})
+
+    def test_stepping_up_from_mixed_lands_on_the_minimum(self):
+        self.widget.setOptionsList([vectorOptions(0.5), vectorOptions(1.0)])
+        self.widget.coneRadius.stepBy(1)
+        self.assertEqual(self.widget.takeEditedOptions(), {"coneRadius": 0.0})
+
+    def test_shared_values_leave_the_mixed_state(self):
+        self.widget.setOptionsList([vectorOptions(0.5), vectorOptions(1.0)])
+        self.widget.setOptionsList([vectorOptions(0.0), vectorOptions(0.0)])
+
+        self.assertFalse(self.widget.coneRadius.mixed)
+        self.assertEqual(self.widget.coneRadius.minimum(), 0.0)
+        self.assertEqual(self.widget.coneRadius.value(), 0.0)
+        self.assertEqual(self.widget.coneRadius.text(), "0.00")
+        self.assertEqual(self.widget.takeEditedOptions(), {})
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,43 @@
+import unittest
+
+import numpy as np
+
+import support
+from support import cmds
+
+import ddraw_diff
+import ddraw_probe
+from ddraw_core import DDrawTypes
+
+class ProbeTest(support.SceneTestCase):
+
+    def setUp(self):
+        super(ProbeTest, self).setUp()
+        self.names = [support.getName(mob) for mob in support.createDDrawNodes("ddraw_vector", 2)]
+        for name in self.names:
+            cmds.setAttr(name + ".endPoint", 3.0, 4.0, 0.0)
+
+    def readVectors(self):
+        readings = ddraw_probe.probe(self.names)[DDrawTypes.kVector]
+        self.assertEqual(readings.names, self.names)
+        return readings.values
+
+    def test_end_point_is_the_drawn_end_point(self):
+        cmds.setAttr(self.names[1] + ".origin", 1.0, 2.0, 3.0)
+        vectors = self.readVectors()
+        np.testing.assert_array_equal(vectors["endPoint"], [[3.0, 4.0, 0.0], [4.0, 6.0, 3.0]])
+        np.testing.assert_array_equal(vectors["magnitude"], [5.0, 5.0])
+
+    def test_moving_the_origin_moves_the_end_point(self):
+        before = self.readVectors()
+        cmds.setAttr(self.names[0] + ".origin", 0.0, 0.0, 1.0)
+        after = self.readVectors()
+
+        np.testing.assert_array_equal(after["endPoint"][0] - before["endPoint"][0], [0.0, 0.0, 1.0])
+        metric = ddraw_diff.DEFAULT_TOLERANCES["vectors"]["endPoint"][0]
+        deltas = ddraw_diff.fieldDelta(ddraw_diff.getField(before, "vectors", "endPoint"),
+                                       ddraw_diff.getField(after, "vectors", "endPoint"), metric)
+        self.assertEqual(deltas.tolist(), [1.0, 0.0])
+
+if __name__ == "__main__":
+    unittest.main()
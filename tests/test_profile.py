@@ -0,0 +1,65 @@
+import unittest
+
+import support
+from support import cmds
+
+import ddraw_core
+import ddraw_profile
+from ddraw_profile import profiled
+
+@profiled("test.inner")
+def inner():
+    ddraw_core.cmds.ls()
+
+@profiled("test.enablingOuter")
+def enablingOuter():
+    ddraw_profile.getProfiler().enable()
+    inner()
+
+@profiled("test.disablingOuter")
+def disablingOuter():
+    inner()
+    ddraw_profile.getProfiler().disable()
+    inner()
+
+@profiled("test.outer")
+def outer():
+    inner()
+    inner()
+
+class ProfilerTest(support.SceneTestCase):
+
+    def setUp(self):
+        super(ProfilerTest, self).setUp()
+        self.profiler = ddraw_profile.getProfiler()
+        self.addCleanup(self.profiler.reset)
+        self.addCleanup(self.profiler.disable)
+
+    def callCounts(self):
+        return dict((name, total[0]) for name, total in self.profiler.totals.items())
+
+    def test_enabling_during_a_call_only_records_the_calls_after(self):
+        enablingOuter()
+        self.assertEqual(self.profiler.stack, [])
+        self.assertEqual(self.callCounts(), {"test.inner": 1})
+
+        outer()
+        self.assertEqual(self.callCounts(), {"test.inner": 3, "test.outer": 1})
+
+    def test_disabling_during_a_call_still_records_it(self):
+        self.profiler.enable()
+        disablingOuter()
+        self.assertEqual(self.profiler.stack, [])
+        self.assertEqual(self.callCounts(), {"test.inner": 1, "test.disablingOuter": 1})
+
+    def test_commands_of_nested_calls_count_for_the_caller(self):
+        self.profiler.enable()
+        outer()
+        self.assertEqual(self.profiler.totals["test.inner"][2], 2)
+        self.assertEqual(self.profiler.totals["test.outer"][2], 2)
+
+        self.profiler.disable()
+        self.assertIs(ddraw_core.cmds, cmds)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,46 @@
+import os
+import unittest
+
+import support
+from support import om2
+
+import ddraw_core
+import ddraw_fake
+import ddraw_rules
+
+class InstrumentTest(support.SceneTestCase):
+
+    def setUp(self):
+        super(InstrumentTest, self).setUp()
+        self.joints = support.createJoints(3)
+        self.rules = [{"name": "translates", "draw": "vector", "types": ["joint"], "attributes": ["translate"]}]
+
+    def test_reused_nodes_are_not_part_of_the_manifest(self):
+        mfn_dep = om2.MFnDependencyNode(support.getMob(self.joints[0]))
+        reused = support.getName(ddraw_core.DDrawVectorBatch([mfn_dep.findPlug("translate", False)])[0])
+
+        # NOTE(fuzes): Every node created from here on shares the hash code of the reused node
+        scene = ddraw_fake.getScene()
+        hashCode = om2.MObjectHandle(support.getMob(reused)).hashCode()
+        scene.nextHashCode = lambda: hashCode
+        self.addCleanup(delattr, scene, "nextHashCode")
+
+        instrumentation = ddraw_rules.instrumentScene(self.rules)
+        self.assertEqual(sorted(entry["source"] for entry in instrumentation.entries),
+                         [joint + ".translate" for joint in self.joints[1:]])
+        self.assertNotIn(reused, [entry["shape"] for entry in instrumentation.entries])
+        self.assertEqual(len(instrumentation.handles), 2)
+
+    def test_missing_files_raise_io_errors(self):
+        path = os.path.join(self.makeTempDir(), "missing.json")
+        self.assertRaises(IOError, ddraw_rules.loadRules, path)
+        self.assertRaises(IOError, ddraw_rules.DDrawInstrumentation.load, path)
+
+    def test_saved_manifests_load(self):
+        path = os.path.join(self.makeTempDir(), "manifest.json")
+        ddraw_rules.instrumentScene(self.rules).save(path)
+        self.assertEqual(sorted(entry["source"] for entry in ddraw_rules.DDrawInstrumentation.load(path).entries),
+                         [joint + ".translate" for joint in self.joints])
+
+if __name__ == "__main__":
+    unittest.main()
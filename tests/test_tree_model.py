@@ -0,0 +1,89 @@
+import unittest
+
+import support
+
+from PySide2.QtCore import Qt
+
+from ddraw_core import DDrawTypes
+from ddraw_ui import TreeModel, getDDrawTreeRoot
+
+class TreeModelTest(support.SceneTestCase):
+
+    def buildModel(self, fetchChunkSize = 256):
+        model = TreeModel(getDDrawTreeRoot())
+        model.fetchChunkSize = fetchChunkSize
+        return model
+
+    def groupIndex(self, model, ddrawType):
+        for row in range(model.rowCount()):
+            index = model.index(row, 0)
+            if model.getItem(index).pendingType == ddrawType:
+                return index
+        self.fail("No group for {}".format(ddrawType))
+
+    def test_nodes_stay_pending_until_the_group_is_fetched(self):
+        vectors = [support.getName(mob) for mob in support.createDDrawNodes("ddraw_vector", 3)]
+        support.createDDrawNodes("ddraw_matrix", 2)
+        model = self.buildModel()
+
+        index = self.groupIndex(model, DDrawTypes.kVector)
+        self.assertEqual(model.rowCount(index), 0)
+        self.assertTrue(model.hasChildren(index))
+        self.assertTrue(model.canFetchMore(index))
+        self.assertIsNone(model.itemFromName(vectors[0]))
+
+        model.fetchMore(index)
+        self.assertEqual(model.rowCount(index), 3)
+        self.assertFalse(model.canFetchMore(index))
+        names = [model.data(model.index(row, 0, index), Qt.DisplayRole) for row in range(3)]
+        self.assertEqual(sorted(names), sorted(vectors))
+
+        matrices = self.groupIndex(model, DDrawTypes.kMatrix)
+        self.assertEqual(model.rowCount(matrices), 0)
+        self.assertTrue(model.canFetchMore(matrices))
+
+        angles = self.groupIndex(model, DDrawTypes.kAngle)
+        self.assertFalse(model.hasChildren(angles))
+
+    def test_fetch_loads_one_chunk_at_a_time(self):
+        support.createDDrawNodes("ddraw_vector", 5)
+        model = self.buildModel(fetchChunkSize=2)
+        index = self.groupIndex(model, DDrawTypes.kVector)
+
+        counts = []
+        while model.canFetchMore(index):
+            model.fetchMore(index)
+            counts.append(model.rowCount(index))
+        self.assertEqual(counts, [2, 4, 5])
+
+    def test_fetch_skips_nodes_deleted_since_the_tree_was_built(self):
+        mobs = support.createDDrawNodes("ddraw_vector", 3)
+        model = self.buildModel()
+        deleted = support.getName(mobs[1])
+        support.cmds.delete(deleted)
+
+        index = self.groupIndex(model, DDrawTypes.kVector)
+        model.fetchMore(index)
+        self.assertEqual(model.rowCount(index), 2)
+        self.assertIsNone(model.itemFromName(deleted))
+
+    def test_lookup_follows_removed_and_renamed_items(self):
+        mobs = support.createDDrawNodes("ddraw_vector", 3)
+        model = self.buildModel()
+        index = self.groupIndex(model, DDrawTypes.kVector)
+        model.fetchMore(index)
+
+        items = [model.itemFromMob(mob) for mob in mobs]
+        self.assertTrue(all(item is not None for item in items))
+
+        model.removeItems([items[0], items[2]])
+        self.assertEqual(model.rowCount(index), 1)
+        self.assertIsNone(model.itemFromMob(mobs[0]))
+        self.assertIsNone(model.itemFromMob(mobs[2]))
+
+        model.renameItem(items[1], "renamedVectorShape")
+        self.assertIs(model.itemFromName("renamedVectorShape"), items[1])
+        self.assertIs(model.itemFromMob(mobs[1]), items[1])
+
+if __name__ == "__main__":
+    unittest.main()
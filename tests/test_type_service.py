@@ -0,0 +1,41 @@
+import unittest
+
+import support
+
+import ddraw_core
+import ddraw_fake
+import ddraw_rules
+
+class TypeServiceTest(support.SceneTestCase):
+
+    def setUp(self):
+        super(TypeServiceTest, self).setUp()
+        self.joints = support.createJoints(2)
+        self.mobs = [support.getMob(joint) for joint in self.joints]
+        ddraw_core.getTypeService().clear()
+
+    def makeNamesAmbiguous(self):
+        # NOTE(fuzes): Like Maya when two DAG nodes share a short name, looking nodes up by name fails
+        def findNode(name):
+            raise RuntimeError("More than one object matches name: {}".format(name))
+
+        scene = ddraw_fake.getScene()
+        scene.findNode = findNode
+        self.addCleanup(delattr, scene, "findNode")
+
+    def test_inherited_types_are_queried_by_type(self):
+        self.makeNamesAmbiguous()
+        service = ddraw_core.DDrawTypeService()
+        self.assertEqual(service.inheritedTypes(self.mobs[0])[-2:], ("transform", "joint"))
+        self.assertTrue(service.isAType(self.mobs[1], "transform"))
+        self.assertEqual(service.queries, 1)
+
+    def test_instrumentation_does_not_look_up_node_names(self):
+        self.makeNamesAmbiguous()
+        rules = [{"name": "translates", "draw": "vector", "types": ["transform"], "attributes": ["translate"]}]
+        instrumentation = ddraw_rules.instrumentScene(rules)
+        self.assertEqual(sorted(entry["source"] for entry in instrumentation.entries),
+                         [joint + ".translate" for joint in self.joints])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import unittest
+
+import support
+from support import cmds, om2
+
+import ddraw_core
+import ddraw_rules
+
+class UndoTest(support.SceneTestCase):
+
+    def setUp(self):
+        super(UndoTest, self).setUp()
+        self.joints = support.createJoints(3)
+        for source, destination in zip(self.joints, self.joints[1:]):
+            decompose = cmds.createNode("decomposeMatrix")
+            cmds.connectAttr(source + ".worldMatrix[0]", decompose + ".inputMatrix")
+            cmds.connectAttr(decompose + ".outputTranslate", destination + ".translate")
+
+    def getPlug(self, name, attribute):
+        return om2.MFnDependencyNode(support.getMob(name)).findPlug(attribute, False)
+
+    def ddrawNodes(self):
+        return sorted(cmds.ls(type="ddraw_vector") + cmds.ls(type="ddraw_matrix"))
+
+    def test_batch_is_undone_and_redone_in_one_step(self):
+        plugs = [self.getPlug(joint, "translate") for joint in self.joints]
+        mobs = ddraw_core.DDrawVectorBatch(plugs)
+        names = self.ddrawNodes()
+        self.assertEqual(len(names), 3)
+        self.assertEqual(len(cmds.ls(type="transform")) - len(self.joints), 3)
+
+        cmds.undo()
+        self.assertEqual(self.ddrawNodes(), [])
+        self.assertEqual(len(cmds.ls(type="transform")), len(self.joints))
+        self.assertFalse(self.getPlug(self.joints[0], "translate").isSource)
+
+        cmds.redo()
+        self.assertEqual(self.ddrawNodes(), names)
+        source = ddraw_core.getStaticPlug(om2.MFnDependencyNode(mobs[0]), "endPoint").source()
+        self.assertEqual(ddraw_core.getPlugKey(source), ddraw_core.getPlugKey(plugs[0]))
+
+    def test_chain_is_undone_in_one_step(self):
+        ddraw_core.drawDependencyChain([support.getMob(self.joints[-1])])
+        self.assertTrue(cmds.ls(type="ddraw_vector"))
+        self.assertTrue(cmds.ls(type="ddraw_matrix"))
+
+        cmds.undo()
+        self.assertEqual(self.ddrawNodes(), [])
+
+    def test_instrumentation_is_undone_in_one_step(self):
+        rules = [{"name": "joints", "draw": "matrix", "types": ["joint"], "attributes": ["worldMatrix"]},
+                 {"name": "translates", "draw": "vector", "types": ["joint"], "attributes": ["translate"]}]
+        instrumentation = ddraw_rules.instrumentScene(rules)
+        self.assertEqual(len(instrumentation.entries), 6)
+
+        cmds.undo()
+        self.assertEqual(self.ddrawNodes(), [])
+        cmds.redo()
+        self.assertEqual(len(self.ddrawNodes()), 6)
+
+    def test_option_edits_are_undone(self):
+        mobs = ddraw_core.DDrawVectorBatch([self.getPlug(joint, "translate") for joint in self.joints])
+        names = [support.getName(mob) for mob in mobs]
+        self.assertEqual(ddraw_core.applyOptionValues(mobs, {"coneRadius": 2.0, "displayText": True}), 6)
+        self.assertEqual(ddraw_core.applyOptionValues(mobs, {"coneRadius": 2.0}), 0)
+
+        cmds.undo()
+        self.assertEqual([cmds.getAttr(name + ".coneRadius") for name in names],
+                         [ddraw_core.DDrawVectorOptions().coneRadius] * 3)
+        self.assertEqual(len(self.ddrawNodes()), 3)
+
+        cmds.redo()
+        self.assertEqual([cmds.getAttr(name + ".coneRadius") for name in names], [2.0] * 3)
+        self.assertEqual([cmds.getAttr(name + ".displayText") for name in names], [True] * 3)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+import unittest
+
+import support
+from support import cmds
+
+from ddraw_core import DDrawTypes
+from ddraw_ui import DDrawWindow, _GROUP_ROWS
+
+class DDrawWindowTest(support.SceneTestCase):
+
+    def setUp(self):
+        super(DDrawWindowTest, self).setUp()
+        self.mobs = support.createDDrawNodes("ddraw_vector", 5)
+        self.window = DDrawWindow()
+        self.addCleanup(self.window.closeEvent, None)
+        self.model = self.window.model
+        self.model.fetchChunkSize = 2
+        self.groupIndex = self.model.index(_GROUP_ROWS[DDrawTypes.kVector], 0)
+
+    def selectedNames(self):
+        return [index.internalPointer().data["displayName"]
+                for index in self.window.view.selectionModel().selectedIndexes()]
+
+    def fetchAll(self):
+        while self.model.canFetchMore(self.groupIndex):
+            self.model.fetchMore(self.groupIndex)
+
+    def test_selecting_a_pending_node_loads_it(self):
+        name = support.getName(self.mobs[-1])
+        self.assertIsNone(self.model.itemFromMob(self.mobs[-1]))
+
+        support.selectMobs([self.mobs[-1]])
+        support.processEvents()
+        self.assertEqual(self.selectedNames(), [name])
+        # NOTE(fuzes): The chunks pending before the node get loaded first, so the rows keep their order
+        self.assertEqual(self.model.rowCount(self.groupIndex), 5)
+        self.assertFalse(self.model.canFetchMore(self.groupIndex))
+
+    def test_selecting_the_transform_of_a_pending_node_loads_it(self):
+        name = support.getName(self.mobs[1])
+        transform = support.om2.MFnDagNode(self.mobs[1]).parent(0)
+
+        support.selectMobs([transform])
+        support.processEvents()
+        self.assertEqual(self.selectedNames(), [name])
+        self.assertEqual(self.model.rowCount(self.groupIndex), 2)
+        self.assertTrue(self.model.canFetchMore(self.groupIndex))
+
+    def test_renamed_pending_node_shows_the_new_name(self):
+        cmds.rename(support.getName(self.mobs[-1]), "renamedVectorShape")
+        support.processEvents()
+
+        support.selectMobs([self.mobs[-1]])
+        support.processEvents()
+        self.assertEqual(self.selectedNames(), ["renamedVectorShape"])
+        self.assertIs(self.model.itemFromName("renamedVectorShape"), self.model.itemFromMob(self.mobs[-1]))
+
+    def test_deleted_pending_node_is_dropped_from_its_group(self):
+        cmds.delete(support.getName(support.om2.MFnDagNode(self.mobs[-1]).parent(0)))
+        support.processEvents()
+        self.assertIsNone(self.model.pendingGroupFromMob(self.mobs[-1]))
+        self.assertEqual(len(self.model.getItem(self.groupIndex).pending), 4)
+
+        self.fetchAll()
+        self.assertEqual(self.model.rowCount(self.groupIndex), 4)
+        self.assertEqual(self.model.pendingIndex, {})
+
+    def test_edits_in_the_parameter_widget_are_undone(self):
+        names = [support.getName(mob) for mob in self.mobs[:2]]
+        support.selectMobs(self.mobs[:2])
+        support.processEvents()
+        widget = self.window.parameterStack.currentWidget()
+        self.assertIs(widget, self.window.parameterWidgets[DDrawTypes.kVector])
+
+        previous = cmds.getAttr(names[0] + ".coneRadius")
+        widget.coneRadius.setValue(previous + 1.0)
+        self.assertEqual([cmds.getAttr(name + ".coneRadius") for name in names], [previous + 1.0] * 2)
+
+        cmds.undo()
+        self.assertEqual([cmds.getAttr(name + ".coneRadius") for name in names], [previous] * 2)
+        self.assertEqual(widget.coneRadius.value(), previous)
+
+if __name__ == "__main__":
+    unittest.main()